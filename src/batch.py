@@ -0,0 +1,143 @@
+##
+#  @file batch.py
+#  @brief File containing the class *Batch*, running headless simulations over seeds and parameter grids.
+#  @date 2026-10-16
+#  @author Rabyte Studio
+
+import argparse
+import csv
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+
+from entity import Entity
+from map import Map
+from simulation import RSim
+from world import World
+
+##
+#  @class Batch
+#  @brief Class fanning headless simulations out over a process pool.
+#  @details Every run of the grid (parameter combination x seed) is executed by one worker
+#  process. Summaries are written to a CSV table as soon as each run completes.
+class Batch:
+
+    PARAMS = World.PARAMS  ##< Entity constants that can vary.
+    DEFAULTS = {name: getattr(Entity, name) for name in PARAMS}  ##< Values of the constants left unset.
+
+    COLUMNS = ('run', 'seed', *PARAMS, 'stop', 'ticks', 'elapsed', 'tps',
+               'entities', 'foods', 'peak', 'curve')  ##< Columns of the results table.
+
+    ##
+    #  @brief Builds the list of runs of a grid.
+    #  @param grid A dictionary mapping names of PARAMS to lists of values.
+    #  @param seeds An iterable of random seeds.
+    #  @return A list of dictionaries with the keys 'run', 'seed' and 'params'.
+    #  @throws ValueError if a parameter is not in PARAMS.
+    @classmethod
+    def runs(cls, grid, seeds):
+        for name in grid:
+            if name not in cls.PARAMS:
+                raise ValueError(f"{name} is not one of {', '.join(cls.PARAMS)}!")
+        names = list(grid)
+        combinations = product(*(grid[name] for name in names))
+        return [
+            {'run': i, 'seed': seed, 'params': dict(zip(names, values))}
+            for i, (values, seed) in enumerate(product(list(combinations), seeds))
+        ]
+
+    ##
+    #  @brief Executes one run, as a *World* of the current process.
+    #  @param run A dictionary returned by *runs*.
+    #  @param options A dictionary with the keys 'size', 'nEntities', 'nFoods', 'ticks', 'cap',
+    #  'engine', 'interval' and 'save' (first save slot, or None not to save).
+    #  @return A row of the results table, as a dictionary keyed by COLUMNS.
+    @staticmethod
+    def execute(run, options):
+        save = options['save']
+        world = World(0 if save is None else save + run['run'], options['size'], options['engine'],
+                      seed=run['seed'], params=run['params'])
+        world.generate(options['nEntities'], options['nFoods'])
+        summary = world.run(options['ticks'], options['cap'], save is not None, options['interval'])
+
+        row = {'run': run['run'], 'seed': run['seed'], **Batch.DEFAULTS, **run['params'], **summary}
+        row['elapsed'] = round(row['elapsed'], 3)
+        row['tps'] = round(row['tps'], 1)
+        row['curve'] = ' '.join(map(str, row['curve']))
+        return {column: row[column] for column in Batch.COLUMNS}
+
+    ##
+    #  @brief Executes every run over a process pool and streams the results table.
+    #  @param runs A list returned by *runs*.
+    #  @param options The options of every run (see *execute*).
+    #  @param out A text file receiving the CSV table.
+    #  @param jobs Number of worker processes, or None for one per CPU.
+    #  @param verbose If True, a line is printed on stderr when a run completes.
+    #  @return The rows of the table, in completion order.
+    @classmethod
+    def run(cls, runs, options, out, jobs=None, verbose=False):
+        writer = csv.DictWriter(out, fieldnames=cls.COLUMNS)
+        writer.writeheader()
+        out.flush()
+
+        rows = []
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(cls.execute, run, options) for run in runs]
+            for future in as_completed(futures):
+                row = future.result()
+                writer.writerow(row)
+                out.flush()
+                rows.append(row)
+                if verbose:
+                    print(f"Run {row['run']} ({len(rows)}/{len(runs)}): {row['stop']} after {row['ticks']} ticks, "
+                          f"entities={row['entities']}, peak={row['peak']}", file=sys.stderr)
+        return rows
+
+
+##
+#  @brief Parses a grid parameter given as NAME=v1,v2,...
+#  @param text The text of the parameter.
+#  @return A tuple (name, list of integer values).
+def _param(text):
+    try:
+        name, values = text.split('=')
+        return name.strip(), [int(v) for v in values.split(',')]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{text}' must be NAME=v1,v2,... with integer values")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run headless RSim simulations over seeds and Entity parameter grids, in parallel.")
+    parser.add_argument('--param', type=_param, action='append', default=[], metavar='NAME=v1,v2',
+                        help=f"Values of an Entity constant to try, one of {', '.join(Batch.PARAMS)} (repeatable)")
+    parser.add_argument('--seeds', type=int, help='Number of seeds per parameter combination (seeds 0..N-1)', default=1)
+    parser.add_argument('--ticks', type=int, help='Maximum number of ticks of a run', default=1000)
+    parser.add_argument('--cap', type=int, help='Population at which a run stops early', default=None)
+    parser.add_argument('--size', type=int, nargs=2, metavar=('width', 'height'), help="Simulator Map Size (width height)", default=Map.DEFAULT_SIZE)
+    parser.add_argument('--nEntities', type=int, help='Number of entities at the start of a run', default=10)
+    parser.add_argument('--nFoods', type=int, help='Number of foods at the start of a run', default=10)
+    parser.add_argument('--engine', choices=RSim.ENGINES, help='Simulation engine', default='object')
+    parser.add_argument('--interval', type=int, help='Ticks between two samples of the population curve (0: none)', default=100)
+    parser.add_argument('-s', '--save', type=int, help='Save every run, from this save number upwards', default=None)
+    parser.add_argument('-j', '--jobs', type=int, help='Number of worker processes (default: one per CPU)', default=None)
+    parser.add_argument('-o', '--out', help='CSV file receiving the results table (default: stdout)', default=None)
+    parser.add_argument('-v', '--verbose', action='store_true', help='Enable VERBOSE mode')
+    args = parser.parse_args()
+
+    try:
+        runs = Batch.runs(dict(args.param), range(args.seeds))
+    except ValueError as e:
+        print(f"Error: {e}")
+        exit(1)
+
+    options = {
+        'size': tuple(args.size), 'nEntities': args.nEntities, 'nFoods': args.nFoods,
+        'ticks': args.ticks, 'cap': args.cap, 'engine': args.engine,
+        'interval': args.interval, 'save': args.save,
+    }
+    out = open(args.out, 'w', newline='') if args.out else sys.stdout
+    try:
+        Batch.run(runs, options, out, args.jobs, args.verbose)
+    finally:
+        if args.out:
+            out.close()
@@ -0,0 +1,284 @@
+##
+#  @file bench.py
+#  @brief File containing the class *Bench*, a benchmark suite of the simulation hot paths.
+#  @date 2026-10-16
+#  @author Rabyte Studio
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from map import Map
+from entity import Entity
+from food import Food
+from save import Save
+from simulation import RSim
+from snapshot import Snapshot
+from world import World
+
+##
+#  @class Bench
+#  @brief Class timing the simulation hot paths on synthetic worlds of fixed sizes and densities.
+#  @details Results are dictionaries `{scale: {operation: seconds per call}}`, written as JSON.
+#  Operations that cannot run (no pygame for `Visual.show`, no Entity objects with the
+#  numpy engine) are reported as None.
+class Bench:
+
+    VERSION = 1  ##< Version of the JSON results.
+
+    ## Synthetic worlds: name -> (map size, number of entities, number of foods or None for Food.maxFoods).
+    SCALES = {
+        'small': ((200, 150), 10, 10),
+        'medium': ((300, 300), 2000, 5000),
+        'large': ((499, 499), 50000, None),
+    }
+
+    OPERATIONS = ('RSim.step', 'Entity.eat', 'Entity.moveTowardsFood', 'Map.rmdCoord',
+                  'Visual.show', 'Save.checkpoint', 'Save.save', 'Save.load')  ##< Operations timed on every scale.
+
+    REPEAT = 3        ##< Default number of repetitions; the best one is kept.
+    THRESHOLD = 1.25  ##< Default slowdown ratio above which an operation is a regression.
+    SEED = 0          ##< Seed of every synthetic world.
+
+    ##
+    #  @brief Initializes the suite.
+    #  @param repeat Number of repetitions of every measure (default is REPEAT).
+    #  @param engine Engine stepping the entities, one of RSim.ENGINES (default is 'object').
+    #  @param visual If True, `Visual.show` is timed in a window (default is True).
+    def __init__(self, repeat=REPEAT, engine='object', visual=True):
+        self.repeat = repeat
+        self.engine = engine
+        self.visual = visual
+
+    ##
+    #  @brief Builds the synthetic world of a scale.
+    #  @param scale A key of SCALES.
+    #  @return A generated *World*.
+    def world(self, scale):
+        size, nEntities, nFoods = Bench.SCALES[scale]
+        world = World(size=size, engine=self.engine, seed=Bench.SEED, headless=not self.visual)
+        with world:
+            RSim.generate(nEntities, Food.maxFoods if nFoods is None else nFoods)
+        return world
+
+    ##
+    #  @brief Times a function.
+    #  @param function The function to call, without arguments.
+    #  @param number Number of calls made by `function`, to report the time of one call.
+    #  @param setup Function called, untimed, before every repetition, or None.
+    #  @return The best time of one call over the repetitions, in seconds.
+    def _time(self, function, number=1, setup=None):
+        best = float('inf')
+        for _ in range(self.repeat):
+            if setup is not None:
+                setup()
+            start = perf_counter()
+            function()
+            best = min(best, (perf_counter() - start) / max(number, 1))
+        return best
+
+    ##
+    #  @brief Restores the world of the active scale from its last checkpoint.
+    #  @return The list of its entities.
+    #  @details The journal written since is dropped first, so that the checkpoint alone is loaded.
+    #  The food direction field is built too, so that the timed calls do not build it.
+    def _restore(self):
+        RSim.save.journal.clear()
+        RSim.save.load()
+        Map.occupancy.field(Entity.RANGE_DEF)
+        return list(Entity.list)
+
+    ##
+    #  @brief Times every operation on one scale.
+    #  @param scale A key of SCALES.
+    #  @return A dictionary mapping OPERATIONS to seconds per call, or None.
+    def measure(self, scale):
+        world = self.world(scale)
+        results = dict.fromkeys(Bench.OPERATIONS)
+        with world:
+            # Every operation changing the world or its save starts from the generated world:
+            # it is restored from its checkpoint before every repetition.
+            RSim.save.checkpoint()
+            entities = list(Entity.list)
+            def restore():
+                entities[:] = self._restore()
+            def step():
+                restore()
+                RSim.step()
+            if entities:
+                results['Entity.eat'] = self._time(lambda: [e.eat() for e in entities], len(entities), restore)
+                results['Entity.moveTowardsFood'] = self._time(lambda: [e.moveTowardsFood() for e in entities], len(entities), restore)
+            results['Map.rmdCoord'] = self._time(lambda: [Map.rmdCoord(Map.occupancy) for _ in range(1000)], 1000)
+            if RSim.visual is not None:
+                RSim.visual.update(Snapshot(RSim.save.time))
+                results['Visual.show'] = self._time(RSim.visual.show)
+            results['Save.checkpoint'] = self._time(RSim.save.checkpoint, setup=restore)
+            # A step after the restore gives every save the same tick of changes to journal.
+            results['Save.save'] = self._time(RSim.save.save, setup=step)
+            results['Save.load'] = self._time(RSim.save.load)
+            results['RSim.step'] = self._time(RSim.step, setup=restore)
+            if RSim.visual is not None:
+                RSim.visual.close()
+        return results
+
+    ##
+    #  @brief Times every operation on several scales.
+    #  @param scales A list of keys of SCALES.
+    #  @param verbose If True, every measure is printed on stderr.
+    #  @return A dictionary with the metadata of the run and the 'results' per scale.
+    def run(self, scales, verbose=False):
+        results = {}
+        for scale in scales:
+            results[scale] = self.measure(scale)
+            if verbose:
+                for operation, seconds in results[scale].items():
+                    print(f"{scale:>8} {operation:<24} {Bench.format(seconds)}", file=sys.stderr)
+        return {
+            'version': Bench.VERSION,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'engine': self.engine,
+            'repeat': self.repeat,
+            'results': results,
+        }
+
+    ##
+    #  @brief Measures the size of a full save and its encode and decode times for every codec.
+    #  @param scales A list of keys of SCALES.
+    #  @param levels A list of compression levels to try for every codec but 'none'.
+    #  @param verbose If True, every measure is printed on stderr.
+    #  @return A dictionary with the metadata of the run and the 'codecs' results per scale:
+    #  `{scale: {'codec:level': {'size', 'encode', 'decode'}}}`, sizes in bytes and times in seconds.
+    def codecs(self, scales, levels=(Save.LEVEL,), verbose=False):
+        results = {}
+        for scale in scales:
+            world = self.world(scale)
+            results[scale] = {}
+            with world:
+                save = RSim.save
+                for codec in Save.CODECS:
+                    for level in levels if codec != 'none' else (None,):
+                        save.codec, save.level = codec, level
+                        name = codec if level is None else f"{codec}:{level}"
+                        results[scale][name] = {
+                            'encode': self._time(save.checkpoint),
+                            'size': os.path.getsize(save.path),
+                            'decode': self._time(save.load),
+                        }
+                        if verbose:
+                            result = results[scale][name]
+                            print(f"{scale:>8} {name:<8} {result['size']:>12,d} B  encode {Bench.format(result['encode']):>10}"
+                                  f"  decode {Bench.format(result['decode']):>10}", file=sys.stderr)
+                if RSim.visual is not None:
+                    RSim.visual.close()
+        return {
+            'version': Bench.VERSION,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'engine': self.engine,
+            'repeat': self.repeat,
+            'codecs': results,
+        }
+
+    ##
+    #  @brief Formats a duration.
+    #  @param seconds A duration in seconds, or None.
+    #  @return The duration with a readable unit, or '-'.
+    @staticmethod
+    def format(seconds):
+        if seconds is None:
+            return '-'
+        for unit, factor in (('s', 1), ('ms', 1e3), ('us', 1e6)):
+            if seconds * factor >= 1:
+                return f"{seconds * factor:.3f}{unit}"
+        return f"{seconds * 1e9:.1f}ns"
+
+    ##
+    #  @brief Compares results against a baseline.
+    #  @param baseline A dictionary returned by *run*, used as reference.
+    #  @param current A dictionary returned by *run*.
+    #  @param threshold Slowdown ratio above which an operation is a regression.
+    #  @return A list of tuples (scale, operation, baseline seconds, current seconds, ratio, regression)
+    #  for every operation measured in both.
+    @staticmethod
+    def compare(baseline, current, threshold=THRESHOLD):
+        rows = []
+        for scale, operations in current['results'].items():
+            for operation, seconds in operations.items():
+                reference = baseline['results'].get(scale, {}).get(operation)
+                if seconds is None or not reference:
+                    continue
+                ratio = seconds / reference
+                rows.append((scale, operation, reference, seconds, ratio, ratio > threshold))
+        return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the RSim hot paths on synthetic worlds.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='Time every operation and write the results as JSON')
+    run.add_argument('--scale', choices=list(Bench.SCALES), action='append', help='Scale to run (repeatable, default: all)')
+    run.add_argument('--repeat', type=int, help='Number of repetitions of every measure', default=Bench.REPEAT)
+    run.add_argument('--engine', choices=RSim.ENGINES, help='Simulation engine', default='object')
+    run.add_argument('--no-visual', action='store_true', help='Do not time Visual.show')
+    run.add_argument('-o', '--out', help='JSON file receiving the results (default: stdout)', default=None)
+
+    codecs = commands.add_parser('codecs', help='Measure save size and encode/decode time of every codec')
+    codecs.add_argument('--scale', choices=list(Bench.SCALES), action='append', help='Scale to run (repeatable, default: all)')
+    codecs.add_argument('--level', type=int, action='append', help=f'Compression level (repeatable, default: {Save.LEVEL})')
+    codecs.add_argument('--repeat', type=int, help='Number of repetitions of every measure', default=Bench.REPEAT)
+    codecs.add_argument('--engine', choices=RSim.ENGINES, help='Simulation engine', default='object')
+    codecs.add_argument('-o', '--out', help='JSON file receiving the results (default: stdout)', default=None)
+
+    compare = commands.add_parser('compare', help='Flag regressions of results against a baseline')
+    compare.add_argument('baseline', help='JSON results used as reference')
+    compare.add_argument('current', help='JSON results to check')
+    compare.add_argument('--threshold', type=float, help='Slowdown ratio flagged as a regression', default=Bench.THRESHOLD)
+
+    args = parser.parse_args()
+
+    if args.command in ('run', 'codecs'):
+        # Render off-screen when no display is available.
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        visual = args.command == 'run' and not args.no_visual
+        if visual:
+            try:
+                import pygame
+            except ImportError:
+                visual = False
+
+        # Keep the benchmark saves away from the user's saves.
+        with tempfile.TemporaryDirectory() as directory:
+            Save._dir = Path(directory) / 'saves'
+            Save._backup = Path(directory) / 'backups'
+            bench = Bench(args.repeat, args.engine, visual)
+            if args.command == 'run':
+                results = bench.run(args.scale or list(Bench.SCALES), verbose=True)
+            else:
+                results = bench.codecs(args.scale or list(Bench.SCALES), args.level or [Save.LEVEL], verbose=True)
+
+        text = json.dumps(results, indent=2)
+        if args.out:
+            with open(args.out, 'w') as file:
+                file.write(text + '\n')
+        else:
+            print(text)
+
+    elif args.command == 'compare':
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        with open(args.current) as file:
+            current = json.load(file)
+
+        rows = Bench.compare(baseline, current, args.threshold)
+        for scale, operation, reference, seconds, ratio, regression in rows:
+            flag = 'REGRESSION' if regression else 'ok'
+            print(f"{scale:>8} {operation:<24} {Bench.format(reference):>12} -> {Bench.format(seconds):>12}  x{ratio:.2f}  {flag}")
+        if any(row[-1] for row in rows):
+            exit(1)
@@ -60,6 +60,8 @@ class Cmd:
         cmd = parts[0]
         if cmd == "save":
             cls._save()
+        elif cmd == "checkpoint":
+            cls._checkpoint()
         elif cmd == "exit":
             cls._running = False
         elif cmd == "help":
@@ -68,20 +70,35 @@ class Cmd:
             cls._clear()
         elif cmd == "spawn":
             cls._spawn(parts[1:])
+        elif cmd == "speed":
+            cls._speed(parts[1:])
+        elif cmd == "profile":
+            cls._profile(parts[1:])
+        elif cmd == "stats":
+            cls._stats()
+        elif cmd == "trace":
+            cls._trace(parts[1:])
+        elif cmd in ("inspect", "kill", "track"):
+            cls._entityCmd(cmd, parts[1:])
         else:
             print("Unknown command. Type 'help' for a list of commands.")
 
     ## 
     #  @brief Saves the current state of the simulation.
-    #  @details This method attempts to save the current simulation state and handles any errors.
+    #  @details The save is started in the background by the main loop at the next tick boundary;
+    #  its progress and errors are shown by the "Saving..." overlay.
     @classmethod
     def _save(cls):
-        try:
-            cls.save_duration = 60
-            cls.save.save()
-            print(f"Saving simulation with ID {cls.save.number}...")
-        except Exception as e:
-            print(f"Error saving simulation: {e}")
+        cls._save_request = 'save'
+        print(f"Saving simulation with ID {cls.save.number}...")
+
+    ## 
+    #  @brief Writes a full checkpoint of the simulation, folding the journal into it.
+    #  @details Started in the background like *_save*.
+    @classmethod
+    def _checkpoint(cls):
+        cls._save_request = 'checkpoint'
+        print(f"Writing a checkpoint of simulation with ID {cls.save.number}...")
 
     ## 
     #  @brief Clears the terminal screen and resets the input prompt.
@@ -92,9 +109,10 @@ class Cmd:
         os.system(command)
 
     ## 
-    #  @brief Spawns entities or food in the simulation.
+    #  @brief Asks for entities or food to spawn in the simulation, at the next tick boundary.
     #  @param args The arguments for the spawn command.
-    #  @details This method interprets the spawn command and creates the specified element type.
+    #  @details This method interprets the spawn command; the element is created by *_runWorldCmds*
+    #  on the simulation thread.
     @classmethod
     def _spawn(cls, args):
         if len(args) < 1:
@@ -102,6 +120,9 @@ class Cmd:
             return
 
         elem_type = args[0]
+        if elem_type not in ('entity', 'food'):
+            print("Unknown element type. Use 'entity' or 'food'.")
+            return
         
         # Initialization of coordinates
         x, y = None, None
@@ -114,6 +135,15 @@ class Cmd:
             print("Coordinates must be integers.")
             return
 
+        cls._world_requests.append(("spawn", (elem_type, x, y)))
+
+    ## 
+    #  @brief Creates entities or food in the simulation.
+    #  @param elem_type The type of the element: 'entity' or 'food'.
+    #  @param x The x-coordinate of the element, or None for a random location.
+    #  @param y The y-coordinate of the element, or None for a random location.
+    @classmethod
+    def _doSpawn(cls, elem_type, x, y):
         # Create entities based on the type
         if elem_type == 'entity':
             if x is not None and y is not None:
@@ -122,15 +152,115 @@ class Cmd:
             else:
                 Entity.generate()
                 print("Spawning entity at a random location.")
-        elif elem_type == 'food':
+        else:
             if x is not None and y is not None:
                 Food.new((x, y))
                 print(f"Spawning food at ({x}, {y})")
             else:
                 Food.generate()
                 print("Spawning food at a random location.")
-        else:
-            print("Unknown element type. Use 'entity' or 'food'.")
+
+    ## 
+    #  @brief Displays or changes the speed of the simulation.
+    #  @param args The arguments for the speed command.
+    #  @details Without argument, the current speed is displayed.
+    @classmethod
+    def _speed(cls, args):
+        if len(args) > 0:
+            try:
+                cls.setSpeed(args[0])
+            except ValueError:
+                print("Usage: speed [1|10|max|<multiplier>]")
+                return
+        print(f"Speed: {cls.scheduler.speedName()} ({cls.scheduler.tps} ticks/s at 1x)")
+
+    ## 
+    #  @brief Enables or disables the tick profiler.
+    #  @param args The arguments for the profile command: 'on', 'off' or 'trace'.
+    #  @details 'trace' enables the profiler and also records the tick spans for the trace command.
+    @classmethod
+    def _profile(cls, args):
+        if len(args) != 1 or args[0] not in ('on', 'off', 'trace'):
+            print("Usage: profile <on|off|trace>")
+            return
+        cls.profile(args[0] != 'off', args[0] == 'trace')
+        print(f"Profiler {'disabled' if args[0] == 'off' else 'enabled'}.")
+
+    ## 
+    #  @brief Displays the rolling percentiles of the duration of each tick phase.
+    @classmethod
+    def _stats(cls):
+        if cls.profiler is None:
+            print("Profiler disabled. Type 'profile on' to enable it.")
+            return
+        print(cls.profiler.report())
+
+    ## 
+    #  @brief Writes the recorded tick spans to a Chrome/Perfetto trace file.
+    #  @param args The arguments for the trace command: the path of the file.
+    @classmethod
+    def _trace(cls, args):
+        if len(args) != 1:
+            print("Usage: trace <file>")
+            return
+        if cls.profiler is None or cls.profiler.trace is None:
+            print("Trace disabled. Type 'profile trace' to record one.")
+            return
+        cls.profiler.dump(args[0])
+        print(f"Trace of {len(cls.profiler.trace)} events written to {args[0]}")
+
+    ## 
+    #  @brief Asks for a command on one entity, run by the simulation at the next tick boundary.
+    #  @param cmd The command: 'inspect', 'kill' or 'track'.
+    #  @param args The arguments of the command: the id of the entity, decimal or '#' and hexadecimal
+    #  as shown by the entities; 'track' also accepts 'off'.
+    @classmethod
+    def _entityCmd(cls, cmd, args):
+        usage = f"Usage: {cmd} <id>" + ("|off" if cmd == "track" else "")
+        if len(args) != 1:
+            print(usage)
+            return
+        if cmd == "track" and args[0] == "off":
+            cls._world_requests.append((cmd, None))
+            return
+        try:
+            id = int(args[0][1:], 16) if args[0].startswith('#') else int(args[0])
+        except ValueError:
+            print(usage)
+            return
+        cls._world_requests.append((cmd, id))
+
+    ## 
+    #  @brief Runs the commands changing or reading the world asked since the last call.
+    #  @details Called by the simulation at a tick boundary, so that the entities, the food and
+    #  their indexes are only touched by the simulation thread. The entities are found by id in O(1)
+    #  (see *Entity.get*).
+    @classmethod
+    def _runWorldCmds(cls):
+        while cls._world_requests:
+            cmd, arg = cls._world_requests.pop(0)
+            if cmd == "spawn":
+                try:
+                    cls._doSpawn(*arg)
+                except (TypeError, ValueError) as err:
+                    print(f"#ERROR: {err}")
+                continue
+            id = arg
+            if cmd == "track" and id is None:
+                cls.tracked = None
+                print("Tracking stopped.")
+                continue
+            entity = Entity.get(id)
+            if entity is None:
+                print(f"No entity with id {id} (#{id:04X}).")
+            elif cmd == "inspect":
+                print(entity)
+            elif cmd == "kill":
+                Entity.remove(id)
+                print(f"Killed {entity}")
+            else:
+                cls.tracked = id
+                print(f"Tracking {entity}")
 
     ## 
     #  @brief Displays the help message with available commands.
@@ -139,7 +269,15 @@ class Cmd:
     def _help(cls):
         print("Available commands:")
         print(" - save: Saves the current state of the simulation.")
+        print(" - checkpoint: Saves the whole simulation and clears the journal of changes.")
         print(" - spawn <elem_type> [x] [y] [...]: Make an element spawn in the simulation.")
+        print(" - speed [1|10|max|<multiplier>]: Displays or changes the speed of the simulation.")
+        print(" - profile <on|off|trace>: Enables or disables the tick profiler, with or without trace.")
+        print(" - stats: Displays the rolling percentiles of the tick phases.")
+        print(" - trace <file>: Writes the recorded tick spans to a Chrome/Perfetto trace file.")
+        print(" - inspect <id>: Displays the entity with this id (decimal, or '#' and hexadecimal).")
+        print(" - kill <id>: Removes the entity with this id from the simulation.")
+        print(" - track <id>|off: Makes the camera follow the entity with this id, or stops following.")
         print(" - exit: Exits the simulation.")
         print(" - clear: Clears the terminal screen.")
         print(" - help: Displays this help message.")
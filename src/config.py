@@ -11,6 +11,16 @@ import os
 DEFAULT_WINDOW_NAME = 'RSim - Simulation'
 DEFAULT_WINDOW_WIDTH = 800
 DEFAULT_WINDOW_HEIGHT = 600
+DEFAULT_RENDERER = 'rects'
+
+DEFAULT_TPS = 10
+DEFAULT_SPEED = '1'
+DEFAULT_AUTOSAVE = 0
+DEFAULT_FOOD_RATE = 1.0
+DEFAULT_FOOD_CELL_RATE = 0.0
+
+DEFAULT_SAVE_CODEC = 'none'
+DEFAULT_SAVE_LEVEL = 6
 
 
 class _Config_Visual:
@@ -18,7 +28,7 @@ class _Config_Visual:
     #  @brief Initializes the _Config_Visual class from a config parser object.
     #
     #  This constructor retrieves visual configuration parameters such as 
-    #  window name, width, and height from the provided config object. 
+    #  window name, width, height and renderer from the provided config object. 
     #
     #  @param config A configparser.ConfigParser object containing the configuration.
     def __init__(self, config):
@@ -26,6 +36,7 @@ class _Config_Visual:
             self.window_name = config.get('VISUAL', 'window_name', fallback=DEFAULT_WINDOW_NAME)
             self.window_width = config.getint('VISUAL', 'window_width', fallback=DEFAULT_WINDOW_WIDTH)
             self.window_height = config.getint('VISUAL', 'window_height', fallback=DEFAULT_WINDOW_HEIGHT)
+            self.renderer = config.get('VISUAL', 'renderer', fallback=DEFAULT_RENDERER)
         except (configparser.NoSectionError, configparser.NoOptionError) as e:
             raise f"Error reading config: {e}"
         
@@ -39,6 +50,69 @@ class _Config_Visual:
             f"     - window_name: '{self.window_name}'\n"
             f"     - window_width: {self.window_width}pxl\n"
             f"     - window_height: {self.window_height}pxl\n"
+            f"     - renderer: {self.renderer}\n"
+            )
+
+
+class _Config_Simulation:
+    ## 
+    #  @brief Initializes the _Config_Simulation class from a config parser object.
+    #
+    #  This constructor retrieves simulation parameters such as the target 
+    #  number of ticks per second, the starting speed multiplier, the
+    #  number of ticks between two autosaves (0 disables autosave) and the
+    #  mean number of foods regrown per tick and per free cell and tick.
+    #
+    #  @param config A configparser.ConfigParser object containing the configuration.
+    def __init__(self, config):
+        try:
+            self.tps = config.getint('SIMULATION', 'tps', fallback=DEFAULT_TPS)
+            self.speed = config.get('SIMULATION', 'speed', fallback=DEFAULT_SPEED)
+            self.autosave = config.getint('SIMULATION', 'autosave', fallback=DEFAULT_AUTOSAVE)
+            self.food_rate = config.getfloat('SIMULATION', 'food_rate', fallback=DEFAULT_FOOD_RATE)
+            self.food_cell_rate = config.getfloat('SIMULATION', 'food_cell_rate', fallback=DEFAULT_FOOD_CELL_RATE)
+        except (configparser.NoSectionError, configparser.NoOptionError, ValueError) as e:
+            raise ValueError(f"Error reading config: {e}")
+
+    ## 
+    #  @brief Returns a string representation of the simulation configuration.
+    #
+    #  @return A formatted string describing the simulation configuration settings.
+    def __repr__(self) -> str:
+        return (
+            f"  Simulation:\n"
+            f"     - tps: {self.tps}\n"
+            f"     - speed: {self.speed}\n"
+            f"     - autosave: {self.autosave} ticks\n"
+            f"     - food_rate: {self.food_rate} foods/tick\n"
+            f"     - food_cell_rate: {self.food_cell_rate} foods/cell/tick\n"
+            )
+
+
+class _Config_Save:
+    ## 
+    #  @brief Initializes the _Config_Save class from a config parser object.
+    #
+    #  This constructor retrieves the compression codec of the saves 
+    #  (none, zlib, lzma or bz2) and its level.
+    #
+    #  @param config A configparser.ConfigParser object containing the configuration.
+    def __init__(self, config):
+        try:
+            self.codec = config.get('SAVE', 'codec', fallback=DEFAULT_SAVE_CODEC)
+            self.level = config.getint('SAVE', 'level', fallback=DEFAULT_SAVE_LEVEL)
+        except (configparser.NoSectionError, configparser.NoOptionError, ValueError) as e:
+            raise ValueError(f"Error reading config: {e}")
+
+    ## 
+    #  @brief Returns a string representation of the save configuration.
+    #
+    #  @return A formatted string describing the save configuration settings.
+    def __repr__(self) -> str:
+        return (
+            f"  Save:\n"
+            f"     - codec: {self.codec}\n"
+            f"     - level: {self.level}\n"
             )
 
 
@@ -49,8 +123,10 @@ class Config:
     #  @brief A class for managing the configuration settings of the application.
     #
     #  This class provides methods to initialize configuration from a file, 
-    #  create default configurations, and access visual settings.
+    #  create default configurations, and access visual and simulation settings.
     visual = None
+    simulation = None
+    save = None
 
     ## 
     #  @brief Initializes the configuration from a specified file.
@@ -74,12 +150,14 @@ class Config:
         config.read(config_file)
 
         Config.visual = _Config_Visual(config)
+        Config.simulation = _Config_Simulation(config)
+        Config.save = _Config_Save(config)
         return None
 
     ## 
     #  @brief Creates and writes a default configuration file.
     #
-    #  This method initializes default visual settings and writes them to the 
+    #  This method initializes default visual and simulation settings and writes them to the 
     #  specified config file.
     #
     #  @param config_file The path to the configuration file (default: path.PATH_CONFIG).
@@ -90,7 +168,19 @@ class Config:
         config['VISUAL'] = {
             'window_name': DEFAULT_WINDOW_NAME,
             'window_width': DEFAULT_WINDOW_WIDTH,
-            'window_height': DEFAULT_WINDOW_HEIGHT
+            'window_height': DEFAULT_WINDOW_HEIGHT,
+            'renderer': DEFAULT_RENDERER
+        }
+        config['SIMULATION'] = {
+            'tps': DEFAULT_TPS,
+            'speed': DEFAULT_SPEED,
+            'autosave': DEFAULT_AUTOSAVE,
+            'food_rate': DEFAULT_FOOD_RATE,
+            'food_cell_rate': DEFAULT_FOOD_CELL_RATE
+        }
+        config['SAVE'] = {
+            'codec': DEFAULT_SAVE_CODEC,
+            'level': DEFAULT_SAVE_LEVEL
         }
 
         # Write the default configuration to a file
@@ -104,7 +194,7 @@ class Config:
     #  @return A formatted string describing the current configuration settings.
     def __repr__(self) -> str:
         return (
-            f"Config:\n{self.visual}"
+            f"Config:\n{self.visual}{self.simulation}{self.save}"
         )
 
 # Example usage
@@ -11,7 +11,14 @@ from random import randint
 ##
 #  @class Element
 #  @brief Class representing an element on the map
+#
+#  The coordinates are stored in the slots `_x` and `_y`. The `x`, `y` and `coord` properties
+#  validate every value and are meant for the code outside the simulation (constructors,
+#  commands, loading). The step loop reads and writes `_x` and `_y` directly: its moves stay
+#  on the map by construction, so they skip the checks.
 class Element:
+    __slots__ = ('_x', '_y')
+
     list = []  ##< List of all elements
     
     ##
@@ -89,6 +96,7 @@ class Element:
     #  @param value A tuple (x, y) representing the new coordinates.
     #  @throws TypeError if 'value' is not a tuple.
     #  @throws ValueError if 'value' does not have a length of 2.
+    @coord.setter
     def coord(self, value):
         """Set the coordinates of the element with validation."""
         if not isinstance(value, tuple):
@@ -129,8 +137,8 @@ class Element:
     #  @return The Euclidean distance between the element's position and the given position.
     def distance(self, elem) -> float:
         # Calculate Euclidean distance
-        dx = self.x - elem.x
-        dy = self.y - elem.y
+        dx = self._x - elem._x
+        dy = self._y - elem._y
         return sqrt(dx**2 + dy**2)
 
     
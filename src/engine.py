@@ -0,0 +1,335 @@
+##
+#  @file engine.py
+#  @brief File containing the class *Engine*, a NumPy structure-of-arrays population.
+#  @date 2026-10-16
+#  @author Rabyte Studio
+
+import numpy as np
+from random import getrandbits
+from entity import Entity
+from food import Food
+from map import Map
+
+##
+#  @class Engine
+#  @brief Population of entities stored as NumPy arrays and stepped as a whole.
+#  @details Each entity is a row shared by the arrays `x`, `y`, `energy`, `time`, `age` and `id`;
+#  only the first `n` rows are alive. A tick applies the rules of *Entity* to the whole population
+#  at once, phase by phase: energy decay and aging, eating, reproduction, movement, death.
+#  Newborns are appended at the end of the tick and only move from the next one.
+#  Rows are found by id through an array indexed by id (see *find*), updated with the rows that
+#  change as entities are added, removed or compacted at death.
+#  Ids are 2 bytes wide, like in the saves: the population is capped at `Entity.MAX_ID` living
+#  entities, so that every one keeps an id of its own. New entities take the next unused ids;
+#  entities added beyond the cap are dropped, and reproduction stops while the population is full.
+#  The food stays owned by *Food*; its cells are read from the bitmap of `Map.occupancy`.
+class Engine:
+
+    CAPACITY_DEF = 1024  ##< Default number of rows allocated.
+
+    ##
+    #  @brief Initializes an empty population.
+    #  @param capacity Number of rows allocated up front (default is CAPACITY_DEF).
+    def __init__(self, capacity=CAPACITY_DEF):
+        self.n = 0  ##< Number of living entities.
+        self.x = np.zeros(capacity, dtype=np.int32)
+        self.y = np.zeros(capacity, dtype=np.int32)
+        self.energy = np.zeros(capacity, dtype=np.int32)
+        self.time = np.zeros(capacity, dtype=np.int32)
+        self.age = np.zeros(capacity, dtype=np.int32)
+        self.id = np.zeros(capacity, dtype=np.int32)
+
+        self._rows = np.full(Entity.MAX_ID + 1, -1, dtype=np.int32)  ##< Id -> row, or -1.
+
+        # Seeded from `random` so that seeding the simulation also seeds the engine.
+        self.rng = np.random.default_rng(getrandbits(64))
+
+    ##
+    #  @brief Returns a string representation of the population.
+    #  @return A string with the number of living entities and allocated rows.
+    def __repr__(self) -> str:
+        return f"<Engine: n={self.n}, capacity={len(self.x)}>"
+
+    ##
+    #  @brief Returns the number of living entities.
+    #  @return The number of living entities.
+    def __len__(self):
+        return self.n
+
+    ##
+    #  @brief Removes every entity.
+    def clear(self):
+        self._rows[self.id[:self.n]] = -1
+        self.n = 0
+
+    ##
+    #  @brief Returns the row of the living entity with an id.
+    #  @param id The identifier of the entity.
+    #  @return The row, or None if no living entity has this id. If several share it, the last one
+    #  added; it is no longer found once one of them is removed.
+    #  @details O(1): the index is kept up to date by the changes of the rows.
+    def find(self, id):
+        if not 0 <= id <= Entity.MAX_ID:
+            return None
+        row = int(self._rows[id])
+        return row if row >= 0 else None
+
+    ##
+    #  @brief Returns a copy of the living entity with an id.
+    #  @param id The identifier of the entity.
+    #  @return A new *Entity* with the values of its row, or None if no living entity has this id.
+    def get(self, id):
+        row = self.find(id)
+        if row is None:
+            return None
+        return Entity((int(self.x[row]), int(self.y[row])), int(self.energy[row]), int(self.time[row]), id)
+
+    ##
+    #  @brief Removes the living entity with an id, in O(1).
+    #  @param id The identifier of the entity.
+    #  @return True if the entity was removed, False if no living entity has this id.
+    #  @details The last row is moved into the removed one, so the order of the others may change.
+    def remove(self, id):
+        row = self.find(id)
+        if row is None:
+            return False
+        last = self.n - 1
+        self._rows[id] = -1
+        if row != last:
+            for column in (self.x, self.y, self.energy, self.time, self.age, self.id):
+                column[row] = column[last]
+            self._rows[self.id[row]] = row
+        self.n = last
+        return True
+
+    ##
+    #  @brief Adds a single entity, with the same validation and clamping as *Entity*.
+    #  @param coord A tuple (x, y) representing the coordinates of the entity.
+    #  @param energy Initial energy value of the entity.
+    #  @param time Initial time value of the entity (default is 0).
+    #  @param id Identifier of the entity, or None to draw the next one.
+    #  @throws TypeError if a value is not an integer.
+    #  @throws ValueError if the coordinates are out of the map, or the population is full.
+    def add(self, coord, energy, time=0, id=None):
+        x, y = coord
+        if not all(isinstance(v, int) for v in (x, y, energy, time)):
+            raise TypeError("coordinates, energy and time must be integers!")
+        if x not in range(Map.size[0]) or y not in range(Map.size[1]):
+            raise ValueError(f"({x}, {y}) must be in the map {Map.size}!")
+        if id is None and self.n >= Entity.MAX_ID:
+            raise ValueError(f"the population is full ({Entity.MAX_ID} entities)!")
+        self.extend([x], [y], [energy], [time], None if id is None else [id])
+
+    ##
+    #  @brief Appends a batch of entities.
+    #  @param x Array-like of x-coordinates.
+    #  @param y Array-like of y-coordinates.
+    #  @param energy Array-like of energies, clamped to [0, ENERGY_MAX].
+    #  @param time Array-like of times; times out of [0, TIME_MAX[ kill the entity like *Entity.time*.
+    #  @param ids Array-like of identifiers, or None to draw unused ones (see *_free*); entities
+    #  beyond the free ids are then dropped.
+    def extend(self, x, y, energy, time, ids=None):
+        x = np.asarray(x, dtype=np.int32)
+        y = np.asarray(y, dtype=np.int32)
+        time = np.asarray(time, dtype=np.int64)
+        energy = np.clip(np.asarray(energy, dtype=np.int64), 0, Entity.ENERGY_MAX)
+        if ids is None:
+            ids = self._free(len(x))
+            x, y, energy, time = x[:len(ids)], y[:len(ids)], energy[:len(ids)], time[:len(ids)]
+        k = len(x)
+        if k == 0:
+            return
+        self._reserve(self.n + k)
+        valid = (time >= 0) & (time < Entity.TIME_MAX)
+
+        rows = slice(self.n, self.n + k)
+        self.x[rows] = x
+        self.y[rows] = y
+        self.energy[rows] = np.where(valid, energy, 0)
+        self.time[rows] = np.where(valid, time, -1)
+        self.age[rows] = np.where(valid, time // Entity.TIME_IN_AGE, 0)
+        self.id[rows] = ids
+        self._rows[ids] = np.arange(self.n, self.n + k, dtype=np.int32)
+        self.n += k
+
+    ##
+    #  @brief Draws ids held by no living entity.
+    #  @param k The number of ids wanted.
+    #  @return An array of at most k ids, the first unused ones after `Entity.nEntities`, with the
+    #  same wrap-around as *Entity.__init__*: ids run from 1 to MAX_ID.
+    def _free(self, k):
+        free = np.flatnonzero(self._rows[1:] < 0) + 1
+        start = int(np.searchsorted(free, Entity.nEntities, side='right'))
+        ids = np.concatenate((free[start:start + k], free[:min(start, max(0, k - (len(free) - start)))]))
+        if len(ids):
+            Entity.nEntities = int(ids[-1])
+        return ids
+
+    ##
+    #  @brief Generates entities at random positions with default energy.
+    #  @param count Number of entities to generate.
+    def generate(self, count):
+        x = self.rng.integers(0, Map.size[0], count)
+        y = self.rng.integers(0, Map.size[1], count)
+        self.extend(x, y, np.full(count, Entity.ENERGY_DEF), np.zeros(count))
+
+    ##
+    #  @brief Returns the rows of the living entities.
+    #  @return An iterator of tuples (id, x, y, energy, time).
+    def rows(self):
+        n = self.n
+        return zip(self.id[:n].tolist(), self.x[:n].tolist(), self.y[:n].tolist(),
+                   self.energy[:n].tolist(), self.time[:n].tolist())
+
+    ##
+    #  @brief Packs the living entities as save records (see *Save.HEADER*).
+    #  @return The records (id, x, y, energy, time) as big-endian 2-byte fields.
+    #  @throws ValueError if a value does not fit in 2 bytes.
+    def pack(self):
+        n = self.n
+        records = np.stack([self.id[:n], self.x[:n], self.y[:n], self.energy[:n], self.time[:n]], axis=1)
+        if records.size and (records.min() < 0 or records.max() > 0xFFFF):
+            raise ValueError("entity values must fit in 2 bytes!")
+        return records.astype('>u2').tobytes()
+
+    ##
+    #  @brief Appends entities from save records.
+    #  @param data The records (id, x, y, energy, time) as big-endian 2-byte fields.
+    #  @throws ValueError if a coordinate is out of the map.
+    def unpack(self, data):
+        records = np.frombuffer(data, dtype='>u2').reshape(-1, 5).astype(np.int32)
+        x, y = records[:, 1], records[:, 2]
+        if len(records) and (x.max() >= Map.size[0] or y.max() >= Map.size[1]):
+            raise ValueError(f"entity coordinates must be in the map {Map.size}!")
+        self.extend(x, y, records[:, 3], records[:, 4], records[:, 0])
+
+    ##
+    #  @brief Returns the coordinates of the living entities.
+    #  @return An iterator of tuples (x, y).
+    def coords(self):
+        return zip(self.x[:self.n].tolist(), self.y[:self.n].tolist())
+
+    ##
+    #  @brief Executes a single simulation step for the whole population.
+    #  @param lap Optional function called with the name of each phase once it is done
+    #  (see *Profiler.lap*), or None.
+    def step(self, lap=None):
+        if self.n == 0:
+            return
+        if lap is None:
+            lap = _noLap
+        n = self.n
+        x, y = self.x[:n], self.y[:n]
+        energy, time, age = self.energy[:n], self.time[:n], self.age[:n]
+
+        # Energy decay and aging (Entity.move, Entity.time).
+        np.maximum(energy - 1, 0, out=energy)
+        time += 1
+        expired = time >= Entity.TIME_MAX
+        time[expired] = -1
+        energy[expired] = 0
+        age[:] = np.where(expired, 0, time // Entity.TIME_IN_AGE)
+        lap('decay')
+
+        self._eat(x, y, energy)
+        lap('eat')
+
+        # Reproduction (Entity.reproduction): newborns appear on their parent's cell,
+        # the first parents only when the population would exceed MAX_ID.
+        parents = np.flatnonzero((age >= Entity.AGE_REPROD.start) & (age < Entity.AGE_REPROD.stop)
+                                 & (energy >= Entity.MIN_REPROD))[:max(0, Entity.MAX_ID - n)]
+        energy[parents] -= Entity.REPROD
+        births = (x[parents].copy(), y[parents].copy())
+        lap('reproduction')
+
+        self._move(x, y)
+        lap('move')
+
+        # Death (Entity.survive), then births. Only the rows from the first death move.
+        alive = (energy > 0) & (age <= Entity.TIME_MAX)
+        if not alive.all():
+            m = int(alive.sum())
+            first = int(np.argmin(alive))
+            self._rows[self.id[first:n][~alive[first:]]] = -1
+            for column in (self.x, self.y, self.energy, self.time, self.age, self.id):
+                column[first:m] = column[first:n][alive[first:]]
+            self._rows[self.id[first:m]] = np.arange(first, m, dtype=np.int32)
+            self.n = m
+
+        count = len(births[0])
+        self.extend(births[0], births[1], np.full(count, Entity.ENERGY_DEF), np.zeros(count))
+        lap('death')
+
+    ##
+    #  @brief Lets every hungry entity standing on food eat it (Entity.eat).
+    #  @param x Array of the x-coordinates of the living entities.
+    #  @param y Array of the y-coordinates of the living entities.
+    #  @param energy Array of the energies of the living entities, updated in place.
+    #  @details When several entities share a food cell, the first one in the population eats.
+    def _eat(self, x, y, energy):
+        height = Map.size[1]
+        bitmap = np.frombuffer(Map.occupancy.bitmap, dtype=np.uint8)
+        cells = x * height + y
+        hungry = np.flatnonzero((energy < Entity.ENERGY_MAX) & (bitmap[cells] != 0))
+        if len(hungry) == 0:
+            return
+
+        eaten, first = np.unique(cells[hungry], return_index=True)
+        eaters = hungry[first]
+        pts = []
+        for cell in eaten.tolist():
+            food = Food.grid.at(*divmod(cell, height))
+            pts.append(food.pts)
+            Food.delete(food)
+        energy[eaters] = np.minimum(Entity.ENERGY_MAX, energy[eaters] + np.asarray(pts))
+
+    ##
+    #  @brief Moves every entity one step towards the closest food in range, or randomly.
+    #  @param x Array of the x-coordinates of the living entities, updated in place.
+    #  @param y Array of the y-coordinates of the living entities, updated in place.
+    #  @details The steps towards food are read from the direction field of `Map.occupancy`
+    #  (see *Field*), kept up to date as food is added and eaten.
+    def _move(self, x, y):
+        width, height = Map.size
+        steps = np.frombuffer(Map.occupancy.field(Entity.RANGE_DEF).steps, dtype=np.int8)[x * height + y]
+        towards = steps >= 0
+
+        # Random moves are uniform over the in-bounds neighbours (Entity.possibleMoves),
+        # i.e. independent uniform draws over the valid dx and the valid dy.
+        dx = self.rng.integers(np.where(x > 0, -1, 0), np.where(x < width - 1, 1, 0), endpoint=True)
+        dy = self.rng.integers(np.where(y > 0, -1, 0), np.where(y < height - 1, 1, 0), endpoint=True)
+        dx[towards] = steps[towards] // 3 - 1
+        dy[towards] = steps[towards] % 3 - 1
+
+        x += dx.astype(np.int32)
+        y += dy.astype(np.int32)
+
+    ##
+    #  @brief Grows the arrays so that they can hold a number of rows.
+    #  @param capacity The number of rows needed.
+    def _reserve(self, capacity):
+        if capacity <= len(self.x):
+            return
+        capacity = max(capacity, 2 * len(self.x))
+        for name in ('x', 'y', 'energy', 'time', 'age', 'id'):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.n] = column[:self.n]
+            setattr(self, name, grown)
+
+
+##
+#  @brief Lap function used when the engine is not profiled.
+#  @param phase The name of the phase, ignored.
+def _noLap(phase):
+    pass
+
+
+if __name__ == "__main__":
+    Map.init(Map.DEFAULT_SIZE)
+    engine = Engine()
+    engine.generate(10)
+    for _ in range(100):
+        Food.generate()
+    engine.step()
+    print(engine, list(engine.rows()))
@@ -7,13 +7,24 @@
 from element import Element
 from map import Map
 from food import Food
+from pool import Pool
+from field import Field
 from random import choices, randint
 from math import log, exp
 
 ## 
 #  @class Entity
 #  @brief Class representing an entity that extends *Element* and includes properties for energy, time, and age.
+#
+#  Like the coordinates (see *Element*), energy and time are validated by their properties,
+#  which are meant for the code outside the simulation. The methods run by the step loop
+#  (*decay*, *eat*, *reproduction*, *walk* and the moves) read and write the slots directly,
+#  and births go through the unchecked *_birth*.
+#
+#  The entities are stored in a *Pool*: the births and deaths of a tick are buffered, then
+#  applied by *commit* at its end. The pool indexes the living entities by id (see *get*).
 class Entity(Element):
+    __slots__ = ('_energy', '_time', '_age', 'range', 'id', '_slot')
 
     NBYTES_ID = 2
     NBYTES_ENERGY = 2  ##< Number of bytes for energy in the binary representation.
@@ -25,10 +36,11 @@ class Entity(Element):
 
     RANGE_DEF = 10     ##< Default viewing range for the entity.
 
-    list = []  ##< Class-level list to store all instances of Entity.
+    list = Pool('id')  ##< Class-level pool storing all instances of Entity, indexed by id.
+    engine = None  ##< *Engine* holding the population as arrays instead of `list`, or None.
 
     nEntities = 0
-    MAX_ID = 2 ** (NBYTES_ID * 8)
+    MAX_ID = 2 ** (NBYTES_ID * 8) - 1  ##< Largest id fitting in NBYTES_ID bytes; ids wrap around to 1.
 
     TIME_IN_AGE = 40
 
@@ -43,14 +55,22 @@ class Entity(Element):
     #  @param coord A tuple (x, y) representing the coordinates of the entity.
     #  @param energy An integer representing the initial energy of the entity.
     #  @param time An integer representing the time the entity has lived (default is 0).
-    def __init__(self, coord, energy, time=0):
+    #  @param id The identifier of the entity, or None to draw a new one (default is None).
+    def __init__(self, coord, energy, time=0, id=None):
         super().__init__(coord)  # Initialize position from the Element class.
         self.energy = energy     # Set the entity's energy.
         self.time = time         # Set the entity's time.
         self.range = Entity.RANGE_DEF
 
+        self.id = Entity._nextId() if id is None else id
+
+    ## 
+    #  @brief Draws the identifier of a new entity.
+    #  @return The next identifier, wrapping around to 1 after MAX_ID.
+    @staticmethod
+    def _nextId():
         Entity.nEntities = Entity.nEntities + 1 if Entity.nEntities < Entity.MAX_ID else 1
-        self.id = Entity.nEntities
+        return Entity.nEntities
 
     ## 
     #  @brief Returns a string representation of the entity, including its position, energy, time, and age.
@@ -117,16 +137,114 @@ class Entity(Element):
     #  @param coord A tuple (x, y) representing the coordinates of the new entity.
     #  @param energy Initial energy value of the new entity.
     #  @param time Initial time value of the new entity (default is 0).
+    #  @param id Identifier of the new entity, or None to draw a new one (default is None).
     #  @return The total number of entities after adding the new one.
+    #  @details When an *Engine* is set, the entity is added to its arrays instead.
     @classmethod
-    def new(cls, coord, energy, time=0):
-        entity = cls(coord, energy, time)
+    def new(cls, coord, energy, time=0, id=None):
+        if cls.engine is not None:
+            cls.engine.add(coord, energy, time, id)
+            return cls.len()
+        entity = cls(coord, energy, time, id)
         cls.list.append(entity)
         return cls.len()
 
+    ## 
+    #  @brief Buffers a newborn entity, added to the class pool by the next *commit*, without validation.
+    #  @param x The x-coordinate of the entity, on the map.
+    #  @param y The y-coordinate of the entity, on the map.
+    #  @details Used by the step loop, whose values are valid by construction.
+    #  The entity starts with ENERGY_DEF energy and a time of 0.
+    @classmethod
+    def _birth(cls, x, y):
+        entity = cls.__new__(cls)
+        entity._x, entity._y = x, y
+        entity._energy = cls.ENERGY_DEF
+        entity._time = entity._age = 0
+        entity.range = cls.RANGE_DEF
+        entity.id = cls._nextId()
+        cls.list.birth(entity)
+
+    ## 
+    #  @brief Buffers the death of an entity, removed from the class pool by the next *commit*.
+    #  @param entity The entity that did not survive the tick.
+    @classmethod
+    def kill(cls, entity):
+        cls.list.kill(entity)
+
+    ## 
+    #  @brief Applies the deaths and births of the tick to the class pool.
+    #  @details Called at the end of each step of the object engine.
+    @classmethod
+    def commit(cls):
+        cls.list.commit()
+
+    ## 
+    #  @brief Returns the living entity with an id, in O(1).
+    #  @param id The identifier of the entity.
+    #  @return The entity, or None if no living entity has this id.
+    #  @details With an *Engine*, the entity returned is a copy of its row.
+    #  Ids wrap around after MAX_ID: if several living entities share one, the last one is returned.
+    @classmethod
+    def get(cls, id):
+        if cls.engine is not None:
+            return cls.engine.get(id)
+        return cls.list.get(id)
+
+    ## 
+    #  @brief Removes the living entity with an id at once.
+    #  @param id The identifier of the entity.
+    #  @return True if the entity was removed, False if no living entity has this id.
+    #  @details Meant for a tick boundary, like *new*.
+    @classmethod
+    def remove(cls, id):
+        if cls.engine is not None:
+            return cls.engine.remove(id)
+        entity = cls.list.get(id)
+        if entity is None:
+            return False
+        cls.list.remove(entity)
+        return True
+
+    ## 
+    #  @brief Returns the number of entities.
+    #  @return The number of entities in the class list or in the engine.
+    @classmethod
+    def len(cls) -> int:
+        if cls.engine is not None:
+            return len(cls.engine)
+        return len(cls.list)
+
+    ## 
+    #  @brief Removes every entity.
+    @classmethod
+    def clear(cls):
+        if cls.engine is not None:
+            cls.engine.clear()
+        cls.list.clear()
+
+    ## 
+    #  @brief Returns the coordinates of every entity.
+    #  @return An iterable of tuples (x, y).
+    @classmethod
+    def coords(cls):
+        if cls.engine is not None:
+            return cls.engine.coords()
+        return ((entity._x, entity._y) for entity in cls.list)
+
+    ## 
+    #  @brief Returns the stored fields of every entity.
+    #  @return An iterable of tuples (id, x, y, energy, time).
+    @classmethod
+    def rows(cls):
+        if cls.engine is not None:
+            return cls.engine.rows()
+        return ((entity.id, entity._x, entity._y, entity._energy, entity._time) for entity in cls.list)
+
     ## 
     #  @brief Class method to generate an entity at a random position.
     #  @details Uses the Map class to generate a random coordinate and creates a new entity with default energy.
+    #  Entities do not occupy their cell, so any cell of the map can be drawn.
     @classmethod
     def generate(cls):
         coord = Map.rmdCoord()
@@ -137,20 +255,20 @@ class Entity(Element):
     #  @details This method checks if the entity's energy is less than the maximum energy.
     #  If food is found at the same location, the entity consumes it, increasing its energy.
     def eat(self):
-        if self.energy < self.ENERGY_MAX:
+        if self._energy < self.ENERGY_MAX:
             # Find food at the current coordinates
-            food_at_location = next((food for food in Food.list if food.x == self.x and food.y == self.y), None)
+            food_at_location = Food.grid.at(self._x, self._y)
             if food_at_location:
                 # Eat the food and remove it from the list
-                self.energy = min(self.ENERGY_MAX, self.energy + food_at_location.pts)
-                Food.list.remove(food_at_location)
+                self._energy = min(self.ENERGY_MAX, self._energy + food_at_location._pts)
+                Food.delete(food_at_location)
 
     ## 
     #  @brief Determines possible moves based on the entity's position and the map size.
     #  @return A list of valid neighboring coordinates.
     def possibleMoves(self):
         size_x, size_y = Map.size
-        x, y = self.x, self.y
+        x, y = self._x, self._y
         return [
             (dx, dy)
             for dx in (-1, 0, 1)
@@ -164,8 +282,8 @@ class Entity(Element):
     #  @return A tuple of (dx, dy) representing the movement direction.
     def rdmMove(self) -> tuple:
         dx, dy = choices(self.possibleMoves())[0]
-        self.x += dx
-        self.y += dy
+        self._x += dx
+        self._y += dy
         return (dx, dy)
 
     ## 
@@ -173,16 +291,34 @@ class Entity(Element):
     #  @details The entity will first try to eat if food is available, then move towards food if it is nearby. 
     #  If no food is found, it makes a random move.
     def move(self):
-        # Decrease energy, ensuring it does not go below 0
-        self.energy = max(0, self.energy - 1)
-
-        self.time += 1
+        self.decay()
 
         # Try to eat food first
         self.eat()
 
         self.reproduction()
 
+        self.walk()
+
+    ## 
+    #  @brief Spends one unit of energy and ages the entity by one unit of time.
+    def decay(self):
+        # Decrease energy, ensuring it does not go below 0
+        self._energy = max(0, self._energy - 1)
+
+        # Same as the time setter: out of range, the entity is exhausted
+        time = self._time + 1
+        if time < Entity.TIME_MAX:
+            self._time = time
+            self._age = time // Entity.TIME_IN_AGE
+        else:
+            self._time = -1
+            self._energy = 0
+            self._age = 0
+
+    ## 
+    #  @brief Moves the entity one step towards the closest food, or randomly if none is in range.
+    def walk(self):
         # Attempt to move towards food
         move = self.moveTowardsFood()
         if move is None:
@@ -190,58 +326,33 @@ class Entity(Element):
             self.rdmMove()
     
     ## 
-    #  @brief Finds and moves towards the closest food within the entity's viewing range.
-    #  @details Searches the `Food.list` for the closest food that is within `self.range` of the entity.
+    #  @brief Moves towards the closest food within the entity's viewing range.
+    #  @details The step is read from the direction field of `Map.occupancy` (see *Field*), kept up
+    #  to date as food is added and eaten: the cost does not depend on the number of foods.
+    #  Among foods at the same distance, the one of the lowest cell index is chosen.
     #  If no food is found, the entity does not move.
     #  @return A tuple of (dx, dy) representing the movement direction, or None if no food is found.
     def moveTowardsFood(self):
-        closest_food = None
-        min_distance = float('inf')
-
-        # Search through the food list.
-        for food in Food.list:
-            dist = self.distance(food)  # Ensure this distance function is valid
-
-            # Check if the food is within the entity's range.
-            if dist <= self.range and dist < min_distance:
-                closest_food = food
-                min_distance = dist
-
-        # If food is found within range, move towards it.
-        if closest_food:
-            
-            # Accessing coord property (no need for parentheses)
-            x = closest_food.x  
-            y = closest_food.y 
-            
-            dx = x - self.x
-            dy = y - self.y
-
-            # Normalize the movement to move only one step per movement.
-            if dx != 0:
-                dx = int(dx / abs(dx))
-            if dy != 0:
-                dy = int(dy / abs(dy))
+        field = Map.occupancy.field(self.range)
+        code = field.steps[self._x * field.height + self._y]
+        if code < 0:
+            return None  # No food found within range.
 
-            # Update the entity's position.
-            self.x += dx
-            self.y += dy
-
-            return (dx, dy)  # Return the movement direction.
-        else:
-            # No food found within range.
-            return None
-    
+        # Move one step towards the food.
+        dx, dy = Field.STEPS[code]
+        self._x += dx
+        self._y += dy
+        return (dx, dy)  # Return the movement direction.
 
     def reproduction(self):
-        if self.age in Entity.AGE_REPROD and self.energy >= Entity.MIN_REPROD:
-            self.energy -= Entity.REPROD
-            Entity.new( (self.x, self.y), Entity.ENERGY_DEF )
+        if self._age in Entity.AGE_REPROD and self._energy >= Entity.MIN_REPROD:
+            self._energy = max(0, self._energy - Entity.REPROD)
+            Entity._birth(self._x, self._y)
 
     
 
     def survive(self) -> bool:
-        if self.energy <= 0 or self.age > Entity.TIME_MAX :
+        if self._energy <= 0 or self._age > Entity.TIME_MAX :
             return False
         return True
     
@@ -249,13 +360,15 @@ class Entity(Element):
 
             
 if __name__ == "__main__":
-    Map.size = Map.DEFAULT_SIZE
+    Map.init(Map.DEFAULT_SIZE)
     for _ in range(10):
         Entity.generate()
-        print(Entity.list[-1])
+    print(Entity.list)
     
-    Entity.list[0].move()
-    print(Entity.list[0])
+    entity = next(iter(Entity.list))
+    entity.move()
+    Entity.commit()
+    print(entity)
 
 
 
@@ -0,0 +1,198 @@
+##
+#  @file field.py
+#  @brief File containing the class *Field*, the steps towards the closest food of every cell.
+#  @date 2026-10-16
+#  @author Rabyte Studio
+
+from array import array
+from itertools import islice
+
+##
+#  @class Field
+#  @brief Direction field of a map: for every cell, the step towards the closest occupied cell
+#  within a radius.
+#
+#  Cell (x, y) is stored at index `x * height + y`, like in *Occupancy*. Distances are compared
+#  squared, and ties go to the occupied cell of lowest index. The field is kept up to date by the
+#  *Occupancy* it reads: occupying a cell only updates the disc of cells around it, and releasing
+#  one only searches again the cells that pointed to it, among the occupied cells close enough
+#  to be their new closest one. Reading the step of a cell is a single lookup in `steps`.
+class Field:
+
+    STEPS = tuple((code // 3 - 1, code % 3 - 1) for code in range(9))  ##< Step (dx, dy) of each code of `steps`.
+
+    ##
+    #  @brief Builds the field of the occupied cells of an occupancy.
+    #  @param occupancy The *Occupancy* whose cells are tracked.
+    #  @param radius The distance above which an occupied cell is out of reach.
+    def __init__(self, occupancy, radius):
+        self.occupancy = occupancy
+        self.width, self.height = occupancy.width, occupancy.height
+        self.radius = radius
+        n = self.width * self.height
+        self._none = radius * radius + 1  ##< Squared distance of the cells out of reach.
+        self.steps = array('b', [-1]) * n           ##< Code of the step towards the closest cell, -1 if none.
+        self._nearest = array('i', [-1]) * n        ##< Index of the closest occupied cell, -1 if none.
+        self._dist = array('i', [self._none]) * n   ##< Squared distance to the closest occupied cell.
+        self._extent = array('i', bytes(4 * n))     ##< Bound of the squared distance of the cells closest to an occupied cell.
+
+        # Offsets (ox, oy) of the disc, with their squared length and the code of the step back to its
+        # centre, closest first and, at the same distance, towards the lowest index first
+        self._offsets = sorted((ox * ox + oy * oy, ox, oy, (1 - (ox > 0) + (ox < 0)) * 3 + 1 - (oy > 0) + (oy < 0))
+                               for ox in range(-radius, radius + 1) for oy in range(-radius, radius + 1)
+                               if ox * ox + oy * oy <= radius * radius)
+        self._first = [len(self._offsets)] * (self._none + 1)  ##< Index of the first offset at each squared distance or more.
+        for i in range(len(self._offsets) - 1, -1, -1):
+            self._first[self._offsets[i][0]] = i
+        for d in range(self._none - 1, -1, -1):
+            self._first[d] = min(self._first[d], self._first[d + 1])
+
+        bitmap = occupancy.bitmap
+        if self._dense():
+            for x in range(self.width):
+                for y in range(self.height):
+                    self._search(x, y)
+            return
+        cell = bitmap.find(1)
+        while cell != -1:
+            self.add(cell)
+            cell = bitmap.find(1, cell + 1)
+
+    ##
+    #  @brief Represents the Field as a string.
+    #  @return A string with the size of the map and the radius.
+    def __repr__(self) -> str:
+        return f"<Field: size=({self.width}, {self.height}), radius={self.radius}>"
+
+    ##
+    #  @brief Returns the step towards the closest occupied cell.
+    #  @param x The x-coordinate of the cell.
+    #  @param y The y-coordinate of the cell.
+    #  @return A tuple (dx, dy), or None if no occupied cell is within the radius.
+    def step(self, x, y):
+        code = self.steps[x * self.height + y]
+        return Field.STEPS[code] if code >= 0 else None
+
+    ##
+    #  @brief Updates the field after a cell is occupied.
+    #  @param cell The index of the occupied cell.
+    #  @details The cells of the disc around it take it as their closest cell if it is closer.
+    def add(self, cell):
+        width, height = self.width, self.height
+        steps, nearest, dist = self.steps, self._nearest, self._dist
+        fx, fy = divmod(cell, height)
+        extent = 0
+        for d, ox, oy, code in self._offsets:
+            x, y = fx + ox, fy + oy
+            if 0 <= x < width and 0 <= y < height:
+                c = x * height + y
+                if d < dist[c] or (d == dist[c] and cell < nearest[c]):
+                    dist[c] = d
+                    nearest[c] = cell
+                    steps[c] = code
+                    extent = d
+        self._extent[cell] = extent
+
+    ##
+    #  @brief Updates the field after a cell is released.
+    #  @param cell The index of the released cell.
+    #  @details The cells that pointed to it, all within its extent, are searched again. When occupied
+    #  cells are dense, each one visits the offsets of its disc by increasing distance and soon finds
+    #  one. Otherwise they are compared to the few occupied cells within twice the radius of the
+    #  released one, the only ones that can be within the radius of them.
+    def remove(self, cell):
+        width, height = self.width, self.height
+        nearest = self._nearest
+        fx, fy = divmod(cell, height)
+        extent = self._extent[cell]
+        cells = []
+        for d, ox, oy, code in self._offsets:
+            if d > extent:
+                break
+            x, y = fx + ox, fy + oy
+            if 0 <= x < width and 0 <= y < height and nearest[x * height + y] == cell:
+                cells.append((x, y))
+        if not cells:
+            return
+
+        bitmap = self.occupancy.bitmap
+        if self._dense():
+            dist = self._dist
+            for x, y in cells:
+                self._search(x, y, dist[x * height + y])
+            return
+
+        # Occupied cells of the square of twice the radius, by increasing index
+        reach = 2 * self.radius
+        y0, y1 = max(0, fy - reach), min(height, fy + reach + 1)
+        candidates = []
+        for x in range(max(0, fx - reach), min(width, fx + reach + 1)):
+            start = x * height
+            c = bitmap.find(1, start + y0, start + y1)
+            while c != -1:
+                candidates.append((x, c - start))
+                c = bitmap.find(1, c + 1, start + y1)
+
+        if not candidates:
+            for x, y in cells:
+                self._set(x, y, self._none, None)
+            return
+        for x, y in cells:
+            best, closest = self._none, None
+            for gx, gy in candidates:
+                d = (gx - x) ** 2 + (gy - y) ** 2
+                if d < best:
+                    best, closest = d, (gx, gy)
+            self._set(x, y, best, closest)
+
+    ##
+    #  @brief Tells whether the occupied cells are dense enough to be found by *_search*.
+    #  @return True if there is more than one occupied cell per row of the square of twice the radius.
+    def _dense(self):
+        n = len(self.occupancy.bitmap)
+        return (n - self.occupancy.nFree) * (4 * self.radius + 1) > n
+
+    ##
+    #  @brief Searches the closest occupied cell of a cell, by increasing distance.
+    #  @param x The x-coordinate of the cell.
+    #  @param y The y-coordinate of the cell.
+    #  @param start The squared distance below which no cell is occupied (default is 0).
+    def _search(self, x, y, start=0):
+        width, height = self.width, self.height
+        bitmap = self.occupancy.bitmap
+        for d, ox, oy, code in islice(self._offsets, self._first[start], None):
+            gx, gy = x + ox, y + oy
+            if 0 <= gx < width and 0 <= gy < height and bitmap[gx * height + gy]:
+                self._set(x, y, d, (gx, gy))
+                return
+        self._set(x, y, self._none, None)
+
+    ##
+    #  @brief Sets the closest occupied cell of a cell.
+    #  @param x The x-coordinate of the cell.
+    #  @param y The y-coordinate of the cell.
+    #  @param d The squared distance between them.
+    #  @param closest A tuple (x, y) of the occupied cell, or None if none is within the radius.
+    def _set(self, x, y, d, closest):
+        c = x * self.height + y
+        self._dist[c] = d
+        if closest is None:
+            self._nearest[c] = -1
+            self.steps[c] = -1
+        else:
+            gx, gy = closest
+            g = gx * self.height + gy
+            self._nearest[c] = g
+            if d > self._extent[g]:
+                self._extent[g] = d
+            self.steps[c] = ((gx > x) - (gx < x) + 1) * 3 + (gy > y) - (gy < y) + 1
+
+if __name__ == "__main__":
+    from map import Occupancy
+    occupancy = Occupancy((20, 10))
+    field = occupancy.field(3)
+    occupancy.occupy(5, 5)
+    occupancy.occupy(8, 5)
+    print(field, field.step(6, 5), field.step(7, 5))
+    occupancy.release(8, 5)
+    print(field.step(7, 5), field.step(12, 5))
@@ -7,6 +7,10 @@
 
 from element import Element
 from map import Map
+from grid import Grid
+from pool import Pool
+from math import exp, sqrt
+from random import random, gauss
 
 ##
 #  @class Food
@@ -14,19 +18,28 @@ from map import Map
 #  
 #  This class inherits from Element and represents food items placed on the map. Each food object has a
 #  position and a point value (`pts`), which is the energy it provides when consumed.
+#  The point value is stored in the slot `_pts`; like the coordinates (see *Element*), it is
+#  validated by its property and read directly by the step loop.
+#  The food items are stored in a *Pool*, so eating one removes it in O(1).
 #
 class Food(Element):
+    __slots__ = ('_pts', '_slot')
 
     NBYTES_PTS = 2  ##< Number of bytes allocated for food points.
     
     PTS_MAX = 2**(NBYTES_PTS*8)  ##< Maximum point value a food item can have.
     PTS_DEFAULT = 100  ##< Default point value for new food items.
 
-    list = []  ##< Class-level list to store all food items.
+    list = Pool()  ##< Class-level pool storing all food items.
+    grid = Grid()  ##< Spatial index of the food items, keyed by cell.
 
     MAXFOODS_DEF = 50
     maxFoods = MAXFOODS_DEF
 
+    RATE_DEF = 1.0  ##< Default number of foods regrown per tick, on average.
+    rate = RATE_DEF  ##< Number of foods regrown per tick, on average (see *regrow*).
+    cellRate = 0.0  ##< Number of foods regrown per free cell and per tick, on average (see *regrow*).
+
     ##
     #  @brief Initializes a new food object with coordinates and point value.
     #  @param coord A tuple (x, y) representing the coordinates of the food item on the map.
@@ -66,29 +79,97 @@ class Food(Element):
     ##
     #  @brief Creates a new food object and adds it to the list.
     #  @param coord A tuple (x, y) representing the coordinates of the food.
-    #  @param pts The point value of the food.
+    #  @param pts The point value of the food (default is PTS_DEFAULT).
     #  @return The number of food items in the list after addition.
+    #  @throws ValueError if the cell already holds a food item.
     @classmethod
-    def new(cls, coord, pts):
+    def new(cls, coord, pts=PTS_DEFAULT):
         # Create an instance of Food
         food = cls(coord, pts)
+        cls.grid.add(food)
+        Map.occupancy.occupy(food.x, food.y)
         cls.list.append(food)
         return cls.len()
+
+    ##
+    #  @brief Removes a food object from the list and from the spatial index.
+    #  @param food The food item to remove.
+    #  @return The number of food items in the list after removal.
+    @classmethod
+    def delete(cls, food):
+        cls.grid.remove(food)
+        Map.occupancy.release(food.x, food.y)
+        cls.list.remove(food)
+        return cls.len()
+
+    ##
+    #  @brief Removes every food object.
+    @classmethod
+    def clear(cls):
+        cls.grid.clear()
+        Map.occupancy.clear()
+        cls.list.clear()
     
     ##
-    #  @brief Generates a new food object at a random map coordinate.
-    #  If a valid coordinate is found, a new food item is created and added to the list.
+    #  @brief Generates a new food object at a random free map coordinate.
+    #  If a free cell is left in `Map.occupancy`, a new food item is created and added to the list.
     @classmethod
     def generate(cls):
         if cls.len() < cls.maxFoods:
-            coord = Map.rmdCoord(cls.list)
+            coord = Map.rmdCoord(Map.occupancy)
             if coord:
                 cls.new(coord, cls.PTS_DEFAULT)
 
+    ##
+    #  @brief Regrows the food of a tick.
+    #  @return The number of food items created.
+    #  @details The number of new foods is drawn from a Poisson distribution of mean
+    #  `rate + cellRate * free cells`, then placed at once by *spawn*.
+    @classmethod
+    def regrow(cls):
+        return cls.spawn(_poisson(cls.rate + cls.cellRate * Map.occupancy.nFree))
+
+    ##
+    #  @brief Creates a batch of food objects on distinct random free cells.
+    #  @param count The number of food items to create, capped so that there are at most `maxFoods`.
+    #  @return The number of food items created.
+    #  @details The cells are drawn in one sample of the free cells of `Map.occupancy`; the food
+    #  items are then created without validation, with PTS_DEFAULT points.
+    @classmethod
+    def spawn(cls, count):
+        count = max(0, min(count, cls.maxFoods - cls.len()))
+        cells = Map.occupancy.samples(count)
+        for x, y in cells:
+            food = cls.__new__(cls)
+            food._x, food._y, food._pts = x, y, cls.PTS_DEFAULT
+            cls.grid.add(food)
+            Map.occupancy.occupy(x, y)
+            cls.list.append(food)
+        return len(cells)
+
+
+##
+#  @brief Draws a number from a Poisson distribution.
+#  @param mean The mean of the distribution.
+#  @return A non-negative integer.
+#  @details Exact (Knuth's method) for a mean below 30, normal approximation above.
+def _poisson(mean):
+    if mean <= 0:
+        return 0
+    if mean >= 30:
+        return max(0, round(gauss(mean, sqrt(mean))))
+    limit = exp(-mean)
+    count = 0
+    product = random()
+    while product > limit:
+        count += 1
+        product *= random()
+    return count
+
 
 if __name__ == "__main__":
-    Map.size = (5, 5)
+    Map.init((5, 5))
     
-    while True:
+    while Map.occupancy.nFree:
         Food.generate()
         print(Food.list)
\ No newline at end of file
@@ -0,0 +1,127 @@
+##
+#  @file grid.py
+#  @brief File containing the class *Grid*
+#  @date 2026-10-16
+#  @author Rabyte Studio
+
+##
+#  @class Grid
+#  @brief Uniform-grid spatial index of elements, bucketed by tile and keyed by cell.
+#
+#  The map is cut into square tiles of `tile` cells. Each tile holds a dictionary
+#  mapping a cell `(x, y)` to the element standing on it, so a cell lookup costs two
+#  hash lookups and a neighbourhood search only visits the tiles overlapping it.
+#  At most one element can be indexed per cell.
+class Grid:
+    TILE_SIZE = 8  ##< Default width and height of a tile, in cells.
+
+    ##
+    #  @brief Initializes an empty grid.
+    #  @param tile Width and height of a tile, in cells (default is TILE_SIZE).
+    def __init__(self, tile=TILE_SIZE):
+        self.tile = tile
+        self._tiles = {}  ##< Tile (tx, ty) -> {(x, y): element}
+        self._len = 0
+
+    ##
+    #  @brief Represents the Grid as a string.
+    #  @return A string with the tile size and the number of indexed elements.
+    def __repr__(self) -> str:
+        return f"<Grid: tile={self.tile}, tiles={len(self._tiles)}, len={self._len}>"
+
+    ##
+    #  @brief Returns the number of indexed elements.
+    #  @return The number of elements in the grid.
+    def __len__(self):
+        return self._len
+
+    ##
+    #  @brief Adds an element to the grid at its current coordinates.
+    #  @param elem The element to index.
+    #  @throws ValueError if the cell already holds an element.
+    def add(self, elem):
+        x, y = elem.x, elem.y
+        bucket = self._tiles.setdefault((x // self.tile, y // self.tile), {})
+        if (x, y) in bucket:
+            raise ValueError(f"cell ({x}, {y}) is already occupied!")
+        bucket[(x, y)] = elem
+        self._len += 1
+
+    ##
+    #  @brief Removes an element from the grid.
+    #  @param elem The element to remove, indexed at its current coordinates.
+    #  @return True if the element was indexed, False otherwise.
+    def remove(self, elem) -> bool:
+        x, y = elem.x, elem.y
+        key = (x // self.tile, y // self.tile)
+        bucket = self._tiles.get(key)
+        if bucket is None or bucket.get((x, y)) is not elem:
+            return False
+        del bucket[(x, y)]
+        if not bucket:
+            del self._tiles[key]
+        self._len -= 1
+        return True
+
+    ##
+    #  @brief Returns the element standing on a cell.
+    #  @param x The x-coordinate of the cell.
+    #  @param y The y-coordinate of the cell.
+    #  @return The element on the cell, or None if the cell is empty.
+    def at(self, x, y):
+        bucket = self._tiles.get((x // self.tile, y // self.tile))
+        if bucket is None:
+            return None
+        return bucket.get((x, y))
+
+    ##
+    #  @brief Yields the elements of every tile overlapping a square around a cell.
+    #  @param x The x-coordinate of the centre.
+    #  @param y The y-coordinate of the centre.
+    #  @param radius Half-width of the square, in cells.
+    #  @details Elements of the overlapping tiles that lie outside the square are also
+    #  yielded: callers are expected to filter them with their own distance test.
+    def near(self, x, y, radius):
+        tiles = self._tiles
+        tile = self.tile
+        for tx in range((x - radius) // tile, (x + radius) // tile + 1):
+            for ty in range((y - radius) // tile, (y + radius) // tile + 1):
+                bucket = tiles.get((tx, ty))
+                if bucket:
+                    yield from bucket.values()
+
+    ##
+    #  @brief Yields the occupied cells of a rectangle.
+    #  @param x0 The x-coordinate of the first column.
+    #  @param y0 The y-coordinate of the first row.
+    #  @param x1 The x-coordinate after the last column.
+    #  @param y1 The y-coordinate after the last row.
+    #  @details Only the tiles overlapping the rectangle are visited.
+    def cells(self, x0, y0, x1, y1):
+        tiles = self._tiles
+        tile = self.tile
+        for tx in range(x0 // tile, (x1 - 1) // tile + 1):
+            for ty in range(y0 // tile, (y1 - 1) // tile + 1):
+                bucket = tiles.get((tx, ty))
+                if bucket:
+                    inside = tx * tile >= x0 and (tx + 1) * tile <= x1 and ty * tile >= y0 and (ty + 1) * tile <= y1
+                    for x, y in bucket:
+                        if inside or (x0 <= x < x1 and y0 <= y < y1):
+                            yield x, y
+
+    ##
+    #  @brief Removes every element from the grid.
+    def clear(self):
+        self._tiles.clear()
+        self._len = 0
+
+
+if __name__ == "__main__":
+    class _Point:
+        def __init__(self, x, y):
+            self.x, self.y = x, y
+
+    grid = Grid()
+    for coord in ((0, 0), (5, 9), (20, 20)):
+        grid.add(_Point(*coord))
+    print(grid, grid.at(5, 9), list(grid.near(4, 4, 4)))
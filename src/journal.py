@@ -0,0 +1,131 @@
+##
+#  @file journal.py
+#  @brief File containing the class *Journal*, the append-only log of a save between two checkpoints.
+#  @date 2026-10-16
+#  @author Rabyte Studio
+
+import os
+import struct
+
+##
+#  @class Journal
+#  @brief Append-only file of segments, each holding the changes of the world since the previous one.
+#
+#  A segment is a header followed by five sections of records, all made of big-endian 2-byte fields:
+#  food consumed (x, y), food spawned (pts, x, y), entity deaths (id), entity births and entity moves
+#  (id, x, y, energy, time). The journal does not encode the records itself: it only frames the
+#  sections (see *Save*). A segment cut by a crash is ignored when reading. Segments of the journals
+#  of version 2 saves, which carry no generation, are still read.
+class Journal:
+
+    MAGIC = b'RSJ3'     ##< First bytes of every segment.
+    MAGIC_V2 = b'RSJS'  ##< First bytes of a segment of the journal of a version 2 save.
+
+    ## Header of a segment: magic, generation of the checkpoint it follows, last loading, simulation time,
+    ## then the record count of each section.
+    SEGMENT = struct.Struct('>4sQQQIIIII')
+    ## Header of a segment of the journal of a version 2 save: the same fields without the generation.
+    SEGMENT_V2 = struct.Struct('>4sQQIIIII')
+
+    SECTIONS = ('consumed', 'spawned', 'deaths', 'births', 'moves')  ##< Sections of a segment, in file order.
+    FIELDS = (2, 3, 1, 5, 5)  ##< Number of 2-byte fields of a record of each section.
+
+    ##
+    #  @brief Initializes the journal of a save.
+    #  @param path The path of the journal file.
+    def __init__(self, path):
+        self.path = path
+
+    ##
+    #  @brief Represents the Journal as a string.
+    #  @return A string with the path and the size of the journal.
+    def __repr__(self) -> str:
+        return f"<Journal: path='{self.path}', size={self.size()}>"
+
+    ##
+    #  @brief Returns the size of the journal file.
+    #  @return The size in bytes, 0 if there is no journal.
+    def size(self) -> int:
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    ##
+    #  @brief Appends a segment to the journal.
+    #  @param generation The generation of the checkpoint the segment follows.
+    #  @param last The timestamp of the save.
+    #  @param sim_time The simulation time of the save.
+    #  @param sections A dictionary mapping SECTIONS to packed records.
+    def append(self, generation, last, sim_time, sections):
+        counts = [len(sections[name]) // (2 * fields) for name, fields in zip(Journal.SECTIONS, Journal.FIELDS)]
+        with open(self.path, 'ab') as file:
+            file.write(Journal.SEGMENT.pack(Journal.MAGIC, generation, last, sim_time, *counts))
+            for name in Journal.SECTIONS:
+                file.write(sections[name])
+            file.flush()
+            os.fsync(file.fileno())
+
+    ##
+    #  @brief Computes the changes between two states of the world.
+    #  @param base The previous state, a tuple (foods, entities) of dictionaries mapping (x, y) to pts
+    #  and id to (x, y, energy, time).
+    #  @param tables The current state, in the same form.
+    #  @return A dictionary mapping SECTIONS to generators of records.
+    @staticmethod
+    def changes(base, tables):
+        foods, entities = tables
+        base_foods, base_entities = base
+        return {
+            'consumed': (xy for xy, pts in base_foods.items() if foods.get(xy) != pts),
+            'spawned': ((pts, *xy) for xy, pts in foods.items() if base_foods.get(xy) != pts),
+            'deaths': ((id,) for id in base_entities if id not in entities),
+            'births': ((id, *row) for id, row in entities.items() if id not in base_entities),
+            'moves': ((id, *row) for id, row in entities.items() if id in base_entities and base_entities[id] != row),
+        }
+
+    ##
+    #  @brief Reads the segments of the journal, in order.
+    #  @return A generator of tuples (generation, last, sim_time, sections), sections mapping SECTIONS
+    #  to packed records; the generation is None for a segment of a version 2 save.
+    #  @throws ValueError if a segment does not start with MAGIC or MAGIC_V2.
+    #  @details Segments are read one at a time.
+    def segments(self):
+        try:
+            file = open(self.path, 'rb')
+        except FileNotFoundError:
+            return
+
+        with file:
+            while True:
+                offset = file.tell()
+                magic = file.read(len(Journal.MAGIC))
+                if magic not in (Journal.MAGIC, Journal.MAGIC_V2):
+                    if len(magic) < len(Journal.MAGIC):
+                        return  # End of the journal, or last segment cut by a crash
+                    raise ValueError(f"Invalid journal segment at byte {offset}.")
+                segment = Journal.SEGMENT if magic == Journal.MAGIC else Journal.SEGMENT_V2
+                header = magic + file.read(segment.size - len(magic))
+                if len(header) < segment.size:
+                    return  # Last segment cut by a crash
+                if magic == Journal.MAGIC:
+                    magic, generation, last, sim_time, *counts = segment.unpack(header)
+                else:
+                    magic, last, sim_time, *counts = segment.unpack(header)
+                    generation = None
+
+                sections = {}
+                for name, fields, count in zip(Journal.SECTIONS, Journal.FIELDS, counts):
+                    size = 2 * fields * count
+                    sections[name] = file.read(size)
+                    if len(sections[name]) < size:
+                        return  # Last segment cut by a crash
+                yield generation, last, sim_time, sections
+
+    ##
+    #  @brief Deletes the journal file.
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
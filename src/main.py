@@ -1,13 +1,19 @@
 import argparse
 from simulation import RSim
+from world import World
+from reader import Reader
 
 
 
 # Create a parser
 parser = argparse.ArgumentParser(description="RSim is a program developed by K.Pousse which allows you to launch a simulation with entities in a fixed world.")
 
-# Positional argument for 'new' or 'load'
-parser.add_argument('action', choices=['new', 'load'], help="Load mode: 'new' --> new save, 'load' --> load an existing save")
+# Positional argument for 'new', 'load', 'replay', 'inspect' or 'list'
+parser.add_argument('action', choices=['new', 'load', 'replay', 'inspect', 'list'], help="Load mode: 'new' --> new save, 'load' --> load an existing save, "
+                    "'replay' --> play the replay file given by --record, 'inspect' --> print the content of saves, 'list' --> print one line per save")
+
+# Positional arguments for the saves to inspect
+parser.add_argument('saves', type=int, nargs='*', help="Save numbers to inspect (default: the save given by -s)")
 
 # Option to enable verbose mode
 parser.add_argument('-v', '--verbose', action='store_true', help='Enable VERBOSE mode')
@@ -24,35 +30,136 @@ parser.add_argument('--nEntities', type=int, help='Number of entities at the sta
 # Option for the number of foods at the start of the simulation
 parser.add_argument('--nFoods', type=int, help='Number of foods at the start of the simulation', default=10)
 
-# Parse the arguments
-args = parser.parse_args()
-
-# Validate the values for entities and food
-if args.nEntities < 0:
-    print("Error: nEntities must be a non-negative integer.")
-    exit(1)
-
-if args.nFoods < 0:
-    print("Error: nFoods must be a non-negative integer.")
-    exit(1)
-
-# Initialize the simulation with the arguments
-verbose = args.verbose
-RSim.init(args.save, tuple(args.size))
-
-# Logic for generating or loading
-if args.action == 'new':
-    RSim.generate(args.nEntities, args.nFoods)
-    if args.verbose:
-        print(f"New simulation created with {args.nEntities} entities and {args.nFoods} food items.")
-
-elif args.action == 'load':
-    RSim.save.load()
-    if args.verbose:
-        print(f"Loaded simulation from save number {args.save}.")
-
-# Start the simulation
-RSim.run()
-
-if args.verbose:
-    print("Simulation is now running.")
+# Option for the engine stepping the entities
+parser.add_argument('--engine', choices=RSim.ENGINES, help="Simulation engine: 'object' --> one Entity object at a time, 'numpy' --> whole population as NumPy arrays", default='object')
+
+# Option to run without window, as fast as possible
+parser.add_argument('--headless', action='store_true', help='Run without window nor pygame, then save and print a summary')
+
+# Option for the number of ticks of a headless run
+parser.add_argument('--ticks', type=int, help='Number of simulation steps of a headless run', default=1000)
+
+# Option to time the phases of the ticks
+parser.add_argument('--profile', action='store_true', help="Time the phases of the ticks and print their percentiles at the end")
+
+# Option to record the ticks to a replay file, or to choose the file to replay
+parser.add_argument('-r', '--record', metavar='FILE', help="Replay file: written tick by tick with 'new'/'load', played with 'replay'", default=None)
+
+# Option for the interval between two keyframes of the replay file
+parser.add_argument('--keyframe', type=int, help='Number of ticks between two keyframes of the replay file', default=None)
+
+# Option for the speed multiplier
+parser.add_argument('--speed', help="Speed multiplier of the simulation or the replay: 1, 10, ... or 'max' (default: from the config)", default=None)
+
+# Option to write a trace of the ticks
+parser.add_argument('--trace', metavar='FILE', help="Write a Chrome/Perfetto trace of the tick spans to FILE at the end", default=None)
+
+##
+#  @brief Prints the content of save files, reading them record by record.
+#  @param action 'inspect' for a full report of each save, 'list' for one line per save.
+#  @param saves A list of save numbers, or None for every save.
+def inspect(action, saves=None):
+    slots = Reader.slots()
+    if saves is not None:
+        found = dict(slots)
+        slots = [(number, found.get(number)) for number in saves]
+    if not slots:
+        print("No save found.")
+
+    for number, path in slots:
+        if path is None:
+            print(f"save_{number}: no such save.")
+            continue
+        try:
+            reader = Reader(path)
+            print(reader.report() if action == 'inspect' else reader.summary())
+        except (IOError, ValueError) as e:
+            print(f"{path.name}: {e}")
+
+
+##
+#  @brief Entry point of RSim: parses the arguments and runs the simulation.
+#  @param argv The list of arguments, or None to use the command line.
+def main(argv=None):
+    # Parse the arguments
+    args = parser.parse_args(argv)
+
+    # Validate the values for entities and food
+    if args.nEntities < 0:
+        print("Error: nEntities must be a non-negative integer.")
+        exit(1)
+
+    if args.nFoods < 0:
+        print("Error: nFoods must be a non-negative integer.")
+        exit(1)
+
+    if args.ticks < 0:
+        print("Error: ticks must be a non-negative integer.")
+        exit(1)
+
+    # Read the saves without starting a simulation
+    if args.action in ('inspect', 'list'):
+        inspect(args.action, args.saves or ([args.save] if args.action == 'inspect' else None))
+        return
+
+    if args.action == 'replay' and (args.record is None or args.headless):
+        print("Error: replay needs a replay file (--record FILE) and a window.")
+        exit(1)
+
+    if args.keyframe is not None and args.keyframe <= 0:
+        print("Error: keyframe must be a positive integer.")
+        exit(1)
+
+    # Initialize the simulation with the arguments
+    world = World(args.save, tuple(args.size), 'object' if args.action == 'replay' else args.engine, headless=args.headless)
+    if args.speed is not None:
+        world.setSpeed(args.speed)
+
+    # Logic for generating or loading
+    if args.action == 'new':
+        world.generate(args.nEntities, args.nFoods)
+        if args.verbose:
+            print(f"New simulation created with {args.nEntities} entities and {args.nFoods} food items.")
+
+    elif args.action == 'load':
+        world.load()
+        if args.verbose:
+            print(f"Loaded simulation from save number {args.save}.")
+
+    elif args.action == 'replay':
+        world.play(args.record)
+        if args.verbose:
+            print(f"Playing {args.record}.")
+
+    # Start recording
+    if args.record and args.action != 'replay':
+        world.record(args.record, args.keyframe)
+
+    # Start the profiler
+    profiler = None
+    if args.profile or args.trace:
+        profiler = world.profile(trace=args.trace is not None)
+
+    # Start the simulation
+    if args.headless:
+        print(world.formatSummary(world.run(args.ticks, save=True)))
+    else:
+        if args.verbose:
+            print("Simulation is now running.")
+        world.show()
+
+    # Close the replay file
+    if args.action == 'replay':
+        world.play(None)
+    elif args.record:
+        world.record(None)
+
+    if profiler is not None:
+        print(profiler.report())
+        if args.trace:
+            profiler.dump(args.trace)
+            print(f"Trace of {len(profiler.trace)} events written to {args.trace}")
+
+
+if __name__ == "__main__":
+    main()
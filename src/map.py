@@ -1,11 +1,136 @@
-from random import randint
+from random import randint, randrange, sample
+from array import array
+from field import Field
 
 ##
 #  @file map.py
-#  @brief File containing the class *Map*
+#  @brief File containing the classes *Occupancy* and *Map*
 #  @date 2024-10-03
 #  @author Rabyte Studio
 
+##
+#  @class Occupancy
+#  @brief Occupancy bitmap of the cells of a map, with an indexable set of the free cells.
+#
+#  Cell (x, y) is stored at index `x * height + y`. The free cells are kept at the front of
+#  a permutation of every cell index, so occupying, releasing and sampling a free cell are O(1).
+#  The number of occupied cells of each square tile of TILE cells is kept along, for the
+#  zoomed-out views of the map, and so is the direction *Field* to the closest occupied cell
+#  once it has been asked for (see *field*).
+class Occupancy:
+
+    TILE = 4  ##< Width and height of the tiles counted in `counts`, in cells.
+
+    ##
+    #  @brief Initializes an occupancy where every cell is free.
+    #  @param size A tuple (width, height) representing the size of the map.
+    def __init__(self, size):
+        self.width, self.height = size
+        self.tiles = (-(-self.width // Occupancy.TILE), -(-self.height // Occupancy.TILE))  ##< Number of tiles along x and y.
+        self.bitmap = bytearray(self.width * self.height)  ##< 1 if the cell is occupied, 0 otherwise.
+        self.clear()
+
+    ##
+    #  @brief Represents the Occupancy as a string.
+    #  @return A string with the size of the map and the number of occupied cells.
+    def __repr__(self) -> str:
+        return f"<Occupancy: size=({self.width}, {self.height}), occupied={len(self)}>"
+
+    ##
+    #  @brief Returns the number of occupied cells.
+    #  @return The number of occupied cells.
+    def __len__(self):
+        return len(self.bitmap) - self.nFree
+
+    ##
+    #  @brief Frees every cell.
+    def clear(self):
+        n = len(self.bitmap)
+        self.bitmap[:] = bytes(n)
+        self._free = array('i', range(n))   ##< Permutation of the cells, free ones first.
+        self._index = array('i', range(n))  ##< Position of each cell in `_free`.
+        self.nFree = n                      ##< Number of free cells.
+        self.counts = array('i', bytes(4 * self.tiles[0] * self.tiles[1]))  ##< Occupied cells of tile (tx, ty), at index `tx * tiles[1] + ty`.
+        self._field = None                  ##< Direction field kept up to date, built by *field*.
+
+    ##
+    #  @brief Returns the direction field to the closest occupied cell within a radius.
+    #  @param radius The distance above which an occupied cell is out of reach.
+    #  @return The *Field*, built on the first call for the radius, then updated on each change.
+    def field(self, radius):
+        if self._field is None or self._field.radius != radius:
+            self._field = Field(self, radius)
+        return self._field
+
+    ##
+    #  @brief Tells whether a cell is free.
+    #  @param x The x-coordinate of the cell.
+    #  @param y The y-coordinate of the cell.
+    #  @return True if the cell is free, False otherwise.
+    def isFree(self, x, y) -> bool:
+        return not self.bitmap[x * self.height + y]
+
+    ##
+    #  @brief Marks a cell as occupied.
+    #  @param x The x-coordinate of the cell.
+    #  @param y The y-coordinate of the cell.
+    #  @details Does nothing if the cell is already occupied.
+    def occupy(self, x, y):
+        cell = x * self.height + y
+        if self.bitmap[cell]:
+            return
+        self.bitmap[cell] = 1
+        self.nFree -= 1
+        self._swap(cell, self._free[self.nFree])
+        self.counts[(x // Occupancy.TILE) * self.tiles[1] + y // Occupancy.TILE] += 1
+        if self._field is not None:
+            self._field.add(cell)
+
+    ##
+    #  @brief Marks a cell as free.
+    #  @param x The x-coordinate of the cell.
+    #  @param y The y-coordinate of the cell.
+    #  @details Does nothing if the cell is already free.
+    def release(self, x, y):
+        cell = x * self.height + y
+        if not self.bitmap[cell]:
+            return
+        self.bitmap[cell] = 0
+        self._swap(cell, self._free[self.nFree])
+        self.nFree += 1
+        self.counts[(x // Occupancy.TILE) * self.tiles[1] + y // Occupancy.TILE] -= 1
+        if self._field is not None:
+            self._field.remove(cell)
+
+    ##
+    #  @brief Picks a uniformly random free cell.
+    #  @return A tuple (x, y) of a free cell, or None if every cell is occupied.
+    def sample(self):
+        if self.nFree == 0:
+            return None
+        cell = self._free[randrange(self.nFree)]
+        return divmod(cell, self.height)
+
+    ##
+    #  @brief Picks distinct uniformly random free cells.
+    #  @param count The number of cells to pick, at most the number of free cells.
+    #  @return A list of tuples (x, y) of free cells.
+    #  @details The cells are drawn at once among the front of the permutation; they stay free.
+    def samples(self, count):
+        count = min(count, self.nFree)
+        free, height = self._free, self.height
+        return [divmod(free[i], height) for i in sample(range(self.nFree), count)]
+
+    ##
+    #  @brief Exchanges the positions of two cells in the permutation.
+    #  @param a The index of the first cell.
+    #  @param b The index of the second cell.
+    def _swap(self, a, b):
+        i, j = self._index[a], self._index[b]
+        self._free[i], self._free[j] = b, a
+        self._index[a], self._index[b] = j, i
+
+
 ##
 #  @class Map
 #  @brief Class representing a map of simulation
@@ -14,6 +139,8 @@ class Map:
     DEFAULT_SIZE = (200, 150)  ##< Default size of the map.
     _size = DEFAULT_SIZE  ##< Internal storage for the size.
 
+    occupancy = None  ##< Occupancy of the cells holding food, set by *init*.
+
     ##
     #  @brief Property getter for the size of the map.
     #  @return A tuple representing the current size of the map.
@@ -31,6 +158,17 @@ class Map:
     @size.setter
     def size(self, value):
         """Setter for the size with validation."""
+        self._check(value)
+        self._size = value
+
+    ##
+    #  @brief Validates a map size.
+    #  @param value A tuple of two integers representing the size.
+    #  @throws ValueError if the size is not a tuple of two integers.
+    #  @throws TypeError if either dimension is not an integer.
+    #  @throws ValueError if any dimension is out of bounds.
+    @classmethod
+    def _check(cls, value):
         # Check that the size is a tuple of two integers
         if not isinstance(value, tuple) or len(value) != 2:
             raise ValueError("Size must be a tuple of two integers.")
@@ -39,25 +177,28 @@ class Map:
             raise TypeError("Both dimensions of size must be integers.")
         
         # Check that each dimension is within the specified limits
-        if not value[0] in range(self.MAX_SIZE) or not value[1] in range(self.MAX_SIZE):
-            raise ValueError(f"Size dimensions must be between 0 and {self.MAX_SIZE} inclusive.")
-        
-        self._size = value
-    
-    @classmethod
-    def rmdCoord(cls, datas=[]):
+        if not value[0] in range(cls.MAX_SIZE) or not value[1] in range(cls.MAX_SIZE):
+            raise ValueError(f"Size dimensions must be between 0 and {cls.MAX_SIZE} inclusive.")
 
-        if (Map.size[0] * Map.size[1]) > len(datas):
+    ##
+    #  @brief Sets the size of the map and resets its occupancy.
+    #  @param size A tuple of two integers representing the new size (default is DEFAULT_SIZE).
+    #  @throws ValueError, TypeError if the size is invalid (see *size*).
+    @classmethod
+    def init(cls, size=DEFAULT_SIZE):
+        cls._check(size)
+        cls.size = size
+        cls.occupancy = Occupancy(size)
 
-            while True:
-                x = randint(0, Map.size[0] - 1)  # Adjust range to avoid index out of bounds
-                y = randint(0, Map.size[1] - 1)
-                coord = (x, y)
-                
-                # Vérifie si les coordonnées générées sont déjà présentes dans les objets de `datas`
-                if not any(getattr(obj, 'x', None) == x and getattr(obj, 'y', None) == y for obj in datas):
-                    return coord
-        return None
+    ##
+    #  @brief Picks a random cell of the map.
+    #  @param occupancy An *Occupancy* to pick a free cell from, or None to pick any cell.
+    #  @return A tuple (x, y), or None if every cell of `occupancy` is occupied.
+    @classmethod
+    def rmdCoord(cls, occupancy=None):
+        if occupancy is not None:
+            return occupancy.sample()
+        return randint(0, Map.size[0] - 1), randint(0, Map.size[1] - 1)
 
 
     
@@ -65,5 +206,6 @@ class Map:
 
 
 if __name__ == "__main__":
-    Map.size = Map.DEFAULT_SIZE
-    
\ No newline at end of file
+    Map.init(Map.DEFAULT_SIZE)
+    Map.occupancy.occupy(3, 4)
+    print(Map.occupancy, Map.rmdCoord(Map.occupancy))
@@ -0,0 +1,107 @@
+##
+#  @file pixels.py
+#  @brief File containing the classes *Pixels* and *Density*, NumPy renderers of the map.
+#  @date 2026-10-16
+#  @author Rabyte Studio
+
+import numpy as np
+import pygame
+from map import Occupancy
+
+##
+#  @brief Returns the coordinates of the entities of a snapshot as arrays.
+#  @param snapshot The *Snapshot* to read.
+#  @return A tuple (x, y) of NumPy arrays.
+def _coords(snapshot):
+    return np.asarray(snapshot.x), np.asarray(snapshot.y)
+
+##
+#  @class Pixels
+#  @brief Renderer writing the colours of the cells into a map-sized pixel buffer.
+#  @details The food cells are read at once from the occupancy bitmap of a *Snapshot*, the
+#  entity cells from its coordinate arrays. The buffer is copied to a map-sized surface
+#  with `pygame.surfarray`, then only its visible part is scaled by the cell size and blitted.
+#  The cost of a frame depends on the map and window sizes, not on the number of elements.
+class Pixels:
+
+    ##
+    #  @brief Initializes the renderer.
+    #  @param background Colour of the empty cells.
+    #  @param foods Colour of the food cells.
+    #  @param entities Colour of the entity cells.
+    def __init__(self, background, foods, entities):
+        self.colors = (background, foods, entities)
+        self.surface = None  ##< Map-sized surface, one pixel per cell.
+        self.buffer = None   ##< Pixel values of the cells, indexed [x, y].
+
+    ##
+    #  @brief Draws the cells visible through a camera.
+    #  @param screen The surface to draw on.
+    #  @param snapshot The *Snapshot* to draw.
+    #  @param view A tuple (x0, y0, x1, y1) of the visible cells (see *Visual._view*).
+    #  @param cell_size The size of a cell, in pixels.
+    #  @param camera A tuple (x, y), the position of the camera in pixels.
+    def draw(self, screen, snapshot, view, cell_size, camera):
+        width, height = snapshot.size
+        if self.surface is None or self.surface.get_size() != (width, height):
+            self.surface = pygame.Surface((width, height))
+            self.buffer = np.empty((width, height), dtype=np.uint32)
+            self._values = [self.surface.map_rgb(color) for color in self.colors]
+        background, foods, entities = self._values
+
+        occupied = np.frombuffer(snapshot.bitmap, dtype=np.uint8).reshape(width, height)
+        np.copyto(self.buffer, background)
+        np.copyto(self.buffer, foods, where=occupied.view(np.bool_))
+        x, y = _coords(snapshot)
+        self.buffer[x, y] = entities
+        pygame.surfarray.blit_array(self.surface, self.buffer)
+
+        x0, y0, x1, y1 = view
+        if x1 <= x0 or y1 <= y0:
+            return
+        visible = self.surface.subsurface((x0, y0, x1 - x0, y1 - y0))
+        scaled = pygame.transform.scale(visible, ((x1 - x0) * cell_size, (y1 - y0) * cell_size))
+        screen.blit(scaled, (x0 * cell_size - camera[0], y0 * cell_size - camera[1]))
+
+
+##
+#  @class Density
+#  @brief Downsampled grids of the map: the number of foods and entities in each tile of
+#  `Occupancy.TILE` cells, and the heat map image drawn from them.
+#
+#  The food counts are kept up to date by `Map.occupancy` as food is added and removed, and
+#  copied by the *Snapshot*; the entity counts are binned from its coordinate arrays. *update*
+#  is meant to be called once per snapshot, the image being reused by every frame in between.
+class Density:
+
+    SATURATION = 8  ##< Number of elements in a tile at which it takes the full colour.
+
+    ##
+    #  @brief Initializes empty grids.
+    #  @param background Colour of the empty tiles.
+    #  @param foods Colour of the tiles full of food.
+    #  @param entities Colour of the tiles full of entities.
+    def __init__(self, background, foods, entities):
+        self.colors = [np.array(color, dtype=np.float32) for color in (background, foods, entities)]
+        self.foods = None     ##< Number of foods of each tile, indexed [tx, ty].
+        self.entities = None  ##< Number of entities of each tile, indexed [tx, ty].
+        self.surface = None   ##< Heat map, one pixel per tile.
+
+    ##
+    #  @brief Reads the counts of a state and draws the heat map.
+    #  @param snapshot The *Snapshot* to read.
+    def update(self, snapshot):
+        width, height = snapshot.tiles
+        self.foods = np.frombuffer(snapshot.counts, dtype=np.intc).reshape(width, height)
+        x, y = _coords(snapshot)
+        tiles = (x // Occupancy.TILE) * height + y // Occupancy.TILE
+        self.entities = np.bincount(tiles, minlength=width * height).reshape(width, height)
+
+        background, foods, entities = self.colors
+        food = np.minimum(self.foods / Density.SATURATION, 1)[..., None]
+        entity = np.minimum(self.entities / Density.SATURATION, 1)[..., None]
+        image = background + (foods - background) * food
+        image += (entities - image) * entity
+        if self.surface is None or self.surface.get_size() != (width, height):
+            self.surface = pygame.Surface((width, height))
+        pygame.surfarray.blit_array(self.surface, image.astype(np.uint8))
@@ -0,0 +1,143 @@
+##
+#  @file pool.py
+#  @brief File containing the class *Pool*, the storage of the entities of the object engine.
+#  @date 2026-10-16
+#  @author Rabyte Studio
+
+from functools import partial
+from operator import is_not
+
+##
+#  @class Pool
+#  @brief Ordered collection of elements with O(1) removal and changes deferred to the end of a tick.
+#
+#  Elements are kept in a list of slots and know their own slot (`_slot`). Removing an element
+#  leaves a tombstone (None) in its slot, and the slots are compacted, keeping their order,
+#  once tombstones exceed COMPACT_RATIO of them. Iterating yields the living elements in order.
+#
+#  During a tick, births and deaths are only buffered (*birth*, *kill*) and applied together by
+#  *commit*: the elements stepped by a tick are exactly those alive when it started.
+#
+#  Given a key, the pool also keeps a hash index of the living elements by the value of that
+#  attribute, read by *get*. Keys are meant to be unique; if several living elements share one,
+#  the index holds the last one added.
+class Pool:
+
+    COMPACT_RATIO = 0.25  ##< Share of tombstones in the slots above which they are compacted.
+
+    ##
+    #  @brief Initializes an empty pool.
+    #  @param key Name of the attribute the living elements are indexed by, or None (default is None).
+    def __init__(self, key=None):
+        self.key = key
+        self._slots = []  ##< Elements, or None for the removed ones.
+        self._len = 0     ##< Number of living elements.
+        self._born = []   ##< Elements to add at the next *commit*.
+        self._dead = []   ##< Elements to remove at the next *commit*.
+        self._index = {}  ##< Key -> living element, when the pool has a key.
+
+    ##
+    #  @brief Represents the Pool as a string.
+    #  @return The representation of the list of its living elements.
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    ##
+    #  @brief Returns the number of living elements.
+    #  @return The number of living elements, births and deaths not committed excluded.
+    def __len__(self):
+        return self._len
+
+    ##
+    #  @brief Iterates over the living elements, in order.
+    #  @return An iterator skipping the tombstones.
+    def __iter__(self):
+        return filter(partial(is_not, None), self._slots)
+
+    ##
+    #  @brief Returns the living element with a key, in O(1).
+    #  @param key The value of the key attribute of the element.
+    #  @return The element, or None if no living element has this key.
+    #  @throws TypeError if the pool has no key.
+    def get(self, key):
+        if self.key is None:
+            raise TypeError("the pool has no key!")
+        return self._index.get(key)
+
+    ##
+    #  @brief Adds an element at the end of the pool.
+    #  @param elem The element to add.
+    def append(self, elem):
+        elem._slot = len(self._slots)
+        self._slots.append(elem)
+        self._len += 1
+        if self.key is not None:
+            self._index[getattr(elem, self.key)] = elem
+
+    ##
+    #  @brief Removes an element from the pool, in O(1).
+    #  @param elem The element to remove.
+    #  @throws ValueError if the element is not in the pool.
+    def remove(self, elem):
+        self._tombstone(elem)
+        self._compact()
+
+    ##
+    #  @brief Replaces an element by a tombstone.
+    #  @param elem The element to remove.
+    #  @throws ValueError if the element is not in the pool.
+    def _tombstone(self, elem):
+        slot = elem._slot
+        if slot < 0 or slot >= len(self._slots) or self._slots[slot] is not elem:
+            raise ValueError(f"{elem} is not in the pool!")
+        self._slots[slot] = None
+        elem._slot = -1
+        self._len -= 1
+        if self.key is not None and self._index.get(getattr(elem, self.key)) is elem:
+            del self._index[getattr(elem, self.key)]
+
+    ##
+    #  @brief Removes every element, and the buffered changes.
+    def clear(self):
+        for elem in self._slots:
+            if elem is not None:
+                elem._slot = -1
+        self._slots.clear()
+        self._born.clear()
+        self._dead.clear()
+        self._index.clear()
+        self._len = 0
+
+    ##
+    #  @brief Buffers the addition of an element until the next *commit*.
+    #  @param elem The element born during the tick.
+    def birth(self, elem):
+        self._born.append(elem)
+
+    ##
+    #  @brief Buffers the removal of an element until the next *commit*.
+    #  @param elem The element dead during the tick.
+    def kill(self, elem):
+        self._dead.append(elem)
+
+    ##
+    #  @brief Applies the buffered deaths, then the buffered births.
+    #  @details Called at the end of each tick. The slots are compacted if needed.
+    def commit(self):
+        for elem in self._dead:
+            if elem._slot >= 0:
+                self._tombstone(elem)
+        for elem in self._born:
+            self.append(elem)
+        self._dead.clear()
+        self._born.clear()
+        self._compact()
+
+    ##
+    #  @brief Drops the tombstones, keeping the order of the elements, if there are too many.
+    def _compact(self):
+        if len(self._slots) - self._len <= len(self._slots) * Pool.COMPACT_RATIO:
+            return
+        self._slots = [elem for elem in self._slots if elem is not None]
+        for slot, elem in enumerate(self._slots):
+            elem._slot = slot
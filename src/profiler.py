@@ -0,0 +1,170 @@
+##
+#  @file profiler.py
+#  @brief File containing the class *Profiler*, timing the phases of the simulation ticks.
+#  @date 2026-10-16
+#  @author Rabyte Studio
+
+import json
+import os
+import threading
+from collections import deque
+from time import perf_counter
+
+##
+#  @class Profiler
+#  @brief Per-phase tick timer keeping rolling samples and an optional trace of the tick spans.
+#
+#  A tick is measured between *begin* and *end*; in between, each call to *lap* charges the time
+#  elapsed since the previous lap to a phase. Phases met several times in a tick (once per entity)
+#  are summed. Spans outside the ticks, such as rendering, are measured with *record*.
+#  The trace uses the Chrome trace event format, readable by chrome://tracing and Perfetto.
+#  Ticks and renders are measured on different threads and read from the console: the samples and
+#  the trace are only touched under a lock, and read from copies.
+class Profiler:
+
+    PHASES = ('decay', 'eat', 'reproduction', 'move', 'death', 'food', 'tick', 'render')  ##< Phases in report order.
+    WINDOW = 600             ##< Number of samples kept per phase.
+    PERCENTILES = (50, 90, 99)  ##< Percentiles printed by *report*.
+    MAX_TRACE = 1_000_000    ##< Maximum number of trace events kept.
+
+    ##
+    #  @brief Initializes a profiler.
+    #  @param window Number of samples kept per phase (default is WINDOW).
+    #  @param trace If True, the spans are also kept as trace events (default is False).
+    def __init__(self, window=WINDOW, trace=False):
+        self.samples = {}  ##< Phase -> deque of the last durations, in seconds.
+        self.window = window
+        self.trace = [] if trace else None  ##< Trace events, or None when not tracing.
+        self._lock = threading.Lock()  ##< Lock guarding `samples` and `trace`.
+        self.ticks = 0
+        self._origin = perf_counter()
+        self._current = {}
+        self._start = self._last = self._origin
+
+    ##
+    #  @brief Returns a string representation of the profiler.
+    #  @return A string with the number of profiled ticks and trace events.
+    def __repr__(self) -> str:
+        events = 'off' if self.trace is None else len(self.trace)
+        return f"<Profiler: ticks={self.ticks}, trace={events}>"
+
+    ##
+    #  @brief Starts measuring a tick.
+    def begin(self):
+        self._current = {}
+        self._start = self._last = perf_counter()
+
+    ##
+    #  @brief Charges the time elapsed since the previous lap to a phase of the current tick.
+    #  @param phase The name of the phase.
+    def lap(self, phase):
+        now = perf_counter()
+        self._current[phase] = self._current.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    ##
+    #  @brief Stops measuring the current tick and stores its samples.
+    def end(self):
+        end = perf_counter()
+        self.ticks += 1
+        for phase, seconds in self._current.items():
+            self._sample(phase, seconds)
+        self._sample('tick', end - self._start)
+
+        if self.trace is not None and len(self.trace) < Profiler.MAX_TRACE:
+            self._event('tick', self._start, end - self._start, {'tick': self.ticks})
+            # Phases are interleaved entity by entity: lay their totals out one after the other.
+            start = self._start
+            for phase, seconds in self._current.items():
+                self._event(phase, start, seconds)
+                start += seconds
+
+    ##
+    #  @brief Stores a span measured outside the ticks.
+    #  @param phase The name of the phase.
+    #  @param start The start of the span, from perf_counter().
+    #  @param end The end of the span, from perf_counter().
+    def record(self, phase, start, end):
+        self._sample(phase, end - start)
+        if self.trace is not None and len(self.trace) < Profiler.MAX_TRACE:
+            self._event(phase, start, end - start)
+
+    ##
+    #  @brief Appends a sample to the rolling window of a phase.
+    #  @param phase The name of the phase.
+    #  @param seconds The duration of the sample.
+    def _sample(self, phase, seconds):
+        with self._lock:
+            samples = self.samples.get(phase)
+            if samples is None:
+                samples = self.samples[phase] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    ##
+    #  @brief Appends a complete event to the trace.
+    #  @param name The name of the event.
+    #  @param start The start of the event, from perf_counter().
+    #  @param seconds The duration of the event.
+    #  @param args Optional dictionary of arguments shown with the event.
+    def _event(self, name, start, seconds, args=None):
+        event = {'name': name, 'ph': 'X', 'pid': os.getpid(), 'tid': threading.get_ident(),
+                 'ts': (start - self._origin) * 1e6, 'dur': seconds * 1e6}
+        if args:
+            event['args'] = args
+        with self._lock:
+            self.trace.append(event)
+
+    ##
+    #  @brief Copies the samples of every phase.
+    #  @return A dictionary mapping each phase to the list of its samples.
+    def _copy(self):
+        with self._lock:
+            return {phase: list(samples) for phase, samples in self.samples.items()}
+
+    ##
+    #  @brief Computes percentiles of the samples of a phase.
+    #  @param phase The name of the phase.
+    #  @param percentiles The percentiles to compute (default is PERCENTILES).
+    #  @return A list of durations in seconds, empty if the phase has no sample.
+    def percentiles(self, phase, percentiles=PERCENTILES):
+        with self._lock:
+            samples = list(self.samples.get(phase, ()))
+        return Profiler._percentiles(samples, percentiles)
+
+    ##
+    #  @brief Computes percentiles of a list of samples.
+    #  @param samples The list of durations.
+    #  @param percentiles The percentiles to compute.
+    #  @return A list of durations in seconds, empty if there is no sample.
+    @staticmethod
+    def _percentiles(samples, percentiles):
+        samples = sorted(samples)
+        if not samples:
+            return []
+        return [samples[min(len(samples) - 1, len(samples) * p // 100)] for p in percentiles]
+
+    ##
+    #  @brief Formats the rolling percentiles of every phase.
+    #  @return A multi-line table, durations in milliseconds.
+    def report(self) -> str:
+        header = "phase".ljust(14) + ''.join(f"p{p}".rjust(10) for p in Profiler.PERCENTILES) + "mean".rjust(10) + "  n"
+        lines = [f"Profiled ticks: {self.ticks} (last {self.window} samples, ms)", header]
+        copy = self._copy()
+        phases = [p for p in Profiler.PHASES if p in copy] + [p for p in copy if p not in Profiler.PHASES]
+        for phase in phases:
+            samples = copy[phase]
+            values = Profiler._percentiles(samples, Profiler.PERCENTILES) + [sum(samples) / len(samples)]
+            lines.append(phase.ljust(14) + ''.join(f"{v * 1e3:10.3f}" for v in values) + f"  {len(samples)}")
+        return '\n'.join(lines)
+
+    ##
+    #  @brief Writes the trace as a Chrome/Perfetto JSON trace file.
+    #  @param path The path of the file to write.
+    #  @throws ValueError if the profiler does not trace.
+    def dump(self, path):
+        if self.trace is None:
+            raise ValueError("the profiler was not started with a trace!")
+        with self._lock:
+            trace = list(self.trace)
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms'}, file)
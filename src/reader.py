@@ -0,0 +1,319 @@
+##
+#  @file reader.py
+#  @brief File containing the class *Reader*, reading save files record by record.
+#  @date 2026-10-16
+#  @author Rabyte Studio
+
+import re
+from pathlib import Path
+from time import localtime, strftime
+
+from entity import Entity
+from food import Food
+from journal import Journal
+from save import Save
+
+##
+#  @class Reader
+#  @brief Lazy reader of a save file, for inspecting it without loading it.
+#
+#  Records are decoded chunk by chunk and yielded as tuples: no *Entity* nor *Food* object is
+#  created and the simulation state is left untouched. Both the versioned and the legacy formats
+#  are read. The journal segments written after the checkpoint are replayed like *Save.load* does:
+#  their changes are folded once into tables, and the checkpoint records are patched as they are
+#  streamed, so memory grows with the journal, not with the checkpoint.
+#
+#  Example:
+#  @code
+#  reader = Reader(Save._dir / 'save_0')
+#  energy = sum(record[3] for record in reader.entities())
+#  @endcode
+class Reader:
+
+    BIN = 25   ##< Width of the bins of the energy histogram counted by *stats*.
+    BINS = 10  ##< Maximum number of bins of the energy histogram printed by *report*.
+    BAR = 40   ##< Width of the longest bar of the energy histogram, in characters.
+
+    _slot = re.compile(r'save_(\d+)')  ##< Name of a save file.
+
+    ##
+    #  @brief Opens a save file and reads its header.
+    #  @param path The path of the save file.
+    #  @throws IOError if the file cannot be read.
+    #  @throws ValueError if the header is invalid.
+    def __init__(self, path):
+        self.path = Path(path)
+        self.journal = Journal(self.path.with_name(self.path.name + '.journal'))
+        with open(self.path, 'rb') as file:
+            self.header = self._header(file)
+        self.last = self.header['last']  ##< Timestamp of the last save, checkpoint or segment.
+        self.time = self.header['time']  ##< Simulation time of the last save, checkpoint or segment.
+        self.segments = 0                ##< Number of journal segments replayed.
+        self._foods, self._entities = self._replay()
+
+    ##
+    #  @brief Represents the Reader as a string.
+    #  @return A string with the path and the format of the save.
+    def __repr__(self) -> str:
+        return f"<Reader: path='{self.path}', format={self.header['format']}, codec={self.header['codec']}>"
+
+    ##
+    #  @brief Lists the save files of a directory.
+    #  @param directory The directory to look into (default is the save directory).
+    #  @return A list of tuples (save number, path), sorted by number.
+    @classmethod
+    def slots(cls, directory=None):
+        directory = Path(Save._dir if directory is None else directory)
+        if not directory.is_dir():
+            return []
+        slots = []
+        for path in directory.iterdir():
+            match = cls._slot.fullmatch(path.name)
+            if match and path.is_file():
+                slots.append((int(match.group(1)), path))
+        return sorted(slots)
+
+    ##
+    #  @brief Reads the header of a save.
+    #  @param file The save file, at its start; it is left at the first record.
+    #  @return A dictionary with the keys 'format', 'codec', 'generation', 'last', 'time', 'size', 'foods'
+    #  and 'entities'; the generation is None for a version 2 or legacy save, and the counts for a legacy
+    #  save, which do not store them.
+    #  @throws ValueError if the header is invalid.
+    @staticmethod
+    def _header(file):
+        data = file.read(Save.HEADER.size)
+        if data[:len(Save.MAGIC)] == Save.MAGIC:
+            file.seek(0)
+            version, flags, generation, last, sim_time, width, height, nFoods, nEntities = Save._header(file)
+            return {'format': f"v{version}", 'codec': Save._codec(flags), 'generation': generation, 'last': last, 'time': sim_time,
+                    'size': (width, height), 'foods': nFoods, 'entities': nEntities}
+
+        times, coords = 2 * Save.NBYTES_TIME, 2 * Save.NBYTES_COORD
+        if len(data) < times + coords:
+            raise ValueError("Save ends in its header.")
+        file.seek(times + coords)  # The legacy header is shorter: the records start here
+        return {'format': 'legacy', 'codec': 'none', 'generation': None,
+                'last': int.from_bytes(data[:Save.NBYTES_TIME], 'big'),
+                'time': int.from_bytes(data[Save.NBYTES_TIME:times], 'big'),
+                'size': (int.from_bytes(data[times:times + Save.NBYTES_COORD], 'big'),
+                         int.from_bytes(data[times + Save.NBYTES_COORD:times + coords], 'big')),
+                'foods': None, 'entities': None}
+
+    ##
+    #  @brief Folds the journal segments of the checkpoint generation into tables of changes.
+    #  @return A tuple (foods, entities) of dictionaries mapping (x, y) to pts and id to
+    #  (x, y, energy, time), None for a food consumed or an entity dead since the checkpoint.
+    #  @details Segments of another generation, left by a crash after a checkpoint, are skipped.
+    def _replay(self):
+        foods, entities = {}, {}
+        if self.header['format'] == 'legacy':
+            return foods, entities
+        for generation, last, sim_time, sections in self.journal.segments():
+            if generation != self.header['generation']:
+                continue
+            self.segments += 1
+            self.last, self.time = last, sim_time
+            consumed = Save._unpack(sections['consumed'])
+            for xy in zip(consumed[0::2], consumed[1::2]):
+                foods[xy] = None
+            spawned = Save._unpack(sections['spawned'])
+            for pts, x, y in zip(spawned[0::3], spawned[1::3], spawned[2::3]):
+                foods[(x, y)] = pts
+            for id in Save._unpack(sections['deaths']):
+                entities[id] = None
+            for name in ('births', 'moves'):
+                records = Save._unpack(sections[name])
+                for id, x, y, energy, time in zip(records[0::5], records[1::5], records[2::5], records[3::5], records[4::5]):
+                    entities[id] = (x, y, energy, time)
+        return foods, entities
+
+    ##
+    #  @brief Reads the records of the save, foods first, with the journal replayed.
+    #  @return A generator of tuples ('food', (pts, x, y)) and ('entity', (id, x, y, energy, time)).
+    #  @throws ValueError if the records do not match the header.
+    #  @details The records of the checkpoint changed by the journal are replaced by their last
+    #  value, yielded after the other records of their kind.
+    def records(self):
+        foods, entities = self._foods, self._entities
+        changed = False
+        for name, record in self._checkpoint():
+            if name == 'food':
+                if (record[1], record[2]) not in foods:
+                    yield name, record
+                continue
+            if not changed:
+                changed = True
+                yield from (('food', (pts, *xy)) for xy, pts in foods.items() if pts is not None)
+            if record[0] not in entities:
+                yield name, record
+        if not changed:
+            yield from (('food', (pts, *xy)) for xy, pts in foods.items() if pts is not None)
+        yield from (('entity', (id, *row)) for id, row in entities.items() if row is not None)
+
+    ##
+    #  @brief Reads the records of the checkpoint, in file order.
+    #  @return A generator of records, as *records*.
+    #  @throws ValueError if the records do not match the header.
+    def _checkpoint(self):
+        with open(self.path, 'rb') as file:
+            header = self._header(file)
+            if header['format'] == 'legacy':
+                yield from self._legacy(file)
+                return
+
+            for name, data in Save._sections(file, header['codec'], header['foods'], header['entities']):
+                fields = Save._unpack(data)
+                if name == 'food':
+                    for record in zip(fields[0::3], fields[1::3], fields[2::3]):
+                        yield name, record
+                else:
+                    for record in zip(fields[0::5], fields[1::5], fields[2::5], fields[3::5], fields[4::5]):
+                        yield name, record
+
+    ##
+    #  @brief Reads the sentinel-terminated records of a legacy save.
+    #  @param file The save file, after its header.
+    #  @return A generator of records, as *records*.
+    #  @throws ValueError if the file ends in a record.
+    @staticmethod
+    def _legacy(file):
+        def read(size):
+            data = file.read(size)
+            if len(data) != size:
+                raise ValueError("Save ends in a record.")
+            return int.from_bytes(data, 'big')
+
+        while True:
+            pts = read(Food.NBYTES_PTS)
+            if pts == 0:
+                break
+            yield 'food', (pts, read(Save.NBYTES_COORD), read(Save.NBYTES_COORD))
+
+        while True:
+            id = read(Entity.NBYTES_ID)
+            if id == 0:
+                break
+            yield 'entity', (id, read(Save.NBYTES_COORD), read(Save.NBYTES_COORD),
+                             read(Entity.NBYTES_ENERGY), read(Entity.NBYTES_TIME))
+
+    ##
+    #  @brief Reads the food records of the save.
+    #  @return A generator of tuples (pts, x, y).
+    def foods(self):
+        for name, record in self.records():
+            if name != 'food':
+                return
+            yield record
+
+    ##
+    #  @brief Reads the entity records of the save.
+    #  @return A generator of tuples (id, x, y, energy, time).
+    def entities(self):
+        for name, record in self.records():
+            if name == 'entity':
+                yield record
+
+    ##
+    #  @brief Computes summary statistics of the save in one pass over its records.
+    #  @return A dictionary with the keys 'foods', 'pts', 'entities', 'energy' and 'time'
+    #  (tuples min, mean, max, or None without entity), 'histogram' (entity counts per energy
+    #  bin of width BIN) and 'segments' (number of journal segments replayed).
+    def stats(self):
+        histogram = [0] * (Entity.ENERGY_MAX // Reader.BIN + 1)
+        foods = pts = entities = 0
+        energy = [None, 0, None]
+        time = [None, 0, None]
+
+        for name, record in self.records():
+            if name == 'food':
+                foods += 1
+                pts += record[0]
+                continue
+            entities += 1
+            for value, total in ((record[3], energy), (record[4], time)):
+                total[0] = value if total[0] is None else min(total[0], value)
+                total[1] += value
+                total[2] = value if total[2] is None else max(total[2], value)
+            histogram[min(record[3] // Reader.BIN, len(histogram) - 1)] += 1
+
+        def summary(total):
+            return None if entities == 0 else (total[0], total[1] / entities, total[2])
+
+        return {'foods': foods, 'pts': pts, 'entities': entities,
+                'energy': summary(energy), 'time': summary(time),
+                'histogram': histogram,
+                'segments': self.segments}
+
+    ##
+    #  @brief Counts the records of the save.
+    #  @return A tuple (foods, entities): the counts of the header, None for a legacy save, or
+    #  counted over the records when the journal changed them.
+    def counts(self):
+        if not self.segments:
+            return self.header['foods'], self.header['entities']
+        foods = entities = 0
+        for name, _ in self.records():
+            if name == 'food':
+                foods += 1
+            else:
+                entities += 1
+        return foods, entities
+
+    ##
+    #  @brief Formats the header of the save on one line.
+    #  @return The formatted header.
+    def summary(self) -> str:
+        header = self.header
+        count = lambda n: '?' if n is None else n
+        foods, entities = self.counts()
+        journal = self.journal.size()
+        return (f"{self.path.name:<10} {header['format']:<6} {header['codec']:<5} "
+                f"{header['size'][0]}x{header['size'][1]:<5} time={self.time:<8} "
+                f"foods={count(foods):<8} entities={count(entities):<8} "
+                f"{Reader._bytes(self.path.stat().st_size):>10}"
+                + (f" +journal {Reader._bytes(journal)}" if journal else '')
+                + f"  {strftime('%Y-%m-%d %H:%M:%S', localtime(self.last))}")
+
+    ##
+    #  @brief Formats the header and the statistics of the save.
+    #  @return A multi-line report.
+    def report(self) -> str:
+        header, stats = self.header, self.stats()
+        width, height = header['size']
+        lines = [
+            f"{self.path}",
+            f"  format: {header['format']}, codec: {header['codec']}, size: {Reader._bytes(self.path.stat().st_size)}",
+            f"  saved: {strftime('%Y-%m-%d %H:%M:%S', localtime(self.last))}, time: {self.time}, map: {width}x{height}",
+            f"  foods: {stats['foods']} ({stats['pts']} pts)",
+            f"  entities: {stats['entities']} ({stats['entities'] / (width * height or 1):.4f} per cell)",
+        ]
+        if stats['entities']:
+            for name in ('energy', 'time'):
+                low, mean, high = stats[name]
+                lines.append(f"  {name}: min {low}, mean {mean:.1f}, max {high}")
+            lines.append("  energy histogram:")
+            histogram = stats['histogram']
+            first = next(i for i, count in enumerate(histogram) if count)
+            last = max(i for i, count in enumerate(histogram) if count)
+            merge = (last - first) // Reader.BINS + 1
+            bins = [sum(histogram[i:i + merge]) for i in range(first, last + 1, merge)]
+            for i, count in enumerate(bins):
+                low = (first + i * merge) * Reader.BIN
+                bar = '#' * (count * Reader.BAR // max(bins))
+                lines.append(f"    {low:>5}-{low + merge * Reader.BIN - 1:<5} {count:>8} {bar}")
+        if stats['segments']:
+            lines.append(f"  journal: {stats['segments']} segments replayed, {Reader._bytes(self.journal.size())}")
+        return '\n'.join(lines)
+
+    ##
+    #  @brief Formats a size in bytes.
+    #  @param size A number of bytes.
+    #  @return The size with a readable unit.
+    @staticmethod
+    def _bytes(size):
+        for unit in ('B', 'KiB', 'MiB'):
+            if size < 1024:
+                return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+            size /= 1024
+        return f"{size:.1f} GiB"
@@ -0,0 +1,261 @@
+##
+#  @file replay.py
+#  @brief File containing the classes *Recorder* and *Replay*, writing and playing runs tick by tick.
+#  @date 2026-10-16
+#  @author Rabyte Studio
+
+import struct
+import zlib
+from bisect import bisect_right
+
+from map import Map
+from entity import Entity
+from food import Food
+from journal import Journal
+from save import Save
+
+MAGIC = b'RSRP'  ##< First bytes of a replay file.
+VERSION = 1      ##< Version of the replay format.
+
+## Header of a replay file: magic, version, map width, map height, ticks between two keyframes.
+HEADER = struct.Struct('>4sHHHI')
+
+## Header of a frame: kind (KEYFRAME or DELTA), tick, size of the compressed body.
+FRAME = struct.Struct('>cQI')
+
+KEYFRAME = b'K'  ##< Frame holding every record: (pts, x, y) foods, then (id, x, y, energy, time) entities.
+DELTA = b'D'     ##< Frame holding the changes since the previous frame, as the sections of a *Journal* segment.
+
+KEYFRAME_SECTIONS = ('foods', 'entities')  ##< Sections of a keyframe, in file order.
+KEYFRAME_FIELDS = (3, 5)                   ##< Number of 2-byte fields of a record of each keyframe section.
+
+##
+#  @brief Packs the sections of a frame into its body.
+#  @param names The names of the sections, in order.
+#  @param fields The number of fields of a record of each section.
+#  @param sections A dictionary mapping names to iterables of records.
+#  @return The compressed body: the record count of every section, then the records.
+def _body(names, fields, sections):
+    packed = [Save._pack(sections[name], name) for name in names]
+    counts = struct.pack(f'>{len(names)}I', *(len(data) // (2 * n) for data, n in zip(packed, fields)))
+    return zlib.compress(counts + b''.join(packed), 1)
+
+##
+#  @brief Unpacks the body of a frame.
+#  @param names The names of the sections, in order.
+#  @param fields The number of fields of a record of each section.
+#  @param body The compressed body.
+#  @return A dictionary mapping names to lists of records.
+def _sections(names, fields, body):
+    data = zlib.decompress(body)
+    counts = struct.unpack_from(f'>{len(names)}I', data)
+    offset = 4 * len(names)
+    sections = {}
+    for name, n, count in zip(names, fields, counts):
+        values = Save._unpack(data[offset:offset + 2 * n * count])
+        sections[name] = list(zip(*(values[i::n] for i in range(n))))
+        offset += 2 * n * count
+    return sections
+
+
+##
+#  @class Recorder
+#  @brief Writes the state of the simulation to a replay file, tick after tick.
+#
+#  Every tick is written as a delta frame holding the changes since the previous tick (see
+#  *Journal.changes*), and every `keyframe` ticks as a keyframe holding the whole state, from
+#  which a *Replay* can start. A keyframe is also written whenever entity ids are not unique,
+#  since deltas refer to entities by id.
+class Recorder:
+
+    KEYFRAME = 100  ##< Default number of ticks between two keyframes.
+
+    ##
+    #  @brief Creates a replay file for the current map.
+    #  @param path The path of the replay file.
+    #  @param keyframe Number of ticks between two keyframes (default is KEYFRAME).
+    def __init__(self, path, keyframe=KEYFRAME):
+        self.path = path
+        self.keyframe = keyframe
+        self.frames = 0
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, Map.size[0], Map.size[1], keyframe))
+        self._base = None
+        self._key = None
+
+    ##
+    #  @brief Represents the Recorder as a string.
+    #  @return A string with the path and the number of recorded frames.
+    def __repr__(self) -> str:
+        return f"<Recorder: path='{self.path}', frames={self.frames}>"
+
+    ##
+    #  @brief Records the current state of the simulation.
+    #  @param tick The simulation time of the state.
+    def record(self, tick):
+        foods = {(food.x, food.y): food.pts for food in Food.list}
+        rows = list(Entity.rows())
+        entities = {id: (x, y, energy, time) for id, x, y, energy, time in rows}
+        tables = (foods, entities) if len(entities) == len(rows) else None
+
+        if self._base is None or tables is None or tick - self._key >= self.keyframe:
+            kind = KEYFRAME
+            body = _body(KEYFRAME_SECTIONS, KEYFRAME_FIELDS,
+                         {'foods': ((pts, x, y) for (x, y), pts in foods.items()), 'entities': rows})
+            self._key = tick
+        else:
+            kind = DELTA
+            body = _body(Journal.SECTIONS, Journal.FIELDS, Journal.changes(self._base, tables))
+
+        self._file.write(FRAME.pack(kind, tick, len(body)))
+        self._file.write(body)
+        self._base = tables
+        self.frames += 1
+
+    ##
+    #  @brief Closes the replay file.
+    def close(self):
+        self._file.close()
+
+
+##
+#  @class Replay
+#  @brief Plays a replay file back into the simulation classes.
+#
+#  The state of each frame is set into *Food* and *Entity* (object engine only), so that *Visual*
+#  can draw it. Nothing is simulated: *seek* loads the nearest keyframe at or before the wanted tick,
+#  then applies the few deltas up to it.
+class Replay:
+
+    ##
+    #  @brief Opens a replay file and indexes its keyframes.
+    #  @param path The path of the replay file.
+    #  @throws ValueError if the file is not a replay file of a known version.
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        magic, version, width, height, self.keyframe = HEADER.unpack(self._file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            self._file.close()
+            raise ValueError(f"{path} is not a replay file of version {VERSION}.")
+        self.size = (width, height)
+
+        self._keys = []     ##< Ticks of the keyframes.
+        self._offsets = []  ##< Offsets of the keyframes in the file.
+        self.first = self.last = None
+        for kind, tick, offset, _ in self._frames(HEADER.size):
+            if kind == KEYFRAME:
+                self._keys.append(tick)
+                self._offsets.append(offset)
+            self.first = tick if self.first is None else self.first
+            self.last = tick
+        if not self._keys:
+            self._file.close()
+            raise ValueError(f"{path} holds no keyframe.")
+
+        self.tick = None
+        self._entities = {}  ##< Id -> Entity of the current frame.
+
+    ##
+    #  @brief Represents the Replay as a string.
+    #  @return A string with the path, the ticks and the current tick.
+    def __repr__(self) -> str:
+        return f"<Replay: path='{self.path}', ticks={self.first}..{self.last}, tick={self.tick}>"
+
+    ##
+    #  @brief Reads the frame headers from an offset.
+    #  @param offset The offset of the first frame to read.
+    #  @param body If True, the bodies are read too (default is False).
+    #  @return A generator of tuples (kind, tick, offset, body or None); the last frame is dropped if truncated.
+    def _frames(self, offset, body=False):
+        self._file.seek(offset)
+        while True:
+            header = self._file.read(FRAME.size)
+            if len(header) < FRAME.size:
+                return
+            kind, tick, size = FRAME.unpack(header)
+            if body:
+                data = self._file.read(size)
+                if len(data) < size:
+                    return
+            else:
+                data = None
+                self._file.seek(size, 1)
+            yield kind, tick, offset, data
+            offset += FRAME.size + size
+
+    ##
+    #  @brief Loads the state of a tick.
+    #  @param tick The tick to show; it is clamped to the recorded ticks.
+    def seek(self, tick):
+        tick = min(max(tick, self.first), self.last)
+        i = max(bisect_right(self._keys, tick) - 1, 0)
+        self._reader = self._frames(self._offsets[i], body=True)
+        self.next()
+        while self.tick < tick and self.next():
+            pass
+
+    ##
+    #  @brief Loads the state of the next recorded tick.
+    #  @return True if a frame was loaded, False at the end of the replay.
+    def next(self):
+        for kind, tick, offset, body in self._reader:
+            if kind == KEYFRAME:
+                self._load(_sections(KEYFRAME_SECTIONS, KEYFRAME_FIELDS, body))
+            else:
+                self._apply(_sections(Journal.SECTIONS, Journal.FIELDS, body))
+            self.tick = tick
+            return True
+        return False
+
+    ##
+    #  @brief Sets a keyframe as the state of the simulation.
+    #  @param sections The sections of the keyframe.
+    def _load(self, sections):
+        if Map.size != self.size:
+            Map.init(self.size)
+        Food.clear()
+        for pts, x, y in sections['foods']:
+            Food.new((x, y), pts)
+        Entity.clear()
+        self._entities = {}
+        for id, x, y, energy, time in sections['entities']:
+            self._entities[id] = self._new(x, y, energy, time, id)
+
+    ##
+    #  @brief Adds an entity of a frame to the simulation.
+    #  @param x The x-coordinate of the entity.
+    #  @param y The y-coordinate of the entity.
+    #  @param energy The energy of the entity.
+    #  @param time The time of the entity.
+    #  @param id The identifier of the entity.
+    #  @return The new Entity.
+    @staticmethod
+    def _new(x, y, energy, time, id):
+        entity = Entity((x, y), energy, time, id)
+        Entity.list.append(entity)
+        return entity
+
+    ##
+    #  @brief Applies a delta to the state of the simulation.
+    #  @param sections The sections of the delta.
+    def _apply(self, sections):
+        for x, y in sections['consumed']:
+            food = Food.grid.at(x, y)
+            if food is not None:
+                Food.delete(food)
+        for pts, x, y in sections['spawned']:
+            Food.new((x, y), pts)
+        for (id,) in sections['deaths']:
+            Entity.delete(self._entities.pop(id))
+        for id, x, y, energy, time in sections['births']:
+            self._entities[id] = self._new(x, y, energy, time, id)
+        for id, x, y, energy, time in sections['moves']:
+            entity = self._entities[id]
+            entity.x, entity.y = x, y
+            entity.energy, entity.time = energy, time
+
+    ##
+    #  @brief Closes the replay file.
+    def close(self):
+        self._file.close()
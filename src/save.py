@@ -4,11 +4,20 @@
 #  @date 2024-10-04
 #  @author Rabyte Studio
 import struct
+import os
+import sys
+import threading
+import zlib
+import lzma
+import bz2
+from array import array
+from itertools import chain
 from entity import Entity
 from food import Food
 from map import Map
-from time import time, sleep 
+from time import time, time_ns, sleep
 from shutil import copy
+from journal import Journal
 import path
 
 
@@ -28,14 +37,50 @@ class Save:
 
     TIME_IN_AGE = 40
 
+    MAGIC = b'RSIM'     ##< First bytes of a versioned save file (a legacy file starts with a timestamp)
+    VERSION = 3         ##< Version of the save format written by *save*
+
+    ## Header of a versioned save: magic, version, flags, checkpoint generation, last loading,
+    ## simulation time, map width, map height, number of food records, number of entity records.
+    HEADER = struct.Struct('>4sHHQQQHHII')
+    ## Header of a version 2 save, still read: the same fields without the checkpoint generation.
+    HEADER_V2 = struct.Struct('>4sHHQQHHII')
+    PREFIX = struct.Struct('>4sH')  ##< Magic and version, the first fields of every header
+
+    RECORD_TYPE = 'H'   ##< Array type of the record fields: every field is a 2-byte unsigned integer
+    FOOD_FIELDS = 3     ##< Fields of a food record: pts, x, y
+    ENTITY_FIELDS = 5   ##< Fields of an entity record: id, x, y, energy, time
+
+    CODECS = ('none', 'zlib', 'lzma', 'bz2')  ##< Compression codecs of the records, by id stored in the header flags
+    CODEC_MASK = 0x000F ##< Bits of the header flags holding the codec id
+    CODEC = 'none'      ##< Default codec
+    LEVEL = 6           ##< Default compression level (0-9; 1-9 for bz2)
+    CHUNK_SIZE = 1 << 20  ##< Bytes of records encoded or decoded at once
+
+    JOURNAL = True      ##< If True, *save* appends to the journal between checkpoints
+    COMPACT_RATIO = 1.0 ##< Journal size, relative to the checkpoint, above which *save* writes a checkpoint
+
     ## 
     #  @brief Initializes the Save object.
     #  @param numSave An integer representing the save file number (default is 0).
-    def __init__(self, numSave=0) -> None:
+    #  @param codec The codec compressing the checkpoints, one of CODECS (default is CODEC).
+    #  @param level The compression level (default is LEVEL).
+    #  @throws ValueError if the codec is unknown.
+    def __init__(self, numSave=0, codec=CODEC, level=LEVEL) -> None:
+        if codec not in Save.CODECS:
+            raise ValueError(f"codec must be one of {', '.join(Save.CODECS)}!")
         self.number = numSave   ##< Save file number
+        self.codec = codec      ##< Codec compressing the checkpoints
+        self.level = level      ##< Compression level
         self.last = 0           ##< Last loading timestamp
         self.time = 0   
         self.path = Save._dir / (Save._name + str(self.number))     
+        self.journal = Journal(self.path.with_name(self.path.name + '.journal'))  ##< Changes since the checkpoint
+        self._base = None       ##< Records of the last saved or loaded state (see *_tables*), None if unknown
+        self.generation = 0     ##< Generation of the last saved or loaded checkpoint, tagging its journal segments
+        self._worker = None     ##< Thread of the running background save (see *saveAsync*)
+        self.progress = None    ##< Progress of the last write, from 0 to 1, None before any write
+        self.error = None       ##< Error of the last background save, None if it succeeded
 
         # Create the save directory if it doesn't exist
         Save._dir.mkdir(parents=True, exist_ok=True) 
@@ -86,96 +131,451 @@ class Save:
         return self._age 
 
     ## 
-    #  @brief Saves the current simulation state to a binary file.
+    #  @brief Saves the current simulation state.
+    #  @details The changes since the last save are appended to the journal of the save (see *Journal*).
+    #  A full checkpoint is written instead when there is no checkpoint to build on, when the journal
+    #  has grown past COMPACT_RATIO times the checkpoint, or when entity ids are not unique.
+    #  A background save still running is waited for first.
     #  @throws IOError if file operations fail.
     #  @throws ValueError if a value exceeds its byte limits.
     def save(self):
+        self.wait()
+        self.write(self.snapshot())
+
+    ## 
+    #  @brief Writes the current simulation state as a full checkpoint and clears the journal.
+    #  @throws IOError if file operations fail.
+    #  @throws ValueError if a value exceeds its byte limits.
+    def checkpoint(self):
+        self.wait()
+        self.write(self.snapshot(), checkpoint=True)
+
+    ## 
+    #  @brief Saves the current simulation state on a worker thread.
+    #  @details The snapshot is taken by the calling thread, which must be at a tick boundary;
+    #  encoding and writing happen on the worker. Follow it with *busy*, *progress* and *error*.
+    #  @param checkpoint If True, a full checkpoint is written (default is False).
+    #  @return True if the save started, False if a background save is still running or the
+    #  snapshot failed (see *error*).
+    def saveAsync(self, checkpoint=False):
+        if self.busy:
+            return False
+        self.progress = 0.0
+        self.error = None
         try:
-            stop = int(time())
-            timestamp = str(stop)
-            backup_path = Save._backup / (Save._name + f"{self.number}.bak")
-            copy(str(self.path), backup_path) 
-        except:
-            stop = int(time())
+            state = self.snapshot()
+        except ValueError as e:
+            self.error = e
+            return False
+        self._worker = threading.Thread(target=self._work, args=(state, checkpoint), name=f"save_{self.number}")
+        self._worker.start()
+        return True
 
+    ## 
+    #  @brief Body of the worker thread of *saveAsync*.
+    #  @param state A dictionary returned by *snapshot*.
+    #  @param checkpoint If True, a full checkpoint is written.
+    def _work(self, state, checkpoint):
         try:
-            # Open the file for writing in binary mode
-            with open(self.path, 'wb') as file:        
-                self._write_int(file, Save.NBYTES_TIME, stop, 'file.last_loading')
-                self._write_int(file, Save.NBYTES_TIME, self.time + ( stop - self.starting ), 'file.sim_time')
-                self._write_int(file, Save.NBYTES_COORD, Map.size[0], 'map.size_x')
-                self._write_int(file, Save.NBYTES_COORD, Map.size[1], 'map.size_y')
-
-                self._write_food(file)
-                self._write_entity(file)
-                
+            self.write(state, checkpoint)
+        except Exception as e:
+            self.error = e
+
+    ## 
+    #  @brief Tells whether a background save is running.
+    #  @return True while the worker thread of *saveAsync* is alive.
+    @property
+    def busy(self):
+        return self._worker is not None and self._worker.is_alive()
+
+    ## 
+    #  @brief Waits for the background save to finish, if any. Its error stays in *error*.
+    def wait(self):
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+
+    ## 
+    #  @brief Takes a consistent copy of the simulation state, to be written by *write*.
+    #  @details Only the records are copied: with an *Engine* they are packed at once, otherwise
+    #  the entity rows are listed. Must be called at a tick boundary.
+    #  @return A dictionary with the keys 'stop', 'time', 'size', 'foods' (list of (pts, x, y))
+    #  and 'entities' (list of (id, x, y, energy, time), or records packed by *Engine.pack*).
+    def snapshot(self):
+        stop = int(time())
+        return {
+            'stop': stop,
+            'time': self.time + ( stop - self.starting ),
+            'size': tuple(Map.size),
+            'foods': [(food.pts, food.x, food.y) for food in Food.list],
+            'entities': Entity.engine.pack() if Entity.engine is not None else list(Entity.rows()),
+        }
+
+    ## 
+    #  @brief Writes a snapshot to the save, as a journal segment or as a full checkpoint.
+    #  @param state A dictionary returned by *snapshot*.
+    #  @param checkpoint If True, a full checkpoint is written (default is False).
+    #  @details Only uses the snapshot and this Save, so it can run on any thread.
+    #  *progress* goes from 0 to 1 while writing.
+    #  @throws IOError if file operations fail.
+    #  @throws ValueError if a value exceeds its byte limits.
+    def write(self, state, checkpoint=False):
+        self.progress = 0.0
+        try:
+            if (not checkpoint and Save.JOURNAL and self._base is not None
+                    and self.journal.size() < Save.COMPACT_RATIO * self._size()):
+                if self._append(state):
+                    self.progress = 1.0
+                    return
+            self._checkpoint(state)
+            self.progress = 1.0
+
         except IOError as e:
             raise IOError(f"File error: {e}")
-        except ValueError as e:
+        except (ValueError, struct.error) as e:
             raise ValueError(f"Value error: {e}")
         except Exception as e:
             raise Exception(f"Failed to save: {e}")
 
     ## 
-    #  @brief Writes an integer value to a binary file.
-    #  @param file The file object to write to.
-    #  @param size Number of bytes for the integer.
-    #  @param value The integer value to write.
-    #  @param name Optional parameter for the value's name (used for error messages).
-    #  @throws ValueError if value does not fit in the specified byte size.
-    def _write_int(self, file, size, value, name="value"):
-        # Ensure the value fits in the specified byte size
-        if not (0 <= value < 2 ** (size * 8)):
-            raise ValueError(f"{name} must fit in {size} bytes!")
-
-        # Pack the integer into bytes using struct
-        file.write(value.to_bytes(size, byteorder='big'))
-
-    ## 
-    #  @brief Writes the current food list to a binary file.
-    #  @param file The file object to write to.
-    def _write_food(self, file):
-        for food in Food.list:
-            self._write_int(file, Food.NBYTES_PTS, food.pts, 'food.pts')
-            self._write_int(file, Save.NBYTES_COORD, food.x, 'food.x')
-            self._write_int(file, Save.NBYTES_COORD, food.y, 'food.y')
-        self._write_int(file, Food.NBYTES_PTS, 0x00, 'food.end')
-
-    ## 
-    #  @brief Writes the current entity list to a binary file.
-    #  @param file The file object to write to.
-    def _write_entity(self, file):
-        for entity in Entity.list:
-            self._write_int(file, Entity.NBYTES_ID, entity.id, 'entity.id')
-            self._write_int(file, Save.NBYTES_COORD, entity.x, 'entity.x')
-            self._write_int(file, Save.NBYTES_COORD, entity.y, 'entity.y')
-            self._write_int(file, Entity.NBYTES_ENERGY, entity.energy, 'entity.energy')
-            self._write_int(file, Entity.NBYTES_TIME, entity.time, 'entity.time')
-        self._write_int(file, Entity.NBYTES_ID, 0x00, 'entity.end')
+    #  @brief Writes a snapshot as a full checkpoint and clears the journal.
+    #  @param state A dictionary returned by *snapshot*.
+    #  @details The file is written in the versioned format (see *HEADER*): a header holding the
+    #  record counts, then the food and entity records packed as fixed-width arrays, compressed
+    #  chunk by chunk with the codec of the save (its id is kept in the header flags). It is written
+    #  to a temporary file first, then atomically renamed over the save, and only then is the journal
+    #  deleted. Every checkpoint has a new generation, stored in its header and in the segments
+    #  appended after it: a crash between the rename and the deletion leaves the new checkpoint with
+    #  segments of the previous generation, which *load* skips.
+    def _checkpoint(self, state):
+        try:
+            backup_path = Save._backup / (Save._name + f"{self.number}.bak")
+            copy(str(self.path), backup_path) 
+            if self.journal.size():
+                copy(self.journal.path, Save._backup / (Save._name + f"{self.number}.journal.bak"))
+        except:
+            pass
+
+        foods, entities = state['foods'], state['entities']
+        nFoods = len(foods)
+        nEntities = len(entities) // (2 * Save.ENTITY_FIELDS) if isinstance(entities, bytes) else len(entities)
+        generation = time_ns()
+        header = Save.HEADER.pack(Save.MAGIC, Save.VERSION, Save.CODECS.index(self.codec), generation, state['stop'],
+                                  state['time'], state['size'][0], state['size'][1], nFoods, nEntities)
+
+        # Write everything to a temporary file, then replace the save in one step
+        temp = self.path.with_name(self.path.name + '.tmp')
+        total = 2 * (Save.FOOD_FIELDS * nFoods + Save.ENTITY_FIELDS * nEntities) or 1
+        done = 0
+        with open(temp, 'wb') as file:
+            file.write(header)
+            compressor = self._compressor()
+            for chunk in chain(self._chunks(foods, Save.FOOD_FIELDS, 'food'),
+                               self._chunks(entities, Save.ENTITY_FIELDS, 'entity')):
+                file.write(compressor.compress(chunk) if compressor else chunk)
+                done += len(chunk)
+                self.progress = 0.9 * done / total
+            if compressor:
+                file.write(compressor.flush())
+            file.flush()
+            os.fsync(file.fileno())
+        self.progress = 0.9
+        os.replace(temp, self.path)
+        self.generation = generation
+        self.journal.clear()
+        self._base = self._tables(state)
+
+    ## 
+    #  @brief Packs records by chunks of about CHUNK_SIZE bytes.
+    #  @param rows A list of tuples of integers, or records already packed.
+    #  @param fields Number of fields of a record.
+    #  @param name Name of the records (used for error messages).
+    #  @return A generator of packed bytes.
+    def _chunks(self, rows, fields, name):
+        if isinstance(rows, bytes):
+            for i in range(0, len(rows), Save.CHUNK_SIZE):
+                yield rows[i:i + Save.CHUNK_SIZE]
+            return
+        count = Save.CHUNK_SIZE // (2 * fields)
+        for i in range(0, len(rows), count):
+            yield self._pack(rows[i:i + count], name)
+
+    ## 
+    #  @brief Creates the compressor of the codec of the save.
+    #  @return A compressor object, or None for 'none'.
+    def _compressor(self):
+        if self.codec == 'zlib':
+            return zlib.compressobj(self.level)
+        if self.codec == 'lzma':
+            return lzma.LZMACompressor(preset=self.level)
+        if self.codec == 'bz2':
+            return bz2.BZ2Compressor(self.level)
+        return None
+
+    ## 
+    #  @brief Creates a decompressor.
+    #  @param codec One of CODECS.
+    #  @return A decompressor object, or None for 'none'.
+    @staticmethod
+    def _decompressor(codec):
+        if codec == 'zlib':
+            return zlib.decompressobj()
+        if codec == 'lzma':
+            return lzma.LZMADecompressor()
+        if codec == 'bz2':
+            return bz2.BZ2Decompressor()
+        return None
+
+    ## 
+    #  @brief Appends the changes of a snapshot since the last save to the journal.
+    #  @param state A dictionary returned by *snapshot*.
+    #  @return True if the segment was written, False if entity ids are not unique.
+    def _append(self, state):
+        tables = self._tables(state)
+        if tables is None:
+            return False
+        sections = {name: self._pack(rows, name) for name, rows in Journal.changes(self._base, tables).items()}
+        self.progress = 0.5
+        self.journal.append(self.generation, state['stop'], state['time'], sections)
+        self._base = tables
+        return True
+
+    ## 
+    #  @brief Indexes the records of a snapshot, to compute the changes of the next save.
+    #  @param state A dictionary returned by *snapshot*.
+    #  @return A tuple (foods, entities): dictionaries mapping (x, y) to pts and id to (x, y, energy, time),
+    #  or None if entity ids are not unique.
+    def _tables(self, state):
+        foods = {(x, y): pts for pts, x, y in state['foods']}
+        rows = state['entities']
+        if isinstance(rows, bytes):
+            records = self._unpack(rows)
+            rows = zip(records[0::5], records[1::5], records[2::5], records[3::5], records[4::5])
+            count = len(records) // Save.ENTITY_FIELDS
+        else:
+            count = len(rows)
+        entities = {id: (x, y, energy, time) for id, x, y, energy, time in rows}
+        if len(entities) != count:
+            return None
+        return foods, entities
+
+    ## 
+    #  @brief Returns the size of the checkpoint file.
+    #  @return The size in bytes, 0 if there is no checkpoint.
+    def _size(self):
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    ## 
+    #  @brief Packs records into a buffer of big-endian 2-byte fields.
+    #  @param rows An iterable of tuples of integers.
+    #  @param name Name of the records (used for error messages).
+    #  @return The packed bytes.
+    #  @throws ValueError if a value does not fit in 2 bytes.
+    @staticmethod
+    def _pack(rows, name="record"):
+        try:
+            records = array(Save.RECORD_TYPE, chain.from_iterable(rows))
+        except OverflowError:
+            raise ValueError(f"{name} values must fit in 2 bytes!")
+        if sys.byteorder == 'little':
+            records.byteswap()
+        return records.tobytes()
+
+    ## 
+    #  @brief Unpacks a buffer of big-endian 2-byte fields.
+    #  @param data The buffer.
+    #  @return An array of the fields.
+    @staticmethod
+    def _unpack(data):
+        records = array(Save.RECORD_TYPE)
+        records.frombytes(data)
+        if sys.byteorder == 'little':
+            records.byteswap()
+        return records
 
     ## 
     #  @brief Loads the simulation state from a binary file.
+    #  @details Both the versioned formats (see *_header*) and the legacy sentinel-terminated format
+    #  are read. The checkpoint is loaded first, then the segments of the journal written after it
+    #  (of its generation) are replayed over it.
+    #  A save older than VERSION is rewritten as a checkpoint by the next *save*.
     #  @throws IOError if file operations fail.
     #  @throws ValueError if the data in the file is invalid.
     def load(self):
+        self.wait()
         try:
             # Open the file for reading in binary mode
             with open(self.path, 'rb') as file:
-                self.last = self._read_int(file, Save.NBYTES_TIME, 'file.last_loading')
-                self.time = self._read_int(file, Save.NBYTES_TIME, 'file.sim_time')
-                Map.size = (self._read_int(file, Save.NBYTES_COORD, 'map.size_x'),
-                            self._read_int(file, Save.NBYTES_COORD, 'map.size_y'))
-
-                self._read_food(file)
-                self._read_entity(file)
+                if file.read(len(Save.MAGIC)) == Save.MAGIC:
+                    file.seek(0)
+                    self._load_records(file)
+                    segments = [segment for segment in self.journal.segments() if segment[0] == self.generation]
+                    if segments:
+                        self._replay(segments)
+                    # A version 2 save has no generation to tag new segments with: the next save is a checkpoint
+                    self._base = self._tables(self.snapshot()) if self.generation is not None else None
+                else:
+                    file.seek(0)
+                    self._load_legacy(file)
+                    self._base = None  # The file is in the legacy format: the next save is a checkpoint
                 
         except IOError as e:
             raise IOError(f"File error: {e}")
-        except ValueError as e:
+        except (ValueError, struct.error) as e:
             raise ValueError(f"Value error: {e}")
         except Exception as e:
             raise Exception(f"Failed to load: {e}")
 
+    ## 
+    #  @brief Loads a save in the versioned format.
+    #  @param file The file object to read from, at its start.
+    #  @throws ValueError if the version or the codec is unknown, or the size does not match the header.
+    def _load_records(self, file):
+        version, flags, generation, last, sim_time, width, height, nFoods, nEntities = Save._header(file)
+
+        self.generation = generation
+        self.last = last
+        self.time = sim_time
+        Map.init((width, height))
+        Food.clear()
+        Entity.clear()
+
+        for name, data in self._sections(file, Save._codec(flags), nFoods, nEntities):
+            if name == 'food':
+                foods = self._unpack(data)
+                for pts, x, y in zip(foods[0::3], foods[1::3], foods[2::3]):
+                    Food.new((x, y), pts)
+            elif Entity.engine is not None:
+                Entity.engine.unpack(data)
+            else:
+                entities = self._unpack(data)
+                for id, x, y, energy, time in zip(entities[0::5], entities[1::5], entities[2::5], entities[3::5], entities[4::5]):
+                    Entity.new((x, y), energy, time, id)
+        Entity.nEntities = max((row[0] for row in Entity.rows()), default=0)
+
+    ## 
+    #  @brief Reads the header of a versioned save, of VERSION or of version 2.
+    #  @param file The file object to read from, at its start; it is left at the first record.
+    #  @return A tuple (version, flags, generation, last, sim_time, width, height, nFoods, nEntities).
+    #  The generation is None for version 2: its journal segments carry none (see *Journal.segments*).
+    #  @throws ValueError if the version is unknown or the file ends in the header.
+    @staticmethod
+    def _header(file):
+        prefix = file.read(Save.PREFIX.size)
+        if len(prefix) < Save.PREFIX.size:
+            raise ValueError("Save ends in its header.")
+        magic, version = Save.PREFIX.unpack(prefix)
+        if version not in (2, Save.VERSION):
+            raise ValueError(f"Unsupported save version {version}.")
+        header = Save.HEADER if version == Save.VERSION else Save.HEADER_V2
+        data = prefix + file.read(header.size - len(prefix))
+        if len(data) < header.size:
+            raise ValueError("Save ends in its header.")
+        if version == Save.VERSION:
+            magic, version, flags, generation, *fields = header.unpack(data)
+        else:
+            magic, version, flags, *fields = header.unpack(data)
+            generation = None
+        return (version, flags, generation, *fields)
+
+    ## 
+    #  @brief Reads the codec of a versioned save from its header flags.
+    #  @param flags The flags field of the header.
+    #  @return One of CODECS.
+    #  @throws ValueError if the codec id is unknown.
+    @staticmethod
+    def _codec(flags):
+        codec = flags & Save.CODEC_MASK
+        if codec >= len(Save.CODECS):
+            raise ValueError(f"Unknown save codec {codec}.")
+        return Save.CODECS[codec]
+
+    ## 
+    #  @brief Decodes the records of a versioned save, chunk by chunk.
+    #  @param file The file object to read from, after the header.
+    #  @param codec One of CODECS.
+    #  @param nFoods Number of food records announced by the header.
+    #  @param nEntities Number of entity records announced by the header.
+    #  @return A generator of tuples ('food' or 'entity', packed whole records).
+    #  @throws ValueError if the records do not match the header.
+    @staticmethod
+    def _sections(file, codec, nFoods, nEntities):
+        decompressor = Save._decompressor(codec)
+        sections = [('food', 2 * Save.FOOD_FIELDS, nFoods), ('entity', 2 * Save.ENTITY_FIELDS, nEntities)]
+        buffer = b''
+        for name, size, count in sections:
+            left = size * count
+            while left:
+                if len(buffer) < size:
+                    data = file.read(Save.CHUNK_SIZE)
+                    if not data:
+                        raise ValueError(f"Save ends before its {count} {name} records.")
+                    buffer += decompressor.decompress(data) if decompressor else data
+                    continue
+                end = min(left, len(buffer) - len(buffer) % size)
+                yield name, buffer[:end]
+                buffer = buffer[end:]
+                left -= end
+
+        if decompressor is not None:
+            while not buffer and not decompressor.eof:
+                data = file.read(Save.CHUNK_SIZE)
+                if not data:
+                    raise ValueError("Save ends before its compressed stream.")
+                buffer = decompressor.decompress(data)
+            buffer += decompressor.unused_data
+        if buffer or file.read(1):
+            raise ValueError("Save has more data than its header announces.")
+
+    ## 
+    #  @brief Replays segments of the journal over the loaded checkpoint.
+    #  @param segments A list of segments read by *Journal.segments*.
+    #  @throws ValueError if entity ids of the checkpoint are not unique.
+    def _replay(self, segments):
+        tables = self._tables(self.snapshot())
+        if tables is None:
+            raise ValueError("the journal cannot be replayed over duplicate entity ids.")
+        foods, entities = tables
+
+        for generation, last, sim_time, sections in segments:
+            consumed = self._unpack(sections['consumed'])
+            for x, y in zip(consumed[0::2], consumed[1::2]):
+                foods.pop((x, y), None)
+            spawned = self._unpack(sections['spawned'])
+            for pts, x, y in zip(spawned[0::3], spawned[1::3], spawned[2::3]):
+                foods[(x, y)] = pts
+            for id in self._unpack(sections['deaths']):
+                entities.pop(id, None)
+            for name in ('births', 'moves'):
+                records = self._unpack(sections[name])
+                for id, x, y, energy, time in zip(records[0::5], records[1::5], records[2::5], records[3::5], records[4::5]):
+                    entities[id] = (x, y, energy, time)
+            self.last = last
+            self.time = sim_time
+
+        Food.clear()
+        for (x, y), pts in foods.items():
+            Food.new((x, y), pts)
+        Entity.clear()
+        for id, (x, y, energy, time) in entities.items():
+            Entity.new((x, y), energy, time, id)
+        Entity.nEntities = max(entities, default=0)
+
+    ## 
+    #  @brief Loads a save in the legacy sentinel-terminated format.
+    #  @param file The file object to read from, at its start.
+    def _load_legacy(self, file):
+        self.last = self._read_int(file, Save.NBYTES_TIME, 'file.last_loading')
+        self.time = self._read_int(file, Save.NBYTES_TIME, 'file.sim_time')
+        Map.init((self._read_int(file, Save.NBYTES_COORD, 'map.size_x'),
+                  self._read_int(file, Save.NBYTES_COORD, 'map.size_y')))
+
+        self._read_food(file)
+        self._read_entity(file)
+
     ## 
     #  @brief Reads an integer value from a binary file.
     #  @param file The file object to read from.
@@ -193,7 +593,7 @@ class Save:
     #  @brief Reads food data from a binary file and populates the Food list.
     #  @param file The file object to read from.
     def _read_food(self, file):
-        Food.list.clear()  # Clear existing food list
+        Food.clear()  # Clear existing food list and index
         while True:
             pts = self._read_int(file, Food.NBYTES_PTS, 'food.pts')
             if pts == 0:  # End of food data
@@ -208,7 +608,7 @@ class Save:
     #  @brief Reads entity data from a binary file and populates the Entity list.
     #  @param file The file object to read from.
     def _read_entity(self, file):
-        Entity.list.clear()  # Clear existing entity list
+        Entity.clear()  # Clear existing entities
         while True:
             entity_id = self._read_int(file, Entity.NBYTES_ID, 'entity.id')
             if entity_id == 0:  # End of entity data
@@ -217,10 +617,11 @@ class Save:
             y = self._read_int(file, Save.NBYTES_COORD, 'entity.y')
             energy = self._read_int(file, Entity.NBYTES_ENERGY, 'entity.energy')
             time = self._read_int(file, Entity.NBYTES_TIME, 'entity.time')
-            Entity.new((x, y), energy, time)  # Create new entity
+            Entity.new((x, y), energy, time, entity_id)  # Create new entity, keeping its id
+        Entity.nEntities = max((row[0] for row in Entity.rows()), default=0)
 
 if __name__ == "__main__":  
-    Map.size = Map.DEFAULT_SIZE
+    Map.init(Map.DEFAULT_SIZE)
     save = Save(numSave=1)
     save.load()
     print(save)
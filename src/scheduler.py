@@ -0,0 +1,78 @@
+##
+#  @file scheduler.py
+#  @brief File containing the class *Scheduler*.
+#  @date 2026-10-16
+#  @author Rabyte Studio
+
+from time import perf_counter
+
+##
+#  @class Scheduler
+#  @brief Fixed-timestep scheduler deciding how many simulation ticks to run per frame.
+#
+#  Elapsed real time is accumulated and converted into ticks at `tps * speed` ticks per second,
+#  independently of the frame rate. A frame runs every tick that is due, several if the simulation
+#  is behind, but never for longer than `budget` seconds so that rendering keeps going.
+class Scheduler:
+
+    SPEED_MAX = 0      ##< Speed multiplier meaning "as many ticks as the budget allows".
+    SPEEDS = (1, 10, SPEED_MAX)  ##< Speed multipliers selectable by the user.
+    MAX_BACKLOG = 100  ##< Maximum number of late ticks kept in the accumulator.
+
+    ##
+    #  @brief Initializes the scheduler.
+    #  @param tps Target number of ticks per second at speed 1.
+    #  @param budget Maximum time spent ticking per frame, in seconds.
+    #  @param speed Speed multiplier, or SPEED_MAX (default is 1).
+    def __init__(self, tps, budget, speed=1):
+        self.tps = tps
+        self.budget = budget
+        self.speed = speed
+        self.reset()
+
+    ##
+    #  @brief Returns a string representation of the scheduler.
+    #  @return A string with the target rate and the speed.
+    def __repr__(self) -> str:
+        return f"<Scheduler: tps={self.tps}, speed={self.speedName()}>"
+
+    ##
+    #  @brief Returns the speed as displayed to the user.
+    #  @return 'max' for SPEED_MAX, or the multiplier followed by 'x'.
+    def speedName(self) -> str:
+        return 'max' if self.speed == Scheduler.SPEED_MAX else f"{self.speed}x"
+
+    ##
+    #  @brief Drops the accumulated ticks and restarts measuring time from now.
+    #  @details Called while the simulation is paused so that no ticks pile up.
+    def reset(self):
+        self._last = perf_counter()
+        self._acc = 0.0
+
+    ##
+    #  @brief Yields once per tick to run during the current frame.
+    #  @details Ticks that do not fit in the budget stay due for the next frames,
+    #  up to MAX_BACKLOG of them.
+    def ticks(self):
+        now = perf_counter()
+        deadline = now + self.budget
+        if self.speed == Scheduler.SPEED_MAX:
+            self._last = now
+            while perf_counter() < deadline:
+                yield
+            return
+
+        self._acc = min(self._acc + (now - self._last) * self.tps * self.speed, Scheduler.MAX_BACKLOG)
+        self._last = now
+        while self._acc >= 1 and perf_counter() < deadline:
+            self._acc -= 1
+            yield
+
+    ##
+    #  @brief Returns the time left before the next tick is due.
+    #  @return A number of seconds, 0 if a tick is already due or at SPEED_MAX.
+    def delay(self):
+        if self.speed == Scheduler.SPEED_MAX:
+            return 0.0
+        due = self._last + (1 - self._acc) / (self.tps * self.speed)
+        return max(0.0, due - perf_counter())
@@ -8,11 +8,13 @@ from map import Map
 from save import Save
 from entity import Entity
 from food import Food
-from visual import Visual, MAX_CELL_SIZE
 from config import Config
 import path
-import pygame
 from cmd import Cmd
+from scheduler import Scheduler
+from snapshot import Snapshot
+import threading
+from time import perf_counter, sleep
 
 ## 
 #  @class RSim
@@ -21,9 +23,18 @@ from cmd import Cmd
 class RSim(Cmd):
 
     FPS_DEFAULT = 180  ##< Default frames per second for the simulation.
+    HUD_PERIOD = 0.5  ##< Seconds between two measures of the rates shown by the HUD.
+    SNAPSHOT_IDLE = 0.25  ##< Seconds between two snapshots published while no tick runs.
+
+    ENGINES = ('object', 'numpy')  ##< Available engines for stepping the entities.
 
     save = None  ##< Instance of the Save class for managing save operations.
     visual = None  ##< Instance of the Visual class for rendering the simulation.
+    scheduler = None  ##< Instance of the Scheduler class deciding when to step.
+    profiler = None  ##< Instance of the Profiler class timing the ticks, or None when disabled.
+    recorder = None  ##< Instance of the Recorder class writing the ticks to a replay file, or None.
+    replay = None  ##< Instance of the Replay class played instead of simulating, or None.
+    snapshot = None  ##< Latest *Snapshot* published by the simulation thread of *run*.
 
     _fps = FPS_DEFAULT  ##< Current frames per second setting.
 
@@ -32,6 +43,12 @@ class RSim(Cmd):
     mouse_clicking = False  ##< Flag for mouse clicking state.
 
     save_duration = 0  ##< Duration for displaying save messages.
+    autosave = 0  ##< Number of ticks between two background saves, 0 to disable.
+    _save_request = None  ##< Save asked by a key or a command ('save' or 'checkpoint'), started at the next tick boundary.
+    _save_error = None  ##< Last background save error reported.
+    _seek_request = None  ##< Replay tick asked by a key, loaded by the simulation thread.
+    tracked = None  ##< Id of the entity followed by the camera, or None.
+    _world_requests = []  ##< Console commands on the world, tuples (command, argument), run at the next tick boundary.
 
     verbose = False
 
@@ -39,62 +56,227 @@ class RSim(Cmd):
     #  @brief Initializes the simulation environment.
     #  @param numSave Number of saves to initialize (default is 0).
     #  @param size Size of the map (default is Map.DEFAULT_SIZE).
+    #  @param engine Engine stepping the entities, one of ENGINES (default is 'object').
+    #  @param headless If True, no visual component is created and pygame is never imported.
     #  @details Sets up the configuration, map size, and initializes save and visual components.
+    #  Any previous entities and food are removed. The 'numpy' engine steps the whole population as arrays (see *Engine*).
     @classmethod
-    def init(cls, numSave=0, size=Map.DEFAULT_SIZE):
+    def init(cls, numSave=0, size=Map.DEFAULT_SIZE, engine='object', headless=False):
         Config.init()
-        Map.size = size
-        cls.save = Save(numSave)
-        cls.visual = Visual()
+        Map.init(size)
+        Food.clear()
+        if engine == 'numpy':
+            from engine import Engine
+            Entity.engine = Engine()
+        else:
+            Entity.engine = None
+        Entity.clear()
+        cls.save = Save(numSave, Config.save.codec, Config.save.level)
+        cls.scheduler = Scheduler(Config.simulation.tps, 1 / cls._fps)
+        cls.setSpeed(Config.simulation.speed)
+        cls.autosave = Config.simulation.autosave
+        cls._save_request = None
+        cls.tracked = None
+        cls._world_requests = []
+        if headless:
+            cls.visual = None
+        else:
+            from visual import Visual
+            cls.visual = Visual()
         cls._running = False
 
         # Calculate the maximum number of foods based on the map size.
         Food.maxFoods = (Map.size[0] * Map.size[1]) // 9
+        Food.rate = Config.simulation.food_rate
+        Food.cellRate = Config.simulation.food_cell_rate
+
+    ## 
+    #  @brief Sets the speed multiplier of the simulation.
+    #  @param speed A multiplier such as 1 or '10', or 'max' to step as fast as possible.
+    #  @throws ValueError if the speed is neither 'max' nor a positive integer.
+    @classmethod
+    def setSpeed(cls, speed):
+        if str(speed).lower() == 'max':
+            cls.scheduler.speed = Scheduler.SPEED_MAX
+            return
+        speed = int(speed)
+        if speed <= 0:
+            raise ValueError("speed must be a positive integer or 'max'!")
+        cls.scheduler.speed = speed
 
     ##
     #  @brief Generates a specified number of entities and food items.
     #
     #  This class method creates the specified number of entities and food items 
-    #  by calling their respective `generate()` methods.
+    #  by calling `generate()` for each entity and *Food.spawn* for the food.
     #
     #  @param nEntities The number of entities to generate.
     #  @param nFoods The number of food items to generate.
     #
     #  @details
     #  - The method iterates over the range `nEntities` and generates an entity for each iteration.
-    #  - Similarly, it iterates over the range `nFoods` to generate food items.
+    #  - The food items are placed at once on distinct free cells of `Map.occupancy` (see *Food.spawn*).
     #
     @classmethod
     def generate(self, nEntities: int, nFoods: int):
-        for _ in range(nEntities):
-            Entity.generate()
-        for _ in range(nFoods):
-            Food.generate()
+        if Entity.engine is not None:
+            Entity.engine.generate(nEntities)
+        else:
+            for _ in range(nEntities):
+                Entity.generate()
+        Food.spawn(nFoods)
 
     ## 
     #  @brief Executes a single simulation step.
-    #  @details Moves all entities, checks their survival, and generates new food.
+    #  @details Moves all entities, checks their survival, and regrows food (see *Food.regrow*).
+    #  With an *Engine*, the whole population is stepped at once. When a replay is played,
+    #  its next tick is loaded instead.
     @classmethod
     def step(cls):
-        for entity in Entity.list:
-            entity.move()  ## Move the entity.
-            if not entity.survive():  ## Check if the entity is alive.
-                Entity.delete(entity)  ## Remove dead entities.
+        if cls.replay is not None:
+            if cls.replay.next():
+                cls.save.time = cls.replay.tick
+            return
+
+        if cls.profiler is not None:
+            return cls._stepProfiled(cls.profiler)
+
+        if Entity.engine is not None:
+            Entity.engine.step()
+        else:
+            for entity in Entity.list:
+                entity.move()  ## Move the entity.
+                if not entity.survive():  ## Check if the entity is alive.
+                    Entity.kill(entity)  ## Remove dead entities at the end of the tick.
+            Entity.commit()  ## Apply the deaths and births of the tick.
 
         cls.save.time += 1  ## Increment the simulation time.
-        Food.generate()  ## Generate new food items.
+        Food.regrow()  ## Regrow a batch of food items.
+        cls._endStep()
+
+    ## 
+    #  @brief Records the tick and starts a background save when the autosave interval is reached.
+    #  @details Called at the end of a step, i.e. at a tick boundary, so the snapshot is consistent.
+    #  The autosave is skipped if the previous background save is still running.
+    @classmethod
+    def _endStep(cls):
+        if cls.recorder is not None:
+            cls.recorder.record(cls.save.time)
+        if cls.autosave and cls.save.time % cls.autosave == 0:
+            if cls.save.saveAsync():
+                cls.save_duration = 60
+
+    ## 
+    #  @brief Executes a single simulation step, timing each of its phases.
+    #  @param profiler The Profiler receiving the timings.
+    #  @details Same step as *step*, with Entity.move split into its phases.
+    @classmethod
+    def _stepProfiled(cls, profiler):
+        profiler.begin()
+        lap = profiler.lap
+        if Entity.engine is not None:
+            Entity.engine.step(lap)
+        else:
+            for entity in Entity.list:
+                entity.decay()
+                lap('decay')
+                entity.eat()
+                lap('eat')
+                entity.reproduction()
+                lap('reproduction')
+                entity.walk()
+                lap('move')
+                if not entity.survive():
+                    Entity.kill(entity)
+                lap('death')
+            Entity.commit()
+            lap('death')
+
+        cls.save.time += 1
+        Food.regrow()
+        lap('food')
+        cls._endStep()
+        profiler.end()
+
+    ## 
+    #  @brief Enables or disables the profiler.
+    #  @param enabled If True, a new Profiler starts timing the ticks; if False, it is dropped.
+    #  @param trace If True, the profiler also keeps a trace of the tick spans (default is False).
+    @classmethod
+    def profile(cls, enabled, trace=False):
+        if enabled:
+            from profiler import Profiler
+            cls.profiler = Profiler(trace=trace)
+        else:
+            cls.profiler = None
+
+    ## 
+    #  @brief Starts or stops recording the ticks to a replay file.
+    #  @param path The path of the replay file, or None to stop recording.
+    #  @param keyframe Number of ticks between two keyframes (default is Recorder.KEYFRAME).
+    #  @details The current state is recorded at once, as the first keyframe.
+    @classmethod
+    def record(cls, path, keyframe=None):
+        if cls.recorder is not None:
+            cls.recorder.close()
+            cls.recorder = None
+        if path is not None:
+            from replay import Recorder
+            cls.recorder = Recorder(path, keyframe or Recorder.KEYFRAME)
+            cls.recorder.record(cls.save.time)
+
+    ## 
+    #  @brief Plays a replay file instead of simulating.
+    #  @param path The path of the replay file, or None to stop playing.
+    #  @details The first recorded tick is loaded at once; each step then loads the next one.
+    #  Requires the 'object' engine.
+    @classmethod
+    def play(cls, path):
+        if cls.replay is not None:
+            cls.replay.close()
+            cls.replay = None
+        if path is not None:
+            from replay import Replay
+            cls.replay = Replay(path)
+            cls.seek(cls.replay.first)
+
+    ## 
+    #  @brief Moves the replay to a tick.
+    #  @param tick The tick to show, clamped to the recorded ticks.
+    @classmethod
+    def seek(cls, tick):
+        cls.replay.seek(tick)
+        cls.save.time = cls.replay.tick
 
     ## 
     #  @brief Runs the main simulation loop.
-    #  @details Handles user input, updates simulation state, and renders visuals.
+    #  @details Handles user input and renders visuals, while the ticks run on a simulation thread
+    #  (see *_simulate*). After its ticks, the simulation publishes a *Snapshot* of the world and
+    #  the window draws the latest one, so a slow tick does not drop frames and a slow frame does
+    #  not delay ticks; the camera can be dragged and zoomed while the world steps.
+    #  The number of steps is decided by the scheduler, so the simulation runs at
+    #  `tps * speed` ticks per second whatever the frame rate (keys 1, 2, 3: speed 1x, 10x, max).
+    #  When a replay is played, Page Up/Page Down seek one keyframe interval back/forward, Home/End
+    #  seek to the first/last tick. The key H toggles the performance HUD, the key M the minimap.
+    #  While an entity is tracked (command 'track'), the camera follows it.
     @classmethod
     def run(cls):
+        import pygame
+
         cls._running = True
         dragging = False  ## Flag to indicate if the user is dragging the mouse.
         last_mouse_pos = (0, 0)  ## Store the last mouse position.
-        tempPause = cls._pause  ## Temporarily store the pause state.
 
+        # Measures of the HUD, refreshed every HUD_PERIOD seconds
+        hud_start = perf_counter()
+        hud_ticks = 0
+        fps = tps = None
+
+        cls.snapshot = Snapshot(cls.save.time, tracked=cls.tracked)
+        cls._seek_request = None
         cls.startCmd()        
+        simulation = threading.Thread(target=cls._simulate)
+        simulation.start()
 
         while cls._running:
             # Handle events (e.g., closing the window)
@@ -110,23 +292,39 @@ class RSim(Cmd):
                     if event.key == pygame.K_SPACE:  # Toggle pause
                         cls._pause = not cls._pause
 
-                    if event.key == pygame.K_s:  # Save
-                        cls.save.save()
-                        cls.save_duration = 60  ## Set duration for save message display.
+                    if event.key == pygame.K_s and cls.replay is None:  # Save
+                        cls._save_request = 'save'
+
+                    if cls.replay is not None:  # Seek in the replay, on the simulation thread
+                        tick = cls._seek_request if cls._seek_request is not None else cls.replay.tick
+                        if event.key == pygame.K_PAGEUP:
+                            cls._seek_request = tick - cls.replay.keyframe
+                        elif event.key == pygame.K_PAGEDOWN:
+                            cls._seek_request = tick + cls.replay.keyframe
+                        elif event.key == pygame.K_HOME:
+                            cls._seek_request = cls.replay.first
+                        elif event.key == pygame.K_END:
+                            cls._seek_request = cls.replay.last
+
+                    if event.key == pygame.K_h:  # Toggle the HUD
+                        cls.visual.hud_enabled = not cls.visual.hud_enabled
+
+                    if event.key == pygame.K_m:  # Toggle the minimap
+                        cls.visual.minimap_enabled = not cls.visual.minimap_enabled
+
+                    if event.key in (pygame.K_1, pygame.K_2, pygame.K_3):  # Speed 1x, 10x, max
+                        cls.scheduler.speed = Scheduler.SPEEDS[event.key - pygame.K_1]
 
                 # Detect mouse button down for dragging
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     if event.button == 1:  # Left mouse button
-                        tempPause = cls._pause
                         dragging = True
                         last_mouse_pos = pygame.mouse.get_pos()
-                        cls._pause = True  # Pause the simulation
 
                 # Detect mouse button up
                 if event.type == pygame.MOUSEBUTTONUP:
                     if event.button == 1:  # Left mouse button
                         dragging = False
-                        cls._pause = tempPause
 
                 # Detect mouse scroll events
                 if event.type == pygame.MOUSEBUTTONDOWN:
@@ -162,28 +360,167 @@ class RSim(Cmd):
             if cls.save_duration > 0:
                 cls.save_duration -= 1
 
-            if not cls._pause and ((cls.visual.time % int(cls._fps*0.1)) == 0):
-                cls.step()  ## Execute a simulation step if not paused.
-            
             # Render visuals
+            profiler = cls.profiler
+            if profiler is not None:
+                start = perf_counter()
+
+            snapshot = cls.snapshot  ## Latest state published by the simulation thread.
+            if snapshot is not cls.visual.snapshot:
+                cls.visual.update(snapshot)
             cls.visual.show()
 
+            cls.visual.track()  ## Outline the tracked entity.
+            if cls.visual.minimap_enabled:
+                cls.visual.minimap()
             if cls._pause:
                 cls.visual.pause()  ## Display pause screen.
-            if cls.save_duration > 0:
-                cls.visual.save(cls.save_duration)  ## Show save message.
+            if cls.save.busy or cls.save_duration > 0:
+                cls.visual.save(cls.save_duration, cls.save.progress, cls.save.error)  ## Show save message.
+            if cls.visual.hud_enabled:
+                now = perf_counter()
+                if now - hud_start >= RSim.HUD_PERIOD:
+                    fps, tps = cls.visual.clock.get_fps(), (snapshot.ticks - hud_ticks) / (now - hud_start)
+                    hud_start, hud_ticks = now, snapshot.ticks
+                cls.visual.hud(fps, tps, snapshot.tick_time, snapshot.nEntities, snapshot.nFoods,
+                               cls.save.progress if cls.save.busy else None, cls.save.error)
+
+            cls.visual.flip()  ## Update the display.
 
-            pygame.display.flip()  ## Update the display.
+            if profiler is not None:
+                profiler.record('render', start, perf_counter())
 
             # Control frame rate
             cls.visual.time += 1
             cls.visual.clock.tick(cls._fps)  ## Limit the frame rate.
 
-        
+        simulation.join()
         cls.processCmd("")
+        cls.save.wait()  ## Let a background save finish.
         cls.visual.close()  ## Close visual components when done.
         cls.stopCmd()
 
+    ## 
+    #  @brief Body of the simulation thread of *run*.
+    #  @details Runs the ticks due, then starts the requested save and publishes a *Snapshot*,
+    #  all at a tick boundary, and sleeps until the next tick is due. While no tick runs, the
+    #  snapshot is still refreshed every SNAPSHOT_IDLE seconds, for the commands typed meanwhile.
+    @classmethod
+    def _simulate(cls):
+        ticks = 0
+        tick_time = None
+        published = perf_counter()
+        while cls._running:
+            ticked = False
+            if cls._seek_request is not None:
+                cls.seek(cls._seek_request)
+                cls._seek_request = None
+                ticked = True
+
+            if cls._pause:
+                cls.scheduler.reset()  ## Do not accumulate ticks while paused.
+            else:
+                for _ in cls.scheduler.ticks():
+                    start = perf_counter()
+                    cls.step()  ## Execute every simulation step due.
+                    tick_time = perf_counter() - start
+                    ticks += 1
+                    ticked = True
+
+            # Start the requested save in the background, between two steps
+            if cls._save_request is not None and not cls.save.busy:
+                if cls.save.saveAsync(cls._save_request == 'checkpoint'):
+                    cls.save_duration = 60  ## Set duration for save message display.
+                cls._save_request = None
+            error = cls.save.error
+            if error is not None and error is not cls._save_error and not cls.save.busy:
+                print(f"Error saving simulation: {error}")
+                cls._save_error = error
+                cls.save_duration = 180
+
+            # Run the commands on the world typed since the last tick
+            if cls._world_requests:
+                cls._runWorldCmds()
+                ticked = True
+
+            now = perf_counter()
+            if ticked or now - published >= RSim.SNAPSHOT_IDLE:
+                cls.snapshot = Snapshot(cls.save.time, ticks, tick_time, cls.tracked)
+                published = now
+                if cls.tracked is not None and cls.snapshot.tracked is None:
+                    print(f"Entity #{cls.tracked:04X} is gone, tracking stopped.")
+                    cls.tracked = None
+
+            delay = RSim.SNAPSHOT_IDLE if cls._pause else cls.scheduler.delay()
+            sleep(min(delay, 1 / cls._fps))
+
+    ## 
+    #  @brief Runs the simulation without window nor command input, as fast as possible.
+    #  @param ticks Maximum number of simulation steps to execute.
+    #  @param cap Population at which the run stops early, or None (default is None).
+    #  @param save If True, the simulation is saved at the end of the run (default is True).
+    #  @param interval Number of steps between two samples of the population curve, 0 for none.
+    #  @return A dictionary summarizing the run (see *summary*), with the additional keys
+    #  'stop' (why the run ended: 'ticks', 'extinct' or 'cap'), 'peak' and 'curve'.
+    #  @details Steps are executed in a tight loop until `ticks` is reached, the population
+    #  goes extinct or reaches `cap`. Requires *init* to be called, preferably with `headless=True`.
+    @classmethod
+    def runHeadless(cls, ticks, cap=None, save=True, interval=0):
+        cls._running = True
+        stop = 'ticks'
+        peak = Entity.len()
+        curve = []
+        done = 0
+        start = perf_counter()
+        while done < ticks:
+            cls.step()
+            done += 1
+
+            population = Entity.len()
+            peak = max(peak, population)
+            if interval and done % interval == 0:
+                curve.append(population)
+            if population == 0:
+                stop = 'extinct'
+                break
+            if cap is not None and population >= cap:
+                stop = 'cap'
+                break
+        elapsed = perf_counter() - start
+        cls._running = False
+
+        if save:
+            cls.save.save()
+        summary = cls.summary(done, elapsed)
+        summary.update(stop=stop, peak=peak, curve=curve)
+        return summary
+
+    ## 
+    #  @brief Summarizes the current state of the simulation.
+    #  @param ticks Number of steps executed by the run.
+    #  @param elapsed Duration of the run, in seconds.
+    #  @return A dictionary with the keys 'ticks', 'elapsed', 'tps', 'time', 'entities' and 'foods'.
+    @classmethod
+    def summary(cls, ticks, elapsed):
+        return {
+            'ticks': ticks,
+            'elapsed': elapsed,
+            'tps': ticks / elapsed if elapsed > 0 else float('inf'),
+            'time': cls.save.time,
+            'entities': Entity.len(),
+            'foods': Food.len(),
+        }
+
+    ## 
+    #  @brief Formats a summary of a run on one line.
+    #  @param summary A dictionary returned by *summary* or *runHeadless*.
+    #  @return The formatted summary.
+    @classmethod
+    def formatSummary(cls, summary):
+        return (f"Save_{cls.save.number}: {summary['ticks']} ticks in {summary['elapsed']:.2f}s "
+                f"({summary['tps']:.1f} ticks/s), time={summary['time']}, "
+                f"entities={summary['entities']}, foods={summary['foods']}")
+
 if __name__ == "__main__":
     RSim.init()
     RSim.run()
@@ -0,0 +1,113 @@
+##
+#  @file snapshot.py
+#  @brief File containing the class *Snapshot*, the state of the world handed to the renderer.
+#  @date 2026-10-16
+#  @author Rabyte Studio
+
+from array import array
+from map import Map
+from entity import Entity
+from food import Food
+
+##
+#  @class Snapshot
+#  @brief Copy of what is drawn of the world, taken at a tick boundary.
+#
+#  The simulation thread publishes a new Snapshot after its ticks (see *RSim.run*), and the
+#  renderer draws the latest one published. A Snapshot is never modified once created, so
+#  the renderer can read it while the next ticks are computed: the live `Food.grid`,
+#  `Map.occupancy` and entity list are only touched by the simulation thread, the console
+#  commands that change them being queued to a tick boundary (see *Cmd._runWorldCmds*).
+class Snapshot:
+
+    ##
+    #  @brief Copies the current state of the world.
+    #  @param time The simulation time of the state.
+    #  @param ticks The number of ticks simulated since the start of the run (default is 0).
+    #  @param tick_time Duration of the last tick in seconds, or None (default is None).
+    #  @param tracked Id of the entity followed by the camera, or None (default is None).
+    def __init__(self, time, ticks=0, tick_time=None, tracked=None):
+        self.time = time
+        self.ticks = ticks
+        self.tick_time = tick_time
+        self.size = Map.size
+        self.tiles = Map.occupancy.tiles
+        self.bitmap = bytes(Map.occupancy.bitmap)  ##< Food cells, see *Occupancy*.
+        self.counts = Map.occupancy.counts[:]      ##< Food cells per tile, see *Occupancy*.
+        self.nFoods = Food.len()
+
+        # Coordinates of the entities: NumPy arrays with an Engine, int arrays otherwise,
+        # and the cells holding at least one entity, in the layout of `bitmap`
+        height = self.size[1]
+        cells = bytearray(self.size[0] * height)
+        if Entity.engine is not None:
+            import numpy as np
+            n = Entity.engine.n
+            self.x, self.y = Entity.engine.x[:n].copy(), Entity.engine.y[:n].copy()
+            np.frombuffer(cells, dtype=np.uint8)[self.x * height + self.y] = 1
+        else:
+            self.x = array('i', [entity._x for entity in Entity.list])
+            self.y = array('i', [entity._y for entity in Entity.list])
+            for x, y in zip(self.x, self.y):
+                cells[x * height + y] = 1
+        self.cells = bytes(cells)  ##< Entity cells, 1 where at least one entity stands.
+
+        # Position of the tracked entity: a tuple (id, x, y), or None if it is not alive
+        entity = Entity.get(tracked) if tracked is not None else None
+        self.tracked = (tracked, entity._x, entity._y) if entity is not None else None
+
+    ##
+    #  @brief Represents the Snapshot as a string.
+    #  @return A string with the time and the population of the state.
+    def __repr__(self) -> str:
+        return f"<Snapshot: time={self.time}, entities={self.nEntities}, foods={self.nFoods}>"
+
+    ##
+    #  @brief Returns the number of entities.
+    #  @return The number of entities of the state.
+    @property
+    def nEntities(self) -> int:
+        return len(self.x)
+
+    ##
+    #  @brief Returns the coordinates of every entity.
+    #  @return An iterable of tuples (x, y).
+    def coords(self):
+        return zip(self.x.tolist(), self.y.tolist())
+
+    ##
+    #  @brief Yields the food cells of a rectangle.
+    #  @param x0 The x-coordinate of the first column.
+    #  @param y0 The y-coordinate of the first row.
+    #  @param x1 The x-coordinate after the last column.
+    #  @param y1 The y-coordinate after the last row.
+    #  @details Each column of the rectangle is searched in the bitmap.
+    def foods(self, x0, y0, x1, y1):
+        return Snapshot._find(self.bitmap, self.size[1], x0, y0, x1, y1)
+
+    ##
+    #  @brief Yields the cells of a rectangle holding at least one entity.
+    #  @param x0 The x-coordinate of the first column.
+    #  @param y0 The y-coordinate of the first row.
+    #  @param x1 The x-coordinate after the last column.
+    #  @param y1 The y-coordinate after the last row.
+    #  @details Like *foods*, the cost depends on the rectangle, not on the number of entities.
+    def entities(self, x0, y0, x1, y1):
+        return Snapshot._find(self.cells, self.size[1], x0, y0, x1, y1)
+
+    ##
+    #  @brief Yields the set cells of a rectangle of a bitmap, column by column.
+    #  @param bitmap The bitmap, cell (x, y) at index `x * height + y`.
+    #  @param height The height of the map.
+    #  @param x0 The x-coordinate of the first column.
+    #  @param y0 The y-coordinate of the first row.
+    #  @param x1 The x-coordinate after the last column.
+    #  @param y1 The y-coordinate after the last row.
+    @staticmethod
+    def _find(bitmap, height, x0, y0, x1, y1):
+        for x in range(x0, x1):
+            start = x * height
+            cell = bitmap.find(1, start + y0, start + y1)
+            while cell != -1:
+                yield x, cell - start
+                cell = bitmap.find(1, cell + 1, start + y1)
@@ -7,9 +7,7 @@
 import pygame
 from config import Config
 
-from map import Map
-from food import Food
-from entity import Entity
+from map import Occupancy
 
 # Colors
 COLOR_WHITE =  (0xFF, 0xFF, 0xFF)
@@ -23,24 +21,41 @@ COLOR_FOODS = COLOR_GREEN
 COLOR_ENTITIES = COLOR_BLUE
 COLOR_PAUSE = COLOR_RED
 COLOR_SAVE = COLOR_RED
+COLOR_HUD = COLOR_WHITE
+COLOR_HUD_BACKGROUND = COLOR_BLACK
+COLOR_MINIMAP_VIEW = COLOR_RED
+COLOR_TRACK = COLOR_RED
 
 DEFAULT_CELL_SIZE = 5
 MAX_CELL_SIZE = 50
 DEFAULT_CAMERA = (0, 0)
 DELTA_CAMERA = 5
+MAX_DIRTY = 2000  # Number of changed cells above which the whole scene is redrawn
+LOD_CELL_SIZE = 2  # Cell size at or below which tile densities are drawn instead of cells
+MINIMAP_SIZE = 160  # Size of the longest side of the minimap, in pixels
 
 
 ## 
 #  @class Visual
 #  @brief Class that allows you to manage the visual aspect of the simulator.
 class Visual:
+
+    RENDERERS = ('rects', 'pixels')  ##< 'rects': one rectangle per changed cell, 'pixels': one pixel buffer (NumPy).
+
     ## 
     #  @brief Initializes the Visual class and sets up the display.
     #
     #  This constructor initializes Pygame, sets the window size and caption, 
     #  and initializes camera and cell size variables. It also prepares for mouse 
     #  dragging events.
-    def __init__(self):
+    #
+    #  @param renderer One of RENDERERS, or None to use the configured one (default is None).
+    #  @throws ValueError if the renderer is unknown.
+    def __init__(self, renderer=None):
+        self.renderer = renderer or Config.visual.renderer
+        if self.renderer not in Visual.RENDERERS:
+            raise ValueError(f"renderer must be one of {', '.join(Visual.RENDERERS)}!")
+
         # Initialize pygame
         pygame.init()
 
@@ -60,6 +75,34 @@ class Visual:
 
         self.time = 0
 
+        self.snapshot = None  # State of the world drawn by *show* (see *update*)
+
+        # Scene kept between frames, redrawn by dirty regions (see *show*)
+        self._scene = None
+        self._background = None
+        self._background_key = None
+        self._view_key = None
+        self._foods = set()
+        self._entities = set()
+        self._dirty = None      # Regions of the screen redrawn by the last *show*, None for the whole screen
+        self._overlays = []     # Regions of the overlays drawn since the last *show*
+
+        # Text of the overlays, rendered again only when it changes (see *_text*)
+        self.hud_enabled = False
+        self._fonts = {}        # Height -> font
+        self._texts = {}        # Overlay slot -> (key, rendered surface)
+
+        # Downsampled grids of the zoomed-out view and the minimap (see *Density*)
+        self.minimap_enabled = False
+        self._density = None
+        self._density_stale = True  # Set by *update*, the grids are read from the snapshot on the next use
+        self._zoomed = None         # (cell size, heat map scaled to it)
+        self._minimap = None        # Heat map scaled to the minimap
+
+        if self.renderer == 'pixels':
+            from pixels import Pixels
+            self._pixels = Pixels(COLOR_BACKGROUND, COLOR_FOODS, COLOR_ENTITIES)
+
     ## 
     #  @brief Closes the Pygame window and quits the application.
     #
@@ -71,11 +114,14 @@ class Visual:
     ## 
     #  @brief Handles camera movement.
     #
-    #  This method is currently empty and can be filled in with logic to 
-    #  manage camera movement based on user input, allowing for free movement.
+    #  The camera moves freely, except while an entity is tracked: it is then 
+    #  centred on the tracked entity of the snapshot.
     def camera(self):
         # Remove clamping; allow free movement
-        pass
+        if self.snapshot is not None and self.snapshot.tracked is not None:
+            _, x, y = self.snapshot.tracked
+            self.camera_x = x * self.cell_size + self.cell_size // 2 - self.screen.get_width() // 2
+            self.camera_y = y * self.cell_size + self.cell_size // 2 - self.screen.get_height() // 2
 
     ## 
     #  @brief Handles mouse scroll events for adjusting cell size.
@@ -119,52 +165,219 @@ class Visual:
                 self.camera_y -= dy
                 self.last_mouse_pos = (mouse_x, mouse_y)
 
+    ## 
+    #  @brief Returns the cells visible through the camera.
+    #
+    #  @return A tuple (x0, y0, x1, y1): the visible columns are [x0, x1[ and the rows [y0, y1[.
+    def _view(self):
+        width, height = self.screen.get_size()
+        return (max(0, self.camera_x // self.cell_size), max(0, self.camera_y // self.cell_size),
+                min(self.snapshot.size[0], (self.camera_x + width) // self.cell_size + 1),
+                min(self.snapshot.size[1], (self.camera_y + height) // self.cell_size + 1))
+
+    ## 
+    #  @brief Returns the rectangle of a cell on the screen.
+    #
+    #  @param x The x-coordinate of the cell.
+    #  @param y The y-coordinate of the cell.
+    #  @return A pygame.Rect, clipped to the window: `Surface.fill` shifts a rectangle that starts
+    #  left or above of the surface instead of clipping it.
+    def _rect(self, x, y):
+        rect = pygame.Rect(x * self.cell_size - self.camera_x, y * self.cell_size - self.camera_y, self.cell_size, self.cell_size)
+        return rect.clip(self.screen.get_rect())
+
     ## 
     #  @brief Draws the background of the simulation.
     #
-    #  This method fills the screen with the background color and draws the 
-    #  boundaries of the map.
+    #  This method fills the scene with the background color and draws the 
+    #  boundaries of the map. The result is cached until the camera, the cell 
+    #  size or the window size change.
     def _draw_background(self):
-        self.screen.fill(COLOR_BLACK)
-        pygame.draw.rect(self.screen, COLOR_BLACK, (-1 - self.camera_x, -1 - self.camera_y, self.cell_size * Map.size[0], self.cell_size * Map.size[1]), 1)
-        pygame.draw.rect(self.screen, COLOR_BACKGROUND, (-1 - self.camera_x, -1 - self.camera_y, self.cell_size * Map.size[0], self.cell_size * Map.size[1]))
+        key = (self.cell_size, self.camera_x, self.camera_y, self.screen.get_size(), self.snapshot.size)
+        if self._background is None or self._background_key != key:
+            self._background = pygame.Surface(self.screen.get_size())
+            self._background.fill(COLOR_BLACK)
+            pygame.draw.rect(self._background, COLOR_BACKGROUND, (-1 - self.camera_x, -1 - self.camera_y, self.cell_size * self.snapshot.size[0], self.cell_size * self.snapshot.size[1]))
+            self._background_key = key
+        self._scene.blit(self._background, (0, 0))
 
     ## 
-    #  @brief Draws food items on the screen.
+    #  @brief Draws food items on the scene.
     #
-    #  This method iterates through the list of food items and draws them 
-    #  at their respective positions.
-    def _draw_foods(self):
-        for food in Food.list:
-            pygame.draw.rect(self.screen, COLOR_FOODS, (food.x * self.cell_size - self.camera_x, food.y * self.cell_size - self.camera_y, self.cell_size, self.cell_size))
+    #  @param cells The visible cells holding a food item.
+    def _draw_foods(self, cells):
+        for x, y in cells:
+            self._scene.fill(COLOR_FOODS, self._rect(x, y))
 
     ## 
-    #  @brief Draws entities on the screen.
+    #  @brief Draws entities on the scene.
     #
-    #  This method iterates through the list of entities and draws them 
-    #  at their respective positions.
-    def _draw_entities(self):
-        for entity in Entity.list:
-            pygame.draw.rect(self.screen, COLOR_ENTITIES, (entity.x * self.cell_size - self.camera_x, entity.y * self.cell_size - self.camera_y, self.cell_size, self.cell_size))
+    #  @param cells The visible cells holding an entity.
+    def _draw_entities(self, cells):
+        for x, y in cells:
+            self._scene.fill(COLOR_ENTITIES, self._rect(x, y))
 
     ## 
     #  @brief Displays the entire visual representation of the simulation.
     #
-    #  This method calls the background, food, and entity drawing methods 
-    #  to render the current state of the simulation on the screen.
+    #  This method renders the last snapshot of the simulation (see *update*) 
+    #  on the screen with the renderer of the window.
+    #  Below LOD_CELL_SIZE, the density of each tile is drawn instead of the cells.
     def show(self):
-        self._draw_background()
-        self._draw_foods()
-        self._draw_entities()
+        if self.cell_size <= LOD_CELL_SIZE:
+            self._show_density()
+        elif self.renderer == 'pixels':
+            self._show_pixels()
+        else:
+            self._show_rects()
+
+    ## 
+    #  @brief Sets the state of the world to draw.
+    #
+    #  This method is called with every snapshot published by the simulation. 
+    #  The downsampled grids are only read from it when next drawn.
+    #
+    #  @param snapshot The *Snapshot* to draw from now on.
+    def update(self, snapshot):
+        self.snapshot = snapshot
+        self._density_stale = True
+
+    ## 
+    #  @brief Returns the downsampled grids, read again if outdated.
+    #
+    #  @return The *Density* of the map.
+    def _densities(self):
+        if self._density is None:
+            from pixels import Density
+            self._density = Density(COLOR_BACKGROUND, COLOR_FOODS, COLOR_ENTITIES)
+        if self._density_stale:
+            self._density.update(self.snapshot)
+            self._density_stale = False
+            self._zoomed = self._minimap = None
+        return self._density
+
+    ## 
+    #  @brief Renders the simulation as a heat map of the tile densities.
+    #
+    #  The heat map is scaled once per update of the grids and cell size, 
+    #  then blitted whole on every frame.
+    def _show_density(self):
+        density = self._densities()
+        if self._zoomed is None or self._zoomed[0] != self.cell_size:
+            size = density.surface.get_size()
+            scale = Occupancy.TILE * self.cell_size
+            self._zoomed = (self.cell_size, pygame.transform.scale(density.surface, (size[0] * scale, size[1] * scale)))
+        self.screen.fill(COLOR_BLACK)
+        area = (0, 0, self.snapshot.size[0] * self.cell_size, self.snapshot.size[1] * self.cell_size)
+        self.screen.blit(self._zoomed[1], (-self.camera_x, -self.camera_y), area)
+        self._dirty = None
+        self._view_key = None  # The scene of the rect renderer must be redrawn
+        self._overlays = []
+
+    ## 
+    #  @brief Renders the simulation as one scaled pixel buffer (see *Pixels*).
+    #
+    #  The whole window is redrawn and sent to the display on every frame.
+    def _show_pixels(self):
+        self.screen.fill(COLOR_BLACK)
+        self._pixels.draw(self.screen, self.snapshot, self._view(), self.cell_size, (self.camera_x, self.camera_y))
+        self._dirty = None
+        self._overlays = []
+
+    ## 
+    #  @brief Renders the simulation with one rectangle per cell.
+    #
+    #  Only the elements inside the camera view are drawn. The scene is kept 
+    #  between frames: while the camera, the cell size and the window size do 
+    #  not change, only the cells whose content changed are redrawn, and only 
+    #  those regions are sent to the display by *flip*.
+    def _show_rects(self):
+        x0, y0, x1, y1 = self._view()
+        foods = set(self.snapshot.foods(x0, y0, x1, y1))
+        entities = set(self.snapshot.entities(x0, y0, x1, y1))
+
+        if self._scene is None or self._scene.get_size() != self.screen.get_size():
+            self._scene = pygame.Surface(self.screen.get_size())
+            self._background = None
+
+        view = (self.cell_size, self.camera_x, self.camera_y, self.screen.get_size())
+        changed = None if view != self._view_key else (foods ^ self._foods) | (entities ^ self._entities)
+
+        if changed is None or len(changed) > MAX_DIRTY:
+            # Redraw the whole scene
+            self._draw_background()
+            self._draw_foods(foods)
+            self._draw_entities(entities)
+            self.screen.blit(self._scene, (0, 0))
+            self._dirty = None
+        else:
+            # Redraw the changed cells only, entities over foods over background
+            self._dirty = []
+            for x, y in changed:
+                rect = self._rect(x, y)
+                if (x, y) in entities:
+                    self._scene.fill(COLOR_ENTITIES, rect)
+                elif (x, y) in foods:
+                    self._scene.fill(COLOR_FOODS, rect)
+                else:
+                    self._scene.blit(self._background, rect, rect)
+                self._dirty.append(rect)
+            # Erase the overlays of the previous frame too
+            self._dirty.extend(self._overlays)
+            for rect in self._dirty:
+                self.screen.blit(self._scene, rect, rect)
+
+        self._view_key = view
+        self._foods, self._entities = foods, entities
+        self._overlays = []
+
+    ## 
+    #  @brief Sends the frame to the display.
+    #
+    #  After a partial redraw, only the dirty regions and the overlays are updated.
+    def flip(self):
+        if self._dirty is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self._dirty + self._overlays)
+
+    ## 
+    #  @brief Returns the font of the overlays for a height, created on first use.
+    #
+    #  @param height The height of the font, in pixels.
+    #  @return A pygame.font.Font.
+    def _font(self, height):
+        font = self._fonts.get(height)
+        if font is None:
+            font = self._fonts[height] = pygame.font.SysFont(None, height)
+        return font
+
+    ## 
+    #  @brief Returns the rendered text of an overlay slot.
+    #
+    #  Each slot keeps its last surface, which is rendered again only when the 
+    #  text, the colours or the window height change.
+    #
+    #  @param slot The name of the slot, e.g. 'pause'.
+    #  @param text The text to display.
+    #  @param color The colour of the text.
+    #  @param background The colour behind the text, or None for none (default is None).
+    #  @return A pygame.Surface.
+    def _text(self, slot, text, color, background=None):
+        height = Config.visual.window_height // 30
+        key = (text, color, background, height)
+        cached = self._texts.get(slot)
+        if cached is None or cached[0] != key:
+            cached = self._texts[slot] = (key, self._font(height).render(text, True, color, background))
+        return cached[1]
 
     ## 
     #  @brief Displays a pause message on the screen.
     #
     #  This method renders a pause message when the simulation is paused.
     def pause(self):
-        height = Config.visual.window_height // 30
-        pause_text = pygame.font.SysFont(None, height).render("▮▮ Pause...", True, COLOR_PAUSE)
-        self.screen.blit(pause_text, (10, 10))
+        pause_text = self._text('pause', "▮▮ Pause...", COLOR_PAUSE)
+        self._overlays.append(self.screen.blit(pause_text, (10, 10)))
 
     ## 
     #  @brief Displays a saving message on the screen.
@@ -173,10 +386,17 @@ class Visual:
     #  positioned at the bottom right corner of the window.
     #
     #  @param duration The duration of the saving operation.
+    #  @param progress Progress of a background save, from 0 to 1, or None (default is None).
+    #  @param error Error of the last background save, or None (default is None).
     #  @return The duration parameter for potential use elsewhere.
-    def save(self, duration):
-        height = Config.visual.window_height // 30
-        save_text = pygame.font.SysFont(None, height).render("Saving...", True, COLOR_SAVE)
+    def save(self, duration, progress=None, error=None):
+        if error is not None:
+            message = "Save failed!"
+        elif progress is not None and progress < 1:
+            message = f"Saving... {int(progress * 100)}%"
+        else:
+            message = "Saving..."
+        save_text = self._text('save', message, COLOR_SAVE)
         
         # Retrieve text dimensions
         text_rect = save_text.get_rect()
@@ -189,5 +409,75 @@ class Visual:
         text_rect.topleft = (text_x, text_y)
         
         # Render text to the screen
-        self.screen.blit(save_text, text_rect)
+        self._overlays.append(self.screen.blit(save_text, text_rect))
         return duration
+
+    ## 
+    #  @brief Displays the performance HUD at the top right corner of the window.
+    #
+    #  One line is drawn per value; a line is rendered again only when its text 
+    #  changes (see *_text*).
+    #
+    #  @param fps Frames rendered per second, or None if not measured yet.
+    #  @param tps Ticks simulated per second, or None if not measured yet.
+    #  @param tick Duration of the last tick in seconds, or None if no tick ran.
+    #  @param entities Number of entities.
+    #  @param foods Number of food items.
+    #  @param progress Progress of a background save, from 0 to 1, or None when idle (default is None).
+    #  @param error Error of the last background save, or None (default is None).
+    def hud(self, fps, tps, tick, entities, foods, progress=None, error=None):
+        if progress is not None and progress < 1:
+            status = f"{int(progress * 100)}%"
+        elif error is not None:
+            status = "failed"
+        else:
+            status = "idle"
+        lines = (
+            f"FPS {'-' if fps is None else f'{fps:.0f}'}",
+            f"TPS {'-' if tps is None else f'{tps:.1f}'}",
+            f"tick {'-' if tick is None else f'{tick * 1e3:.2f} ms'}",
+            f"entities {entities}",
+            f"foods {foods}",
+            f"save {status}",
+        )
+
+        y = 10
+        for i, line in enumerate(lines):
+            text = self._text(f'hud{i}', line, COLOR_HUD, COLOR_HUD_BACKGROUND)
+            x = Config.visual.window_width - text.get_width() - 10  # 10 pixels margin right
+            self._overlays.append(self.screen.blit(text, (x, y)))
+            y += text.get_height()
+
+    ## 
+    #  @brief Outlines the tracked entity of the snapshot, if any.
+    def track(self):
+        if self.snapshot.tracked is None:
+            return
+        _, x, y = self.snapshot.tracked
+        rect = pygame.Rect(x * self.cell_size - self.camera_x, y * self.cell_size - self.camera_y, self.cell_size, self.cell_size).inflate(6, 6)
+        self._overlays.append(pygame.draw.rect(self.screen, COLOR_TRACK, rect, 2))
+
+    ## 
+    #  @brief Displays the minimap at the bottom left corner of the window.
+    #
+    #  The minimap is the heat map of the tile densities, with the part of the 
+    #  map seen by the camera outlined.
+    def minimap(self):
+        if self._minimap is None or self._density_stale:
+            density = self._densities()
+            width, height = density.surface.get_size()
+            scale = MINIMAP_SIZE / max(width, height, 1)
+            self._minimap = pygame.transform.smoothscale(density.surface, (max(1, round(width * scale)), max(1, round(height * scale))))
+        width, height = self._minimap.get_size()
+        tiles = self._density.surface.get_width()
+        left = 10  # 10 pixels margin left
+        top = Config.visual.window_height - height - 10  # 10 pixels margin bottom
+        self._overlays.append(self.screen.blit(self._minimap, (left, top)))
+
+        # Outline of the camera view, in minimap pixels
+        scale = width / (tiles * Occupancy.TILE * self.cell_size)
+        view = pygame.Rect(left + self.camera_x * scale, top + self.camera_y * scale,
+                           self.screen.get_width() * scale, self.screen.get_height() * scale)
+        view = view.clip(pygame.Rect(left, top, width, height))
+        if view.width and view.height:
+            pygame.draw.rect(self.screen, COLOR_MINIMAP_VIEW, view, 1)
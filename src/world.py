@@ -0,0 +1,203 @@
+##
+#  @file world.py
+#  @brief File containing the class *World*, an embeddable simulation instance.
+#  @date 2026-10-16
+#  @author Rabyte Studio
+
+import random
+import threading
+from map import Map
+from grid import Grid
+from pool import Pool
+from entity import Entity
+from food import Food
+from simulation import RSim
+
+##
+#  @class World
+#  @brief A simulation owning its own map, entities, food, save slot and random state.
+#
+#  The simulation classes (*Map*, *Entity*, *Food*, *RSim*) keep their state in class attributes.
+#  A World holds its own copy of that state and binds it to the classes while it is active,
+#  i.e. inside a `with world:` block. Activation is guarded by a process-wide lock, so several
+#  worlds can live in one process and be driven from several threads, but only one world runs at
+#  a time: the others wait for the lock, for the whole of a *run* or *show*. Worlds driven from a
+#  thread pool are therefore serialized, not concurrent; run them in separate processes to run
+#  them in parallel (see *Batch*).
+#
+#  Example:
+#  @code
+#  world = World(size=(200, 150), seed=1)
+#  world.generate(10, 100)
+#  summary = world.run(1000)
+#  @endcode
+class World:
+
+    _lock = threading.RLock()  ##< Lock held by the active world.
+
+    PARAMS = ('ENERGY_DEF', 'RANGE_DEF', 'REPROD', 'MIN_REPROD', 'TIME_MAX')  ##< Entity constants a world can override.
+
+    ##
+    #  @brief Creates an empty world.
+    #  @param numSave Save slot of the world (default is 0).
+    #  @param size Size of the map (default is Map.DEFAULT_SIZE).
+    #  @param engine Engine stepping the entities, one of RSim.ENGINES (default is 'object').
+    #  @param seed Seed of the random state of the world, or None for a random one.
+    #  @param params A dictionary overriding Entity constants among PARAMS, or None.
+    #  @param headless If False, a window is opened to render the world (default is True).
+    #  @throws ValueError if a parameter is not in PARAMS.
+    def __init__(self, numSave=0, size=Map.DEFAULT_SIZE, engine='object', seed=None, params=None, headless=True):
+        params = params or {}
+        for name in params:
+            if name not in World.PARAMS:
+                raise ValueError(f"{name} is not one of {', '.join(World.PARAMS)}!")
+
+        self._state = {
+            Map: {'size': size, 'occupancy': None},
+            Entity: {'list': Pool('id'), 'engine': None, 'nEntities': 0,
+                     **{name: getattr(Entity, name) for name in World.PARAMS}, **params},
+            Food: {'list': Pool(), 'grid': Grid(), 'maxFoods': Food.MAXFOODS_DEF, 'rate': Food.RATE_DEF, 'cellRate': 0.0},
+            RSim: {'save': None, 'visual': None, 'scheduler': None, 'profiler': None,
+                   '_running': False, '_pause': False, 'save_duration': 0,
+                   'autosave': 0, '_save_request': None, '_save_error': None,
+                   'recorder': None, 'replay': None, 'snapshot': None, '_seek_request': None,
+                   'tracked': None, '_world_requests': []},
+        }
+        self._random = random.Random(seed).getstate()
+        self._outer = []
+        with self:
+            RSim.init(numSave, size, engine, headless)
+
+    ##
+    #  @brief Represents the World as a string.
+    #  @return A string with the save slot and the population of the world.
+    def __repr__(self) -> str:
+        with self:
+            return f"<World: save={RSim.save.number}, size={Map.size}, entities={Entity.len()}, foods={Food.len()}>"
+
+    ##
+    #  @brief Activates the world: binds its state to the simulation classes.
+    #  @return The world itself.
+    #  @details Blocks while another thread has a world active. Worlds can be nested
+    #  in the same thread; the outer one is restored on exit.
+    def __enter__(self):
+        World._lock.acquire()
+        outer = {cls: {name: getattr(cls, name) for name in names} for cls, names in self._state.items()}
+        self._outer.append((outer, random.getstate()))
+        self._bind(self._state)
+        random.setstate(self._random)
+        return self
+
+    ##
+    #  @brief Deactivates the world: keeps its state and restores the previous one.
+    def __exit__(self, *exc):
+        outer, outer_random = self._outer.pop()
+        self._state = {cls: {name: getattr(cls, name) for name in names} for cls, names in self._state.items()}
+        self._random = random.getstate()
+        self._bind(outer)
+        random.setstate(outer_random)
+        World._lock.release()
+        return False
+
+    ##
+    #  @brief Sets class attributes from a state.
+    #  @param state A dictionary mapping classes to dictionaries of attributes.
+    @staticmethod
+    def _bind(state):
+        for cls, attributes in state.items():
+            for name, value in attributes.items():
+                setattr(cls, name, value)
+
+    ##
+    #  @brief Generates entities and food items at random positions.
+    #  @param nEntities The number of entities to generate.
+    #  @param nFoods The number of food items to generate.
+    def generate(self, nEntities, nFoods):
+        with self:
+            RSim.generate(nEntities, nFoods)
+
+    ##
+    #  @brief Replaces the world by the content of its save slot.
+    def load(self):
+        with self:
+            RSim.save.load()
+
+    ##
+    #  @brief Saves the world to its save slot.
+    def save(self):
+        with self:
+            RSim.save.save()
+
+    ##
+    #  @brief Executes a single simulation step.
+    def step(self):
+        with self:
+            RSim.step()
+
+    ##
+    #  @brief Runs the world without window, as fast as possible.
+    #  @param ticks Maximum number of simulation steps to execute.
+    #  @param cap Population at which the run stops early, or None (default is None).
+    #  @param save If True, the world is saved at the end of the run (default is False).
+    #  @param interval Number of steps between two samples of the population curve, 0 for none.
+    #  @return A dictionary summarizing the run (see *RSim.runHeadless*).
+    #  @details The world stays active during the whole run: other threads activating a world wait.
+    def run(self, ticks, cap=None, save=False, interval=0):
+        with self:
+            return RSim.runHeadless(ticks, cap, save, interval)
+
+    ##
+    #  @brief Runs the world in its window until it is closed.
+    #  @details The world must have been created with `headless=False`.
+    def show(self):
+        with self:
+            RSim.run()
+
+    ##
+    #  @brief Enables or disables the profiler of the world.
+    #  @param enabled If True, a new Profiler starts timing the ticks (default is True).
+    #  @param trace If True, the profiler also keeps a trace of the tick spans (default is False).
+    #  @return The Profiler, or None when disabled.
+    def profile(self, enabled=True, trace=False):
+        with self:
+            RSim.profile(enabled, trace)
+            return RSim.profiler
+
+    ##
+    #  @brief Sets the speed multiplier of the world.
+    #  @param speed A multiplier such as 1 or '10', or 'max' (see *RSim.setSpeed*).
+    def setSpeed(self, speed):
+        with self:
+            RSim.setSpeed(speed)
+
+    ##
+    #  @brief Starts or stops recording the ticks of the world to a replay file.
+    #  @param path The path of the replay file, or None to stop recording (default is None).
+    #  @param keyframe Number of ticks between two keyframes, or None for the default.
+    def record(self, path=None, keyframe=None):
+        with self:
+            RSim.record(path, keyframe)
+
+    ##
+    #  @brief Plays a replay file in the world instead of simulating it.
+    #  @param path The path of the replay file, or None to stop playing.
+    #  @details The world must use the 'object' engine.
+    def play(self, path):
+        with self:
+            RSim.play(path)
+
+    ##
+    #  @brief Formats a summary of a run of this world on one line.
+    #  @param summary A dictionary returned by *run*.
+    #  @return The formatted summary.
+    def formatSummary(self, summary):
+        with self:
+            return RSim.formatSummary(summary)
+
+
+if __name__ == "__main__":
+    worlds = [World(numSave=i, size=(100, 80), seed=i) for i in range(3)]
+    for world in worlds:
+        world.generate(10, 100)
+    for world in worlds:
+        print(world.formatSummary(world.run(200)))